@@ -1,14 +1,34 @@
 import requests
-from bs4 import BeautifulSoup
-import json
+import argparse
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+import threading
 import time
 
+from scripts.onet_archive import HtmlArchive
+from scripts.onet_codec import Codec, CodecError
+from scripts.onet_doc_cache import DocumentCache
+from scripts.onet_html import (
+    DEFAULT_PARSER, HtmlBackend, PageElements, available_backends, get_backend, walk_page
+)
+from scripts.onet_mapped_index import MappedIndex, open_mapped_index, write_mapped_index
+from scripts.onet_pipeline import ExtractionPipeline, FetchOutcome
+from scripts.onet_search import FUZZY_THRESHOLD, SearchIndex, tokenize
+from scripts.onet_snapshot import SnapshotError
+from scripts.onet_transport import get_transport
+
+CACHE_TTL = 86400  # Parsed documentation is reused for 24 hours
+STALE_TTL = 7 * 86400  # After that it is still served for a week while a background refresh runs
+REFRESH_AHEAD = 3600  # refresh_all revalidates pages expiring within the hour
+
 class OnetReferenceHelper:
-    def __init__(self, cache_dir: str = "onet_cache"):
+    def __init__(self, cache_dir: str = "onet_cache", archive_dir: Optional[str] = None,
+                 replay: bool = False, parser: str = DEFAULT_PARSER,
+                 cache_max_bytes: int = 256 * 1024 * 1024, refresh_workers: int = 4):
         self.base_urls = {
             "main": "https://services.onetcenter.org/reference/",
             "about": "https://services.onetcenter.org/about",
@@ -16,11 +36,32 @@ class OnetReferenceHelper:
             "taxonomy": "https://services.onetcenter.org/reference/taxonomy",
             "database": "https://services.onetcenter.org/reference/database"
         }
-        self.session = requests.Session()
+        # Pooled session shared with the other O*NET clients; it retries with jittered backoff
+        self.session = get_transport().session
         self.cache_dir = cache_dir
         self.knowledge_base = {}
+        # Built when the knowledge base is, or on the first search
+        self.search_index: Optional[SearchIndex] = None
+        # Memory-mapped snapshot backing knowledge_base and search_index after load_knowledge_base
+        self.mapped_index: Optional[MappedIndex] = None
+        # In replay mode pages come from the raw HTML archive instead of the network
+        self.replay = replay
+        self.parser = get_backend(parser)
+        # Parser processes look the backend up again by name
+        self.parser_name = parser
+        # Per-source timings of the last build_knowledge_base run
+        self.build_timings: Dict[str, dict] = {}
+        self.pipeline_metrics: Dict[str, dict] = {}
         self.setup_logging()
         self.setup_cache()
+        # Parsed pages shared by every worker using this cache directory
+        self.doc_cache = DocumentCache(self.get_cache_db_path(), max_bytes=cache_max_bytes,
+                                       default_ttl=CACHE_TTL, stale_ttl=STALE_TTL)
+        # Expired pages are refetched here, off the request path; one refresh per page at a time
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='onet-refresh')
+        self._refresh_lock = threading.Lock()
+        self._refreshes: Dict[str, Future] = {}
+        self.archive = HtmlArchive(archive_dir or os.path.join(cache_dir, 'archive'))
 
     def setup_cache(self):
         """Setup cache directory for storing parsed documentation."""
@@ -40,54 +81,129 @@ class OnetReferenceHelper:
         )
         self.logger = logging.getLogger(__name__)
 
-    def get_cache_path(self, url_key: str) -> str:
-        """Generate cache file path for a given URL key."""
-        return os.path.join(self.cache_dir, f"{url_key}_cache.json")
+    def get_cache_db_path(self) -> str:
+        """Path of the SQLite documentation cache."""
+        return os.path.join(self.cache_dir, "documents.sqlite3")
+
+    def get_legacy_cache_paths(self, url_key: str) -> List[str]:
+        """Per-key cache files written by earlier versions, newest format first."""
+        return [os.path.join(self.cache_dir, f"{url_key}.cache"),
+                os.path.join(self.cache_dir, f"{url_key}_cache.json")]
 
     def load_from_cache(self, url_key: str) -> Optional[dict]:
         """Load cached documentation if available and not expired."""
-        cache_file = self.get_cache_path(url_key)
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-                # Check if cache is less than 24 hours old
-                if time.time() - cached_data.get('timestamp', 0) < 86400:
-                    return cached_data.get('data')
-        return None
+        cached_data = self.doc_cache.get(url_key)
+        if cached_data is None:
+            cached_data = self._migrate_legacy_cache(url_key)
+        return cached_data
+
+    def _migrate_legacy_cache(self, url_key: str) -> Optional[dict]:
+        """Move a fresh per-key cache file into the document cache, keeping its remaining TTL."""
+        migrated = None
+        for cache_file in self.get_legacy_cache_paths(url_key):
+            if not os.path.exists(cache_file):
+                continue
+            with open(cache_file, 'rb') as f:
+                try:
+                    cached_data = Codec.decode(f.read())
+                except CodecError as e:
+                    self.logger.warning(f"Ignoring unreadable cache file {cache_file}: {str(e)}")
+                    cached_data = {}
+            remaining = CACHE_TTL - (time.time() - cached_data.get('timestamp', 0))
+            if migrated is None and remaining > 0 and cached_data.get('data'):
+                migrated = cached_data['data']
+                self.doc_cache.set(url_key, migrated, ttl=remaining)
+                self.logger.info(f"Migrated {cache_file} into the document cache")
+            os.remove(cache_file)
+        return migrated
 
     def save_to_cache(self, url_key: str, data: dict):
-        """Save parsed documentation to cache."""
-        cache_file = self.get_cache_path(url_key)
-        cache_data = {
-            'timestamp': time.time(),
-            'data': data
-        }
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2)
+        """Save parsed documentation to the shared document cache."""
+        self.doc_cache.set(url_key, data)
+
+    def get_snapshot_path(self) -> str:
+        """Path of the memory-mapped knowledge base and search index."""
+        return os.path.join(self.cache_dir, "knowledge_base.index")
+
+    def save_snapshot(self):
+        """Write the knowledge base and its search index as a memory-mapped snapshot for fast startup."""
+        # The cache generation stands in for source file fingerprints: any cache write invalidates the snapshot
+        write_mapped_index(self.get_snapshot_path(), self.knowledge_base, self.get_search_index(),
+                           generation=self.doc_cache.generation())
+
+    def load_knowledge_base(self) -> bool:
+        """Load the knowledge base without fetching, preferring the mapped snapshot over the page cache.
+
+        Pages past their TTL but inside the stale window are loaded too, and
+        refreshed in the background.
+        """
+        try:
+            mapped = open_mapped_index(self.get_snapshot_path(), max_age=CACHE_TTL + STALE_TTL)
+            if mapped.generation != self.doc_cache.generation():
+                mapped.close()
+                raise SnapshotError("the document cache changed since the snapshot was written")
+            # Sources are decoded on first access and the index is searched in place, so
+            # worker processes share the file's pages instead of each holding a copy
+            self.mapped_index = mapped
+            self.knowledge_base = mapped.knowledge_base
+            self.search_index = mapped.index
+            self.logger.info("Loaded knowledge base from snapshot")
+            for url_key in self.doc_cache.expired_keys():
+                if url_key in self.base_urls:
+                    self.schedule_refresh(url_key)
+            return True
+        except SnapshotError as e:
+            self.logger.info(f"Snapshot not used ({str(e)}), loading page cache")
+
+        for url_key in self.base_urls.keys():
+            # Fresh or stale; stale pages are refreshed in the background
+            cached_data = self._cached_documentation(url_key)
+            if cached_data:
+                self.knowledge_base[url_key] = cached_data
+        self.search_index = None
+        if self.knowledge_base:
+            self.save_snapshot()
+        return bool(self.knowledge_base)
 
     def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch content from a given URL with retry mechanism."""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url)
-                response.raise_for_status()
-                return response.text
-            except requests.RequestException as e:
-                self.logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {str(e)}")
-                if attempt == max_retries - 1:
-                    self.logger.error(f"Failed to fetch {url} after {max_retries} attempts")
-                    return None
-                time.sleep(1)  # Wait before retry
+        """Fetch content from a given URL; the shared transport retries transient failures."""
+        if self.replay:
+            content = self.archive.get(url)
+            if content is None:
+                self.logger.error(f"No archived copy of {url} available for replay")
+            return content
+
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            self.archive.put(url, response.text)
+            return response.text
+        except requests.RequestException as e:
+            self.logger.error(f"Failed to fetch {url}: {str(e)}")
+            return None
 
     def parse_documentation(self, url_key: str) -> Optional[dict]:
-        """Parse O*NET documentation page with caching."""
-        # Try to load from cache first
-        cached_data = self.load_from_cache(url_key)
+        """Parse O*NET documentation page with caching; expired pages are served while they refresh."""
+        # Replays always re-parse the archived HTML
+        cached_data = None if self.replay else self._cached_documentation(url_key)
         if cached_data:
-            self.logger.info(f"Loading {url_key} documentation from cache")
             return cached_data
+        return self.fetch_documentation(url_key)
+
+    def _cached_documentation(self, url_key: str) -> Optional[dict]:
+        """Cached page, fresh or stale; a stale one is refreshed in the background."""
+        entry = self.doc_cache.get_entry(url_key)
+        if entry is not None and entry.value:
+            if entry.expired:
+                self.logger.info(f"Serving stale {url_key} documentation while it refreshes")
+                self.schedule_refresh(url_key)
+            else:
+                self.logger.info(f"Loading {url_key} documentation from cache")
+            return entry.value
+        return self._migrate_legacy_cache(url_key)
 
+    def fetch_documentation(self, url_key: str) -> Optional[dict]:
+        """Fetch and parse a documentation page, replacing its cache entry."""
         url = self.base_urls.get(url_key)
         if not url:
             self.logger.error(f"Unknown URL key: {url_key}")
@@ -97,56 +213,113 @@ class OnetReferenceHelper:
         if not content:
             return None
 
-        soup = BeautifulSoup(content, 'html.parser')
-        parsed_data = {
-            'title': soup.title.string if soup.title else None,
-            'url': url,
-            'sections': self._extract_sections(soup),
-            'metadata': self._extract_metadata(soup),
-            'links': self._extract_links(soup),
-            'tables': self._extract_tables(soup)
-        }
+        parsed_data = self.parse_page_content(url, content, self.parser_name, tuple(self.base_urls.values()))
 
         # Save to cache
         self.save_to_cache(url_key, parsed_data)
         return parsed_data
 
-    def _extract_metadata(self, soup: BeautifulSoup) -> dict:
+    @staticmethod
+    def parse_page_content(url: str, content: str, parser: str = DEFAULT_PARSER,
+                           link_bases: Tuple[str, ...] = ()) -> dict:
+        """Extract a documentation page; links are kept when they point into ``link_bases``."""
+        backend = get_backend(parser)
+        # A single traversal of the page feeds every extractor below
+        page = walk_page(backend, backend.parse(content))
+        return {
+            'title': backend.string(page.title_node) if page.title_node is not None else None,
+            'url': url,
+            'sections': OnetReferenceHelper._extract_sections(backend, page),
+            'metadata': OnetReferenceHelper._extract_metadata(page),
+            'links': OnetReferenceHelper._extract_links(page, link_bases),
+            'tables': OnetReferenceHelper._extract_tables(page)
+        }
+
+    def schedule_refresh(self, url_key: str) -> Future:
+        """Refetch a page in the background, joining a refresh of the same page already under way."""
+        with self._refresh_lock:
+            future = self._refreshes.get(url_key)
+            if future is None:
+                future = self._refresh_pool.submit(self._refresh, url_key)
+                self._refreshes[url_key] = future
+        return future
+
+    def _refresh(self, url_key: str) -> Optional[dict]:
+        try:
+            parsed_data = self.fetch_documentation(url_key)
+            if parsed_data is None:
+                self.logger.warning(f"Refresh of {url_key} failed, keeping the cached copy")
+            elif url_key in self.knowledge_base:
+                self.knowledge_base[url_key] = parsed_data
+                self.search_index = None
+            return parsed_data
+        except Exception:
+            self.logger.exception(f"Refresh of {url_key} failed")
+            raise
+        finally:
+            with self._refresh_lock:
+                self._refreshes.pop(url_key, None)
+
+    def refresh_all(self, within: float = REFRESH_AHEAD) -> Dict[str, bool]:
+        """Revalidate every page that is missing or expires within ``within`` seconds, in parallel.
+
+        Returns whether each revalidated page was refreshed; run it ahead of
+        expiry (e.g. from cron) so requests never find an expired entry.
+        """
+        deadline = time.time() + within
+        refreshes = {}
+        for url_key in self.base_urls.keys():
+            entry = self.doc_cache.get_entry(url_key)
+            if entry is None or entry.expires_at <= deadline:
+                refreshes[url_key] = self.schedule_refresh(url_key)
+
+        results = {}
+        for url_key, future in refreshes.items():
+            try:
+                results[url_key] = future.result() is not None
+            except Exception:
+                results[url_key] = False
+        return results
+
+    @staticmethod
+    def _extract_metadata(page: PageElements) -> dict:
         """Extract metadata from the page."""
         metadata = {}
-        meta_tags = soup.find_all('meta')
-        for tag in meta_tags:
-            if tag.get('name'):
-                metadata[tag['name']] = tag.get('content', '')
+        for name, content in page.meta:
+            metadata[name] = content if content is not None else ''
         return metadata
 
-    def _extract_links(self, soup: BeautifulSoup) -> List[dict]:
+    @staticmethod
+    def _extract_links(page: PageElements, link_bases: Tuple[str, ...]) -> List[dict]:
         """Extract relevant links from the page."""
         links = []
-        for link in soup.find_all('a', href=True):
-            if any(base_url in link['href'] for base_url in self.base_urls.values()):
+        for link in page.scopes['document'].links:
+            if link.href is None:
+                continue
+            if any(base_url in link.href for base_url in link_bases):
                 links.append({
-                    'text': link.get_text(strip=True),
-                    'href': link['href']
+                    'text': link.stripped,
+                    'href': link.href
                 })
         return links
 
-    def _extract_tables(self, soup: BeautifulSoup) -> List[dict]:
+    @staticmethod
+    def _extract_tables(page: PageElements) -> List[dict]:
         """Extract tables from the documentation."""
         tables = []
-        for table in soup.find_all('table'):
+        for table in page.scopes['document'].tables:
             headers = []
             rows = []
             
             # Extract headers
-            for th in table.find_all('th'):
-                headers.append(th.get_text(strip=True))
+            for th in table.headers:
+                headers.append(th.stripped)
             
             # Extract rows
-            for tr in table.find_all('tr'):
+            for tr in table.rows:
                 row = []
-                for td in tr.find_all('td'):
-                    row.append(td.get_text(strip=True))
+                for td in tr:
+                    row.append(td.stripped)
                 if row:  # Only add non-empty rows
                     rows.append(row)
             
@@ -156,22 +329,24 @@ class OnetReferenceHelper:
             })
         return tables
 
-    def _extract_sections(self, soup: BeautifulSoup) -> Dict[str, str]:
+    @staticmethod
+    def _extract_sections(parser: HtmlBackend, page: PageElements) -> Dict[str, str]:
         """Extract main sections from the documentation."""
         sections = {}
-        main_content = soup.find('div', {'id': 'content'})
-        if main_content:
+        if page.content_children is not None:
             current_section = None
             current_content = []
             
-            for element in main_content.children:
-                if element.name in ['h1', 'h2', 'h3']:
+            for kind, element in page.content_children:
+                if kind == 'heading':
                     if current_section:
                         sections[current_section] = '\n'.join(current_content)
-                    current_section = element.get_text(strip=True)
+                    current_section = element.stripped
                     current_content = []
-                elif current_section and str(element).strip():
-                    current_content.append(str(element))
+                elif current_section:
+                    markup = parser.markup(element) if kind == 'node' else element
+                    if markup.strip():
+                        current_content.append(markup)
             
             # Add the last section
             if current_section:
@@ -179,67 +354,132 @@ class OnetReferenceHelper:
                 
         return sections
 
-    def build_knowledge_base(self):
-        """Build comprehensive knowledge base from all O*NET sources."""
+    def build_knowledge_base(self, fetch_workers: int = 1, parse_workers: Optional[int] = None):
+        """Build comprehensive knowledge base from all O*NET sources.
+
+        With ``fetch_workers`` above one, pages are fetched concurrently and
+        parsed in a pool of ``parse_workers`` processes, so a cold build takes
+        about as long as the slowest page. Each source is merged into
+        ``knowledge_base`` as soon as it completes; ``build_timings`` records
+        how long each one took.
+        """
         self.logger.info("Building comprehensive O*NET knowledge base...")
-        for url_key in self.base_urls.keys():
-            self.logger.info(f"Processing {url_key} documentation...")
-            doc_data = self.parse_documentation(url_key)
+        self.build_timings = {}
+        self.pipeline_metrics = {}
+        if fetch_workers > 1:
+            self._build_concurrently(fetch_workers, parse_workers)
+        else:
+            for url_key in self.base_urls.keys():
+                self.logger.info(f"Processing {url_key} documentation...")
+                start = time.perf_counter()
+                doc_data = self.parse_documentation(url_key)
+                self.build_timings[url_key] = {'seconds': round(time.perf_counter() - start, 4)}
+                if doc_data:
+                    self.knowledge_base[url_key] = doc_data
+        self.build_search_index()
+        self.save_snapshot()
+        self.logger.info("Knowledge base building completed")
+
+    def _build_concurrently(self, fetch_workers: int, parse_workers: Optional[int]):
+        """Fetch on threads and parse in worker processes, merging each source as it completes."""
+        started = time.perf_counter()
+
+        def fetch(url_key: str) -> Optional[FetchOutcome]:
+            # Cached pages skip the parse stage
+            cached_data = None if self.replay else self._cached_documentation(url_key)
+            if cached_data:
+                return FetchOutcome(url=self.base_urls[url_key], result=cached_data, context=(url_key, 0.0))
+            fetch_start = time.perf_counter()
+            content = self.fetch_page(self.base_urls[url_key])
+            if not content:
+                self.build_timings[url_key] = {'seconds': round(time.perf_counter() - started, 4)}
+                return None
+            return FetchOutcome(url=self.base_urls[url_key], html=content,
+                                context=(url_key, time.perf_counter() - fetch_start))
+
+        def merge(outcome: FetchOutcome, doc_data: Optional[dict]):
+            url_key, fetch_seconds = outcome.context
+            if outcome.html is not None and doc_data:
+                self.save_to_cache(url_key, doc_data)
             if doc_data:
                 self.knowledge_base[url_key] = doc_data
-        self.logger.info("Knowledge base building completed")
+            self.build_timings[url_key] = {
+                'seconds': round(time.perf_counter() - started, 4),
+                'fetch_seconds': round(fetch_seconds, 4),
+                'parse_seconds': round(outcome.parse_seconds or 0.0, 4),
+                'cached': outcome.html is None
+            }
+            self.logger.info(f"Processed {url_key} documentation in {self.build_timings[url_key]['seconds']}s")
 
-    def search_knowledge_base(self, query: str) -> List[dict]:
-        """Search through the entire knowledge base for specific terms."""
-        results = []
-        query = query.lower()
-        
-        for source, data in self.knowledge_base.items():
-            # Search in sections
-            for section_title, content in data['sections'].items():
-                if query in content.lower() or query in section_title.lower():
-                    results.append({
-                        'source': source,
-                        'section': section_title,
-                        'content': content,
-                        'relevance': 'high' if query in section_title.lower() else 'medium'
-                    })
-            
-            # Search in tables
-            for table in data.get('tables', []):
-                for row in table['rows']:
-                    if any(query in cell.lower() for cell in row):
-                        results.append({
-                            'source': source,
-                            'type': 'table',
-                            'content': row,
-                            'headers': table['headers'],
-                            'relevance': 'medium'
-                        })
-
-        return sorted(results, key=lambda x: x['relevance'] == 'high', reverse=True)
-
-    def analyze_error(self, error_message: str) -> List[dict]:
+        pipeline = ExtractionPipeline(
+            fetch,
+            partial(parse_documentation_task, parser=self.parser_name, link_bases=tuple(self.base_urls.values())),
+            fetch_workers=min(fetch_workers, len(self.base_urls)),
+            parse_workers=parse_workers
+        )
+        self.pipeline_metrics = pipeline.run(list(self.base_urls), merge)
+
+    def build_search_index(self) -> SearchIndex:
+        """Index every section and table row of the knowledge base for BM25 search."""
+        self.search_index = SearchIndex.from_knowledge_base(self.knowledge_base)
+        self.logger.info(f"Indexed {len(self.search_index)} documents, {len(self.search_index.postings)} terms")
+        return self.search_index
+
+    def get_search_index(self) -> SearchIndex:
+        """The search index, built on first use."""
+        if self.search_index is None:
+            self.build_search_index()
+        return self.search_index
+
+    def search_knowledge_base(self, query: str, limit: Optional[int] = 10, fuzzy: bool = True,
+                              threshold: float = FUZZY_THRESHOLD) -> List[dict]:
+        """Search the knowledge base, returning the best ``limit`` sections and table rows by BM25 score.
+
+        Unless ``fuzzy`` is False, misspelled or truncated terms match the
+        known terms at least ``threshold`` similar to them.
+        """
+        index = self.get_search_index()
+        if fuzzy:
+            return index.fuzzy_search(query, limit, threshold)
+        return index.search(query, limit)
+
+    def analyze_error(self, error_message: str, limit: Optional[int] = None) -> List[dict]:
         """Analyze an error message and find relevant documentation."""
         self.logger.info(f"Analyzing error: {error_message}")
         
-        # Extract key terms from error message
-        keywords = error_message.lower().split()
-        keywords = [k for k in keywords if len(k) > 3]  # Filter out short words
-        
-        all_results = []
-        for keyword in keywords:
-            results = self.search_knowledge_base(keyword)
-            all_results.extend(results)
+        # Extract key terms from error message; status codes and identifiers carry digits
+        keywords = [k for k in tokenize(error_message) if len(k) > 3 or any(c.isdigit() for c in k)]
         
-        # Remove duplicates and sort by relevance
-        unique_results = {f"{r['source']}:{r['section']}": r for r in all_results 
-                         if 'section' in r}.values()
-        return list(unique_results)
+        # One pass over the keywords' postings, one ranked result per section
+        return self.get_search_index().search_terms(keywords, limit, sections_only=True)
+
+def parse_documentation_task(url: str, content: str, parser: str = DEFAULT_PARSER,
+                             link_bases: Tuple[str, ...] = ()) -> Tuple[dict, float]:
+    """Process-pool entry point: parse a documentation page and report the time spent parsing."""
+    start = time.perf_counter()
+    parsed_data = OnetReferenceHelper.parse_page_content(url, content, parser, link_bases)
+    return parsed_data, time.perf_counter() - start
 
 def main():
-    helper = OnetReferenceHelper()
-    helper.build_knowledge_base()
+    parser = argparse.ArgumentParser(description='Build the O*NET reference knowledge base')
+    parser.add_argument('--replay', action='store_true',
+                        help='Parse pages from the raw HTML archive without fetching')
+    parser.add_argument('--parser', choices=available_backends(), default=DEFAULT_PARSER,
+                        help='HTML parser backend used for extraction')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Revalidate cached pages that are expired or about to expire, then exit')
+    parser.add_argument('--fetch-workers', type=int, default=5,
+                        help='Pages fetched concurrently; 1 builds one page after another')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Parser processes (defaults to the number of CPUs)')
+    args = parser.parse_args()
+
+    helper = OnetReferenceHelper(replay=args.replay, parser=args.parser)
+    if args.refresh:
+        results = helper.refresh_all()
+        print(f"Refreshed {sum(results.values())} of {len(results)} pages due for revalidation")
+        return helper
+    helper.build_knowledge_base(fetch_workers=args.fetch_workers, parse_workers=args.parse_workers)
     print("O*NET Reference Helper initialized and knowledge base built!")
     return helper
 
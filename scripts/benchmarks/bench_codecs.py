@@ -0,0 +1,122 @@
+"""
+Benchmark of the cache codecs on O*NET occupation payloads
+Reports stored bytes and encode/decode time for every serializer and compression combination
+
+Usage:
+    python -m scripts.benchmarks.bench_codecs --recordings recorded_payloads.json
+    python -m scripts.benchmarks.bench_codecs --cache-dir onet_cache --json
+    python -m scripts.benchmarks.bench_codecs --synthetic 200
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from ..onet_codec import Codec, available_compressions, available_serializers
+from ..onet_doc_cache import DocumentCache
+from ..onet_technical_specs5 import OnetDataService
+from .fake_onet_server import occupation_codes, synthetic_payload
+
+
+def recorded_payloads(path: str) -> List[Any]:
+    """Payloads from a JSON file mapping API paths to recorded responses"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(json.load(f).values())
+
+
+def cached_payloads(cache_dir: str) -> List[Any]:
+    """Documentation pages from an OnetReferenceHelper cache directory"""
+    payloads = []
+    db_path = os.path.join(cache_dir, 'documents.sqlite3')
+    if os.path.exists(db_path):
+        cache = DocumentCache(db_path)
+        payloads += [entry.value for entry in map(cache.get_entry, cache.keys()) if entry is not None]
+        cache.close()
+    # Per-key files left by versions before the document cache
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*.cache')) +
+                       glob.glob(os.path.join(cache_dir, '*_cache.json'))):
+        with open(path, 'rb') as f:
+            payloads.append(Codec.decode(f.read()))
+    return payloads
+
+
+def synthetic_occupations(count: int) -> List[Any]:
+    """Merged occupation records as fetch_occupation_details returns them"""
+    service = OnetDataService()
+    return [
+        service._merge_occupation_data(code, {
+            section: synthetic_payload(code, None if section == 'details' else section)
+            for section in OnetDataService.occupation_endpoints(code)
+        })
+        for code in occupation_codes(count)
+    ]
+
+
+def _time_per_payload(fn, payloads: List[Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads)
+
+
+def run(payloads: List[Any], threshold: int, repeat: int) -> List[Dict[str, Any]]:
+    baseline = sum(len(json.dumps(p, indent=2).encode('utf-8')) for p in payloads)
+    results = [{'codec': 'json indent=2 (before)', 'bytes': baseline, 'ratio': 1.0,
+                'encode_us': round(_time_per_payload(lambda p: json.dumps(p, indent=2), payloads, repeat) * 1e6, 1),
+                'decode_us': None}]
+    for serializer in available_serializers():
+        for compression in available_compressions():
+            codec = Codec(serializer, compression, threshold)
+            encoded = [codec.encode(p) for p in payloads]
+            assert [Codec.decode(e) for e in encoded] == payloads
+            size = sum(len(e) for e in encoded)
+            results.append({
+                'codec': f"{serializer}+{compression}",
+                'bytes': size,
+                'ratio': round(size / baseline, 3),
+                'encode_us': round(_time_per_payload(codec.encode, payloads, repeat) * 1e6, 1),
+                'decode_us': round(_time_per_payload(Codec.decode, encoded, repeat) * 1e6, 1)
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cache codecs on O*NET payloads')
+    parser.add_argument('--recordings', help='JSON file mapping API paths to recorded payloads')
+    parser.add_argument('--cache-dir', help='OnetReferenceHelper cache directory')
+    parser.add_argument('--synthetic', type=int, default=100, help='Synthetic occupation records if no source is given')
+    parser.add_argument('--threshold', type=int, default=1024, help='Compress payloads of at least this many bytes')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    payloads: List[Any] = []
+    if args.recordings:
+        payloads += recorded_payloads(args.recordings)
+    if args.cache_dir:
+        payloads += cached_payloads(args.cache_dir)
+    if not payloads:
+        payloads = synthetic_occupations(args.synthetic)
+
+    results = run(payloads, args.threshold, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{len(payloads)} payloads")
+    header = f"{'codec':<24} {'KB':>10} {'ratio':>7} {'encode us':>10} {'decode us':>10}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        decode = '-' if r['decode_us'] is None else r['decode_us']
+        print(f"{r['codec']:<24} {r['bytes'] / 1e3:>10.1f} {r['ratio']:>7} {r['encode_us']:>10} {decode:>10}")
+
+
+if __name__ == '__main__':
+    main()
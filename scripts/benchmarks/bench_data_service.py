@@ -0,0 +1,141 @@
+"""
+Load benchmark for OnetDataService, OnetCache and OnetRateLimiter against the local fake O*NET API
+Drives fetch_occupation_data at a fixed concurrency over a skewed workload and reports latency percentiles
+
+Usage:
+    python -m scripts.benchmarks.bench_data_service --requests 5000 --concurrency 100
+    python -m scripts.benchmarks.bench_data_service --server-rate-limit 600 --error-rate 0.02 --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from ..onet_cache import LocalRedis
+from ..onet_rate_limit import LocalBucketState
+from ..onet_technical_specs5 import (
+    OnetAPIConfig,
+    OnetCache,
+    OnetDataService,
+    OnetRateLimiter,
+    fetch_occupation_data,
+)
+from ..onet_telemetry import FETCH_SECONDS_BUCKETS, Histogram
+from ..onet_transport import OnetTransport, TransportConfig
+from .fake_onet_server import FakeOnetServer, FakeServerConfig, occupation_codes, serve
+
+
+def zipf_workload(codes: List[str], requests: int, skew: float, seed: int = 0) -> List[str]:
+    """Occupation codes to request, popular ones far more often, as on the live site"""
+    weights = [1 / (rank ** skew) for rank in range(1, len(codes) + 1)]
+    return random.Random(seed).choices(codes, weights, k=requests)
+
+
+async def run_load(requests: int = 2000, concurrency: int = 50, occupations: int = 200, skew: float = 1.1,
+                   rate_limit: int = 6000, burst: int = 50, hedge_after: Optional[float] = None,
+                   server: Optional[FakeServerConfig] = None, redis_url: Optional[str] = None,
+                   local_cache_bytes: int = 32 * 1024 * 1024) -> Dict[str, Any]:
+    """Run one load test and return its report"""
+    server_config = server or FakeServerConfig()
+    server_config.occupations = occupations
+    fake = FakeOnetServer(server_config)
+
+    async with serve(fake) as base_url:
+        config = OnetAPIConfig()
+        config.BASE_URL = base_url
+        config.RATE_LIMIT, config.RATE_BURST, config.HEDGE_AFTER = rate_limit, burst, hedge_after
+        transport = OnetTransport(TransportConfig(backoff_base=0.05, backoff_max=1.0))
+        service = OnetDataService(config, transport, OnetRateLimiter(config, state=LocalBucketState()))
+        if redis_url:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(redis_url, decode_responses=False)  # values are binary codec payloads
+        else:
+            client = LocalRedis()
+        cache = OnetCache(client, max_bytes=local_cache_bytes)
+
+        workload = zipf_workload(occupation_codes(occupations), requests, skew)
+        latency = Histogram(FETCH_SECONDS_BUCKETS)
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while workload:
+                code = workload.pop()
+                start = time.perf_counter()
+                try:
+                    await fetch_occupation_data(code, service, cache)
+                except Exception:
+                    errors += 1
+                latency.observe(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+        finally:
+            await transport.aclose()
+            if redis_url:
+                await client.aclose()
+        elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    hits = stats['local_hits'] + stats['redis_hits']
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 1),
+        'latency_ms': {q: round(latency.percentile(p) * 1000, 3)
+                       for q, p in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100))},
+        'errors': errors,
+        'upstream_calls': fake.requests,
+        'upstream_status': {str(k): v for k, v in sorted(fake.status_counts.items())},
+        'cache_hit_ratio': round(hits / max(1, hits + stats['misses']), 4),
+        'cache': stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test fetch_occupation_data against a fake O*NET API')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--occupations', type=int, default=200)
+    parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of occupation popularity')
+    parser.add_argument('--rate-limit', type=int, default=6000, help='Client budget in requests per minute')
+    parser.add_argument('--burst', type=int, default=50)
+    parser.add_argument('--hedge-after', type=float)
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake server latency in seconds')
+    parser.add_argument('--latency-jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--server-rate-limit', type=float, help='Fake server 429 threshold in requests per minute')
+    parser.add_argument('--recordings', help='JSON file mapping API paths to recorded payloads')
+    parser.add_argument('--redis-url', help='Use a real, empty scratch Redis database instead of the in-process stand-in')
+    parser.add_argument('--local-cache-bytes', type=int, default=32 * 1024 * 1024,
+                        help='Size of the in-process cache tier; small values send reads to Redis')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show per-request error logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.ERROR)
+    server = FakeServerConfig(latency=args.latency, latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                              rate_limit=args.server_rate_limit, recordings=args.recordings)
+    report = asyncio.run(run_load(args.requests, args.concurrency, args.occupations, args.skew, args.rate_limit,
+                                  args.burst, args.hedge_after, server, args.redis_url, args.local_cache_bytes))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    latency = report['latency_ms']
+    print(f"{report['requests']} requests at concurrency {report['concurrency']} in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s), {report['errors']} errors")
+    print(f"latency ms      p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"upstream calls  {report['upstream_calls']} {report['upstream_status']}")
+    print(f"cache hit ratio {report['cache_hit_ratio']:.1%}  evictions {report['cache']['evictions']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark of the HTML parser backends over a corpus of O*NET pages
+Reports parse time, peak memory and output parity against html.parser for each backend
+
+Usage:
+    python -m scripts.benchmarks.bench_html_parsers --archive onet_repository/archive
+    python -m scripts.benchmarks.bench_html_parsers --synthetic 200 --repeat 3
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from ..onet_extractor import OnetDataExtractor
+from ..onet_html import DEFAULT_PARSER, available_backends
+from .onet_corpus import load_corpus
+
+
+def _extractor_output(url: str, html: str, parser: str) -> Dict[str, Any]:
+    data = OnetDataExtractor.parse_page_content(url, html, parser)
+    data.pop('metadata', None)  # carries an extraction timestamp
+    return data
+
+
+def _helper_output(helper, url: str, html: str) -> Dict[str, Any]:
+    data = helper.parse_page_content(url, html, helper.parser_name, tuple(helper.base_urls.values()))
+    data.pop('url')
+    return data
+
+
+def _parity_digest(extracted: Dict[str, Any], documented: Dict[str, Any]) -> str:
+    # Section bodies keep raw markup, whose serialisation legitimately differs per backend
+    documented = dict(documented, sections=list(documented['sections']))
+    value = [extracted, documented]
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def measure_backend(parser: str, corpus: List[Tuple[str, str]], repeat: int) -> Dict[str, Any]:
+    """Run in a fresh process so peak RSS is attributable to one backend"""
+    from onet_reference_helper import OnetReferenceHelper
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)  # the helper writes its log file to the working directory
+        try:
+            helper = OnetReferenceHelper(cache_dir=os.path.join(tmp, 'cache'), parser=parser)
+        finally:
+            os.chdir(cwd)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in corpus:
+            _extractor_output(url, html, parser)
+            _helper_output(helper, url, html)
+        timings.append(time.perf_counter() - start)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Python-level allocations only; libxml2 memory shows up in the RSS figure instead
+    tracemalloc.start()
+    digests = [
+        _parity_digest(_extractor_output(url, html, parser), _helper_output(helper, url, html))
+        for url, html in corpus
+    ]
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_bytes = sum(len(html) for _, html in corpus)
+    best = min(timings)
+    return {
+        'parser': parser,
+        'pages': len(corpus),
+        'best_seconds': round(best, 4),
+        'median_seconds': round(statistics.median(timings), 4),
+        'ms_per_page': round(best * 1000 / max(1, len(corpus)), 3),
+        'mb_per_second': round(total_bytes / 1e6 / best, 2) if best else None,
+        'traced_peak_mb': round(traced_peak / 1e6, 2),
+        'rss_growth_mb': round((rss_after - rss_before) / 1024, 2),
+        'digests': digests
+    }
+
+
+def run(corpus: List[Tuple[str, str]], parsers: List[str], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for parser in parsers:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(measure_backend, parser, corpus, repeat).result())
+
+    reference = next((r for r in results if r['parser'] == DEFAULT_PARSER), results[0])['digests']
+    for result in results:
+        digests = result.pop('digests')
+        result['mismatched_pages'] = sum(1 for a, b in zip(digests, reference) if a != b)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends')
+    parser.add_argument('--archive', help='Raw HTML archive directory to use as corpus')
+    parser.add_argument('--pages', help='Directory of saved .html pages to use as corpus')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='Number of synthetic O*NET-shaped pages to add to the corpus')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--parsers', nargs='+', default=None,
+                        help='Backends to compare (default: all installed)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.archive, args.pages, args.synthetic)
+    if not corpus:
+        corpus = load_corpus(synthetic=100)
+    parsers = args.parsers or available_backends()
+    if DEFAULT_PARSER in parsers:
+        # html.parser is the reference output, so measure it first
+        parsers = [DEFAULT_PARSER] + [p for p in parsers if p != DEFAULT_PARSER]
+
+    results = run(corpus, parsers, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Corpus: {len(corpus)} pages, {sum(len(h) for _, h in corpus) / 1e6:.2f} MB")
+    header = f"{'parser':<12} {'best s':>8} {'ms/page':>8} {'MB/s':>7} {'py peak MB':>11} {'rss +MB':>8} {'mismatch':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['parser']:<12} {r['best_seconds']:>8} {r['ms_per_page']:>8} {r['mb_per_second']:>7} "
+              f"{r['traced_peak_mb']:>11} {r['rss_growth_mb']:>8} {r['mismatched_pages']:>9}")
+
+
+if __name__ == '__main__':
+    main()
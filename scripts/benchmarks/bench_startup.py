@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark for loading the O*NET reference repository
+Compares pretty-printed JSON, sharded JSON/NDJSON and binary snapshots, each loaded in a fresh process
+
+Usage:
+    python -m scripts.benchmarks.bench_startup --pages 2000
+    python -m scripts.benchmarks.bench_startup --repository onet_repository --json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..onet_extractor import OnetDataExtractor
+from ..onet_html import DEFAULT_PARSER, available_backends
+from ..onet_shards import PAGE_CATEGORIES, ShardedRepository, write_repository_shards
+from ..onet_snapshot import available_codecs, load_repository, read_snapshot, write_snapshot
+from .onet_corpus import SYNTHETIC_BASE_URL, synthetic_page
+
+
+def synthetic_repository(pages: int, templates: int = 10) -> Dict[str, Any]:
+    """Repository of ``pages`` extracted pages, cycling through a few parsed synthetic templates"""
+    parser = 'lxml' if 'lxml' in available_backends() else DEFAULT_PARSER
+    parsed = [
+        OnetDataExtractor.parse_page_content(f"{SYNTHETIC_BASE_URL}{i}", synthetic_page(i), parser)
+        for i in range(min(pages, templates))
+    ]
+    repository = {'metadata': {'version': '1.0', 'source_urls': []}}
+    repository.update({category: {} for category in PAGE_CATEGORIES})
+    for i in range(pages):
+        category = PAGE_CATEGORIES[i % len(PAGE_CATEGORIES)]
+        # Round-trip so pages share no objects, which pickle would otherwise memoise
+        page = json.loads(json.dumps(dict(parsed[i % len(parsed)], title=f"O*NET Reference {i}")))
+        repository[category][f"{SYNTHETIC_BASE_URL}{category}/{i}"] = page
+    repository['statistics'] = {'total_pages': pages}
+    return repository
+
+
+def _load_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_shards(path: str) -> Any:
+    return ShardedRepository(path).to_dict()
+
+
+def _load_snapshot(path: str) -> Any:
+    return read_snapshot(path, 'repository')
+
+
+LOADERS: Dict[str, Callable[[str], Any]] = {
+    'json': _load_json,
+    'shards': _load_shards,
+    'ndjson': _load_shards,
+    'snapshot-msgpack': _load_snapshot,
+    'snapshot-pickle': _load_snapshot,
+}
+
+
+def cold_load(method: str, path: str) -> Tuple[float, int]:
+    """Run in a fresh process: time one load and report the number of pages seen"""
+    start = time.perf_counter()
+    repository = LOADERS[method](path)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(len(repository.get(category, {})) for category in PAGE_CATEGORIES)
+
+
+def write_formats(repository: Dict[str, Any], directory: str) -> Dict[str, str]:
+    """Write the repository in every format and return method -> path"""
+    paths = {'json': os.path.join(directory, 'onet_reference.json')}
+    with open(paths['json'], 'w', encoding='utf-8') as f:
+        json.dump(repository, f, indent=2, ensure_ascii=False)
+    for fmt, method in (('json', 'shards'), ('ndjson', 'ndjson')):
+        paths[method] = os.path.join(directory, f"shards-{fmt}")
+        write_repository_shards(paths[method], repository, fmt)
+    for codec in available_codecs():
+        method = f"snapshot-{codec}"
+        paths[method] = os.path.join(directory, f"onet_reference.{codec}.snapshot")
+        write_snapshot(paths[method], 'repository', repository, codec=codec)
+    return paths
+
+
+def _size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def run(repository: Dict[str, Any], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_formats(repository, tmp)
+        for method, path in paths.items():
+            timings = []
+            for _ in range(repeat):
+                # A new interpreter per load, as when an API worker restarts
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    elapsed, pages = executor.submit(cold_load, method, path).result()
+                timings.append(elapsed)
+            results.append({
+                'method': method,
+                'pages': pages,
+                'bytes': _size(path),
+                'best_ms': round(min(timings) * 1000, 2),
+                'worst_ms': round(max(timings) * 1000, 2)
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold repository load times')
+    parser.add_argument('--repository', help='Output directory of a real build to benchmark')
+    parser.add_argument('--pages', type=int, default=2000, help='Synthetic repository size')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if args.repository:
+        repository = load_repository(args.repository)
+    else:
+        repository = synthetic_repository(args.pages)
+
+    results = run(repository, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'method':<18} {'pages':>7} {'MB':>8} {'best ms':>9} {'worst ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['method']:<18} {r['pages']:>7} {r['bytes'] / 1e6:>8.2f} {r['best_ms']:>9} {r['worst_ms']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Local stand-in for the O*NET web services API
+Serves recorded or synthetic JSON for the occupation endpoints with configurable latency, errors and 429 throttling
+
+Usage:
+    python -m scripts.benchmarks.fake_onet_server --port 8765 --latency 0.05 --rate-limit 50
+    python -m scripts.benchmarks.fake_onet_server --recordings recorded_payloads.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from aiohttp import web
+
+from ..onet_rate_limit import refill_and_take
+
+# occupations/<code>[/<section>], careers/<code>, occupation-transitions/<code>
+_PATH_PATTERN = re.compile(
+    r'^(?:occupations/(?P<code>\d{2}-\d{4}\.\d{2})(?:/(?P<section>\w+))?'
+    r'|(?P<resource>careers|occupation-transitions)/(?P<other_code>\d{2}-\d{4}\.\d{2}))$'
+)
+_WORDS = ['analyze', 'data', 'systems', 'design', 'customer', 'equipment', 'reports', 'software',
+          'safety', 'materials', 'procedures', 'records', 'quality', 'training', 'budget', 'clients']
+
+
+@dataclass
+class FakeServerConfig:
+    """Behaviour of the fake API"""
+    occupations: int = 500            # Size of the synthetic occupation catalogue
+    latency: float = 0.02             # Seconds added to every response
+    latency_jitter: float = 0.01      # Uniform extra latency, up to this many seconds
+    error_rate: float = 0.0           # Fraction of requests answered with 500
+    rate_limit: Optional[float] = None  # Requests per minute before answering 429; None disables
+    burst: int = 10
+    recordings: Optional[str] = None  # JSON file mapping API paths to recorded payloads
+    seed: int = 0
+
+
+def occupation_codes(count: int) -> List[str]:
+    """Deterministic synthetic O*NET-SOC codes"""
+    return [f"{11 + i % 43:02d}-{1000 + i // 43:04d}.00" for i in range(count)]
+
+
+def synthetic_payload(code: str, section: Optional[str]) -> Dict[str, Any]:
+    """Payload shaped like the real endpoint's, stable for a given code and section"""
+    rng = random.Random(f"{code}/{section}")
+    if section is None:
+        return {'code': code, 'title': f"Synthetic Occupation {code}",
+                'description': ' '.join(rng.choice(_WORDS) for _ in range(40)),
+                'updated': {'partial': False, 'year': 2024}}
+    return {
+        'code': code,
+        'element': [
+            {'id': f"{section}.{i}", 'name': ' '.join(rng.choice(_WORDS) for _ in range(3)).title(),
+             'description': ' '.join(rng.choice(_WORDS) for _ in range(15)),
+             'score': {'value': round(rng.uniform(0, 100), 1), 'scale': 'Importance'}}
+            for i in range(rng.randint(5, 25))
+        ]
+    }
+
+
+class FakeOnetServer:
+    """aiohttp application imitating the O*NET API, with request counters"""
+
+    def __init__(self, config: Optional[FakeServerConfig] = None):
+        self.config = config or FakeServerConfig()
+        self.codes = set(occupation_codes(self.config.occupations))
+        self.recordings: Dict[str, Any] = {}
+        if self.config.recordings:
+            with open(self.config.recordings, 'r', encoding='utf-8') as f:
+                self.recordings = {path.strip('/'): payload for path, payload in json.load(f).items()}
+        self.requests = 0
+        self.status_counts: Dict[int, int] = {}
+        self._random = random.Random(self.config.seed)
+        self._bucket = (float(self.config.burst), time.monotonic())
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/ws/{path:.*}', self.handle)
+        return app
+
+    def _throttled(self) -> Optional[float]:
+        """Seconds the client should wait, or None when the request is within the rate limit"""
+        if self.config.rate_limit is None:
+            return None
+        now = time.monotonic()
+        tokens, wait = refill_and_take(*self._bucket, now, self.config.rate_limit / 60, self.config.burst, 1)
+        self._bucket = (tokens, now)
+        return wait or None
+
+    def _respond(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if payload is None:
+            return web.Response(status=status, headers=headers)
+        return web.json_response(payload, status=status, headers=headers)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        config = self.config
+        await asyncio.sleep(config.latency + self._random.uniform(0, config.latency_jitter))
+
+        wait = self._throttled()
+        if wait is not None:
+            return self._respond(429, {'error': 'Too many requests'}, {'Retry-After': f"{wait:.3f}"})
+        if config.error_rate and self._random.random() < config.error_rate:
+            return self._respond(500, {'error': 'Internal server error'})
+
+        path = request.match_info['path'].strip('/')
+        if path in self.recordings:
+            return self._respond(200, self.recordings[path])
+        match = _PATH_PATTERN.match(path)
+        code = match and (match.group('code') or match.group('other_code'))
+        if not code or code not in self.codes:
+            return self._respond(404, {'error': f"Resource not found: {path}"})
+        return self._respond(200, synthetic_payload(code, match.group('section') or match.group('resource')))
+
+
+@asynccontextmanager
+async def serve(server: FakeOnetServer, host: str = '127.0.0.1', port: int = 0) -> AsyncIterator[str]:
+    """Run the fake server on the current loop and yield its API base URL"""
+    runner = web.AppRunner(server.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    try:
+        bound_host, bound_port = runner.addresses[0][:2]
+        yield f"http://{bound_host}:{bound_port}/ws/"
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the O*NET web services API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--occupations', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--latency-jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, help='Requests per minute before answering 429')
+    parser.add_argument('--recordings', help='JSON file mapping API paths to recorded payloads')
+    args = parser.parse_args()
+
+    server = FakeOnetServer(FakeServerConfig(
+        occupations=args.occupations, latency=args.latency, latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, recordings=args.recordings
+    ))
+    print(f"Serving fake O*NET API at http://{args.host}:{args.port}/ws/")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
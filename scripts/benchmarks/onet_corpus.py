@@ -0,0 +1,57 @@
+"""
+Page corpora for the O*NET extraction benchmarks
+Loads saved pages from the raw HTML archive or a directory, or generates synthetic ones
+"""
+
+import glob
+import os
+import random
+from typing import List, Optional, Tuple
+
+from ..onet_archive import HtmlArchive
+
+SYNTHETIC_BASE_URL = 'https://services.onetcenter.org/reference/'
+
+
+def synthetic_page(index: int, sections: int = 12, rows: int = 25) -> str:
+    """Generate a documentation page shaped like the O*NET web-services reference"""
+    rng = random.Random(index)
+    words = ['occupation', 'api', 'database', 'taxonomy', 'summary', 'request', 'response',
+             'important', 'key', 'career', 'skills', 'knowledge', 'abilities', 'code',
+             'essential', 'version', 'element', 'resource', 'parameter', 'format']
+    parts = [f'<h1>Reference page {index}</h1>']
+    for s in range(sections):
+        sentence = ' '.join(rng.choice(words) for _ in range(30))
+        parts.append(f'<h2>Section {s} &amp; {rng.choice(words)}</h2>')
+        parts.append(f'<p>This is an <b>important</b> note: {sentence}.</p>')
+        parts.append(f'<p>{sentence} <a href="/reference/{rng.choice(words)}/{s}">API reference {s}</a></p>')
+        cells = ''.join(
+            f'<tr><td>{r}</td><td><code>{rng.choice(words)}</code></td><td>{rng.choice(words)} {r}</td></tr>'
+            for r in range(rows)
+        )
+        parts.append(f'<table><tr><th>#</th><th>Field</th><th>Notes</th></tr>{cells}</table>')
+        parts.append(f'<ul><li><a href="{SYNTHETIC_BASE_URL}online/{s}">Online guide</a></li></ul>')
+    body = '\n'.join(parts)
+    return (f'<!DOCTYPE html><html><head><title>O*NET Reference {index}</title>'
+            f'<meta name="description" content="Synthetic page {index}">'
+            f'<script>var page = {index};</script></head>'
+            f'<body><div id="content" class="content">{body}</div></body></html>')
+
+
+def load_corpus(archive_dir: Optional[str] = None, pages_dir: Optional[str] = None,
+                synthetic: int = 0) -> List[Tuple[str, str]]:
+    """Return (url, html) pairs from the requested sources"""
+    corpus = []
+    if archive_dir:
+        archive = HtmlArchive(archive_dir)
+        for url in archive.urls():
+            html = archive.get(url)
+            if html is not None:
+                corpus.append((url, html))
+    if pages_dir:
+        for path in sorted(glob.glob(os.path.join(pages_dir, '**', '*.htm*'), recursive=True)):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                corpus.append((SYNTHETIC_BASE_URL + os.path.basename(path), f.read()))
+    for i in range(synthetic):
+        corpus.append((f'{SYNTHETIC_BASE_URL}synthetic/{i}', synthetic_page(i)))
+    return corpus
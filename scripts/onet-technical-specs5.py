@@ -1,234 +0,0 @@
-"""
-O*NET Web Services Integration and Data Structure Specifications
-"""
-
-# Configuration and Authentication
-class OnetAPIConfig:
-    def __init__(self):
-        self.BASE_URL = "https://services.onetcenter.org/ws/"
-        self.VERSION = "v1"
-        self.AUTH_HEADERS = {
-            "Authorization": "Basic {credentials}",  # Base64 encoded username:password
-            "Accept": "application/json"
-        }
-        self.RATE_LIMIT = 50  # Requests per minute allowed by O*NET
-        
-# Core Data Models
-class OccupationModel:
-    """Core occupation data structure"""
-    schema = {
-        "occupation_code": "str",  # O*NET-SOC code
-        "title": "str",            # Occupation title
-        "description": "str",      # Detailed description
-        "requirements": {
-            "education": {
-                "required_level": "int",
-                "preferred_level": "int",
-                "certifications": ["str"],
-                "licenses": ["str"],
-                "training_programs": [{
-                    "name": "str",
-                    "duration": "str",
-                    "provider_type": "str"
-                }]
-            },
-            "experience": {
-                "years_required": "float",
-                "level_required": "int",
-                "preferred_fields": ["str"]
-            },
-            "skills_required": [{
-                "skill_id": "str",
-                "name": "str",
-                "importance": "float",
-                "level_required": "float",
-                "category": "str"
-            }]
-        },
-        "career_pathways": {
-            "related_occupations": [{
-                "code": "str",
-                "title": "str",
-                "similarity_score": "float",
-                "transition_difficulty": "float"
-            }],
-            "advancement_paths": [{
-                "role": "str",
-                "requirements": ["str"],
-                "typical_timeframe": "str"
-            }]
-        },
-        "work_context": {
-            "environment": {
-                "physical_conditions": [{
-                    "factor": "str",
-                    "level": "float",
-                    "frequency": "str"
-                }],
-                "schedule_type": "str",
-                "remote_work_options": "str"
-            },
-            "activities": [{
-                "activity_id": "str",
-                "name": "str",
-                "importance": "float",
-                "frequency": "str"
-            }]
-        },
-        "automation_analysis": {
-            "overall_risk_score": "float",
-            "task_automation": [{
-                "task_id": "str",
-                "automation_probability": "float",
-                "timeline_estimate": "str"
-            }],
-            "required_adaptations": [{
-                "skill_area": "str",
-                "importance": "float",
-                "timeline": "str"
-            }]
-        }
-    }
-
-# API Service Classes
-class OnetDataService:
-    """Core data fetching and processing service"""
-    
-    async def fetch_occupation_details(self, onet_code):
-        """Fetches comprehensive occupation data"""
-        endpoints = {
-            'details': f'/occupations/{onet_code}',
-            'requirements': f'/occupations/{onet_code}/requirements',
-            'skills': f'/occupations/{onet_code}/skills',
-            'knowledge': f'/occupations/{onet_code}/knowledge',
-            'abilities': f'/occupations/{onet_code}/abilities',
-            'tasks': f'/occupations/{onet_code}/tasks',
-            'technology': f'/occupations/{onet_code}/technology'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            tasks = [
-                self._fetch_endpoint(session, endpoint)
-                for endpoint in endpoints.values()
-            ]
-            results = await asyncio.gather(*tasks)
-            return self._merge_occupation_data(results)
-
-    async def fetch_career_pathways(self, onet_code):
-        """Fetches career progression data"""
-        endpoints = {
-            'related': f'/occupations/{onet_code}/related',
-            'careers': f'/careers/{onet_code}',
-            'transitions': f'/occupation-transitions/{onet_code}'
-        }
-        # Implementation similar to above
-
-    async def fetch_work_context(self, onet_code):
-        """Fetches work environment and activity data"""
-        endpoints = {
-            'context': f'/occupations/{onet_code}/work_context',
-            'activities': f'/occupations/{onet_code}/work_activities',
-            'values': f'/occupations/{onet_code}/work_values'
-        }
-        # Implementation similar to above
-
-# Database Models (Using SQLAlchemy)
-class OccupationTable(Base):
-    """SQLAlchemy model for occupation data"""
-    __tablename__ = 'occupations'
-    
-    id = Column(Integer, primary_key=True)
-    onet_code = Column(String, unique=True)
-    title = Column(String)
-    description = Column(Text)
-    last_updated = Column(DateTime)
-    
-    # Relationships
-    requirements = relationship("RequirementTable", back_populates="occupation")
-    pathways = relationship("PathwayTable", back_populates="occupation")
-    work_context = relationship("WorkContextTable", back_populates="occupation")
-    automation = relationship("AutomationTable", back_populates="occupation")
-
-# Cache Implementation
-class OnetCache:
-    """Redis-based caching system"""
-    
-    def __init__(self):
-        self.redis_client = redis.Redis(
-            host='localhost',
-            port=6379,
-            db=0,
-            decode_responses=True
-        )
-        self.default_ttl = 3600  # 1 hour cache
-    
-    async def get_cached_data(self, key):
-        """Retrieve cached data with error handling"""
-        try:
-            data = await self.redis_client.get(key)
-            return json.loads(data) if data else None
-        except Exception as e:
-            logging.error(f"Cache retrieval error: {str(e)}")
-            return None
-
-# API Rate Limiting
-class OnetRateLimiter:
-    """Token bucket rate limiter"""
-    
-    def __init__(self):
-        self.rate_limit = 50  # requests per minute
-        self.bucket = TokenBucket(
-            rate=self.rate_limit/60,  # tokens per second
-            capacity=self.rate_limit
-        )
-    
-    async def acquire(self):
-        """Acquire rate limit token"""
-        return await self.bucket.acquire()
-
-# Error Handling
-class OnetAPIError(Exception):
-    """Custom exception for O*NET API errors"""
-    
-    def __init__(self, message, status_code=None, response=None):
-        self.message = message
-        self.status_code = status_code
-        self.response = response
-        super().__init__(self.message)
-
-# Implementation Examples
-async def fetch_occupation_data(onet_code: str):
-    """Example implementation of occupation data fetching"""
-    try:
-        # Initialize services
-        data_service = OnetDataService()
-        cache = OnetCache()
-        rate_limiter = OnetRateLimiter()
-        
-        # Check cache first
-        cached_data = await cache.get_cached_data(f"occupation:{onet_code}")
-        if cached_data:
-            return cached_data
-            
-        # Acquire rate limit token
-        await rate_limiter.acquire()
-        
-        # Fetch fresh data
-        occupation_data = await data_service.fetch_occupation_details(onet_code)
-        
-        # Cache the results
-        await cache.set_cached_data(
-            f"occupation:{onet_code}",
-            occupation_data,
-            ttl=3600
-        )
-        
-        return occupation_data
-        
-    except OnetAPIError as e:
-        logging.error(f"API Error: {str(e)}")
-        raise
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
-        raise
-
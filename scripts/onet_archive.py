@@ -0,0 +1,102 @@
+"""
+Content-addressed archive of raw O*NET documentation pages
+Keeps gzip-compressed HTML keyed by content hash so extraction can be replayed offline
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .onet_fetch_state import content_hash
+
+
+class HtmlArchive:
+    """On-disk store of raw responses, deduplicated by SHA-256 of the body
+
+    Layout::
+
+        <root>/objects/ab/abcdef....html.gz   compressed page bodies
+        <root>/index.ndjson                   append-only URL -> hash log
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.index_path = os.path.join(root, 'index.ndjson')
+        self.index: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Replay the index log; the last entry for a URL wins"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt archive index line {line_number} in {self.index_path}")
+                    continue
+                self.index[entry['url']] = entry
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def put(self, url: str, html: str) -> str:
+        """Archive a page body and return its content hash"""
+        digest = content_hash(html)
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(html.encode('utf-8'))
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            if self.index.get(url, {}).get('hash') == digest:
+                return digest
+            entry = {
+                'url': url,
+                'hash': digest,
+                'archived_at': datetime.now().isoformat()
+            }
+            self.index[url] = entry
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        return digest
+
+    def get_by_hash(self, digest: str) -> Optional[str]:
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the most recently archived body for a URL"""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        html = self.get_by_hash(entry['hash'])
+        if html is None:
+            logging.warning(f"Archive object {entry['hash']} missing for {url}")
+        return html
+
+    def urls(self) -> List[str]:
+        return list(self.index.keys())
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
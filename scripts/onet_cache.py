@@ -0,0 +1,289 @@
+"""
+Two-tier cache for O*NET API responses
+An in-process LRU bounded in bytes in front of Redis, read and written in pipelined batches
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .onet_codec import DEFAULT_CODEC, Codec, CodecError
+
+# Value returned for keys cached as known-missing (e.g. O*NET codes that answered 404)
+NOT_FOUND = object()
+# Redis representation of NOT_FOUND; neither JSON nor a codec header, so it cannot collide with a real value
+_NOT_FOUND_MARKER = b'\x00not-found'
+
+
+class CacheEntry(NamedTuple):
+    """A cached value and the wall-clock time until which it counts as fresh"""
+    value: Any
+    fresh_until: float
+
+    @property
+    def stale(self) -> bool:
+        return time.time() >= self.fresh_until
+
+
+def _encode_entry(value: Any, fresh_until: float, codec: Codec) -> bytes:
+    if value is NOT_FOUND:
+        return _NOT_FOUND_MARKER
+    return codec.encode({'fresh_until': fresh_until, 'value': value})
+
+
+def _decode_entry(raw: Union[bytes, str], default_fresh_until: float) -> CacheEntry:
+    if isinstance(raw, str):  # written as text by an earlier version
+        raw = raw.encode('utf-8')
+    if raw == _NOT_FOUND_MARKER:
+        return CacheEntry(NOT_FOUND, default_fresh_until)
+    data = Codec.decode(raw)
+    if isinstance(data, dict) and data.keys() == {'fresh_until', 'value'}:
+        return CacheEntry(data['value'], data['fresh_until'])
+    return CacheEntry(data, default_fresh_until)  # written before freshness was recorded
+
+
+class ByteLRU:
+    """Thread-safe LRU of encoded entries, evicting least recently used ones past ``max_bytes``"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, Tuple[Any, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.size -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl: float):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+
+class TwoTierCache:
+    """Cache values in process memory and in Redis
+
+    Lookups check the local LRU first and fetch every remaining key with a
+    single ``MGET``; writes go out as one pipeline. Local entries live at
+    most ``local_ttl`` seconds so workers converge on what Redis holds.
+    Redis TTLs are jittered so entries written together do not expire
+    together. After its TTL an entry stays readable as stale for another
+    ``stale_ttl`` seconds, so callers can serve it while they revalidate.
+    Values are stored with ``codec``, so the Redis client must return
+    bytes (``decode_responses=False``). Values served from memory are
+    shared; treat them as read-only.
+    """
+
+    def __init__(self, client: Any, max_bytes: int = 32 * 1024 * 1024, default_ttl: int = 3600,
+                 ttl_jitter: float = 0.1, negative_ttl: int = 600, local_ttl: int = 60,
+                 stale_ttl: int = 0, codec: Codec = DEFAULT_CODEC):
+        self.client = client
+        self.codec = codec
+        self.local = ByteLRU(max_bytes)
+        self.default_ttl = default_ttl
+        self.ttl_jitter = ttl_jitter
+        self.negative_ttl = negative_ttl
+        self.local_ttl = local_ttl
+        self.stale_ttl = stale_ttl
+        self.counters = {'local_hits': 0, 'redis_hits': 0, 'negative_hits': 0, 'misses': 0,
+                         'stale_hits': 0, 'sets': 0, 'errors': 0}
+
+    def _jittered(self, ttl: int) -> int:
+        return max(1, round(ttl * random.uniform(1 - self.ttl_jitter, 1 + self.ttl_jitter)))
+
+    def _remember(self, key: str, entry: CacheEntry, encoded: Union[bytes, str], ttl: float):
+        self.local.set(key, entry, len(encoded), min(ttl, self.local_ttl))
+
+    def _count(self, entry: CacheEntry):
+        self.counters['negative_hits'] += entry.value is NOT_FOUND
+        self.counters['stale_hits'] += entry.stale
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values by key, with NOT_FOUND for negative entries; absent keys are misses"""
+        return {key: entry.value for key, entry in (await self.lookup(keys)).items()}
+
+    async def lookup(self, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        """Like get_many, but with each entry's freshness; stale entries are still returned"""
+        found: Dict[str, CacheEntry] = {}
+        remote: List[str] = []
+        for key in dict.fromkeys(keys):
+            entry = self.local.get(key)
+            if entry is None:
+                remote.append(key)
+            else:
+                found[key] = entry
+                self.counters['local_hits'] += 1
+                self._count(entry)
+        if not remote:
+            return found
+
+        try:
+            raw_values = await self.client.mget(remote)
+        except Exception as e:
+            logging.error(f"Cache retrieval error: {str(e)}")
+            self.counters['errors'] += 1
+            raw_values = [None] * len(remote)
+
+        now = time.time()
+        for key, raw in zip(remote, raw_values):
+            if raw is None:
+                self.counters['misses'] += 1
+                continue
+            try:
+                entry = _decode_entry(raw, now + self.local_ttl)
+            except (CodecError, ValueError):
+                self.counters['misses'] += 1
+                continue
+            found[key] = entry
+            self.counters['redis_hits'] += 1
+            self._count(entry)
+            self._remember(key, entry, raw, self.local_ttl)
+        return found
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None):
+        """Store values in both tiers; NOT_FOUND values are kept for ``negative_ttl``"""
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        now = time.time()
+        for key, value in items.items():
+            fresh_ttl = self._jittered(self.negative_ttl if value is NOT_FOUND else ttl or self.default_ttl)
+            entry = CacheEntry(value, now + fresh_ttl)
+            encoded = _encode_entry(value, entry.fresh_until, self.codec)
+            # Negative entries simply expire; only real values linger as stale
+            expiry = fresh_ttl if value is NOT_FOUND else fresh_ttl + self.stale_ttl
+            self._remember(key, entry, encoded, expiry)
+            pipe.set(key, encoded, ex=expiry)
+        self.counters['sets'] += len(items)
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logging.error(f"Cache store error: {str(e)}")
+            self.counters['errors'] += 1
+
+    async def set_not_found(self, keys: Iterable[str]):
+        await self.set_many({key: NOT_FOUND for key in keys})
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and the local tier's footprint"""
+        return dict(self.counters, evictions=self.local.evictions, local_entries=len(self.local),
+                    local_bytes=self.local.size)
+
+
+class LocalRedis:
+    """In-process stand-in for the Redis commands the cache uses, for tests and Redis-less setups"""
+
+    def __init__(self):
+        self.data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self.round_trips = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _set(self, key: str, value: bytes, ex: Optional[int] = None):
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def ping(self) -> bool:
+        self.round_trips += 1
+        return True
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.round_trips += 1
+        return self._get(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.round_trips += 1
+        return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        self.round_trips += 1
+        return self._set(key, value, ex)
+
+    def pipeline(self, transaction: bool = True) -> '_LocalPipeline':
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, redis: LocalRedis):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, dict]] = []
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> '_LocalPipeline':
+        self.commands.append(('_set', (key, value), {'ex': ex}))
+        return self
+
+    async def execute(self) -> List[Any]:
+        self.redis.round_trips += 1
+        results = [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key onto one in-flight task"""
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def start(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Start ``factory()`` for ``key`` unless a call is already in flight, and return its task"""
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the shared call; a cancelled caller does not cancel it for the others"""
+        return await asyncio.shield(self.start(key, factory))
+
+    def _finished(self, key: str, task: asyncio.Future):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # background refreshes may have no awaiter; mark the error retrieved
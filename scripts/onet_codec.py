@@ -0,0 +1,149 @@
+"""
+Compact serialization for cached O*NET payloads
+Pluggable serializers (orjson, msgpack, json) with optional compression behind a small version header
+"""
+
+import json
+import zlib
+from typing import Any, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; falls back to the json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; zlib compression always works
+    zstandard = None
+
+# Encoded values start with magic, format version, serializer id and compression id.
+# Anything without the magic is a legacy JSON document written before this header existed;
+# 0xC1 can start neither UTF-8 text nor a msgpack value, so the two cannot be confused.
+CODEC_MAGIC = b'\xc1O'
+CODEC_VERSION = 1
+_HEADER_SIZE = len(CODEC_MAGIC) + 3
+
+SERIALIZERS = {'json': 1, 'orjson': 2, 'msgpack': 3}
+COMPRESSIONS = {'none': 0, 'zlib': 1, 'zstd': 2}
+_SERIALIZER_NAMES = {v: k for k, v in SERIALIZERS.items()}
+_COMPRESSION_NAMES = {v: k for k, v in COMPRESSIONS.items()}
+
+
+class CodecError(Exception):
+    """Raised when a value cannot be decoded, or needs a library that is not installed"""
+
+
+def available_serializers() -> List[str]:
+    """Installed serializers, preferred first: orjson output compresses better than msgpack and decodes faster"""
+    return [name for name, module in (('orjson', orjson), ('msgpack', msgpack), ('json', json)) if module]
+
+
+def available_compressions() -> List[str]:
+    return [name for name, module in (('zstd', zstandard), ('zlib', zlib), ('none', True)) if module]
+
+
+def _serialize(value: Any, serializer: str) -> bytes:
+    if serializer == 'msgpack':
+        return msgpack.packb(value, use_bin_type=True)
+    if serializer == 'orjson':
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _deserialize(payload: bytes, serializer: str) -> Any:
+    if serializer == 'msgpack':
+        if msgpack is None:
+            raise CodecError("msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if serializer == 'orjson' and orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)  # orjson output is plain JSON
+
+
+def _compress(payload: bytes, compression: str, level: Optional[int]) -> bytes:
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=level or 3).compress(payload)
+    if compression == 'zlib':
+        return zlib.compress(payload, level or 6)
+    return payload
+
+
+def _decompress(payload: bytes, compression: str) -> bytes:
+    if compression == 'zstd':
+        if zstandard is None:
+            raise CodecError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression == 'zlib':
+        return zlib.decompress(payload)
+    return payload
+
+
+class Codec:
+    """Encode values with one serializer, compressing payloads of ``threshold`` bytes or more
+
+    ``decode`` reads every serializer/compression combination and legacy
+    JSON, so the settings can change without invalidating stored values.
+    """
+
+    def __init__(self, serializer: str = 'auto', compression: str = 'auto', threshold: int = 1024,
+                 level: Optional[int] = None):
+        if serializer == 'auto':
+            serializer = available_serializers()[0]
+        if compression == 'auto':
+            compression = available_compressions()[0]
+        if serializer not in available_serializers():
+            raise CodecError(f"Serializer '{serializer}' is not available")
+        if compression not in available_compressions():
+            raise CodecError(f"Compression '{compression}' is not available")
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+        self.level = level
+
+    def __repr__(self) -> str:
+        return f"Codec({self.serializer}, {self.compression} >= {self.threshold}B)"
+
+    def encode(self, value: Any) -> bytes:
+        payload = _serialize(value, self.serializer)
+        compression = self.compression if len(payload) >= self.threshold else 'none'
+        if compression != 'none':
+            compressed = _compress(payload, compression, self.level)
+            if len(compressed) < len(payload):
+                payload = compressed
+            else:
+                compression = 'none'
+        header = CODEC_MAGIC + bytes((CODEC_VERSION, SERIALIZERS[self.serializer], COMPRESSIONS[compression]))
+        return header + payload
+
+    @staticmethod
+    def decode(data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data.startswith(CODEC_MAGIC):
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise CodecError(f"Not an encoded value: {str(e)}")
+        if len(data) < _HEADER_SIZE:
+            raise CodecError("Encoded value is truncated")
+        version, serializer_id, compression_id = data[len(CODEC_MAGIC):_HEADER_SIZE]
+        if version != CODEC_VERSION:
+            raise CodecError(f"Unsupported codec version {version}")
+        if serializer_id not in _SERIALIZER_NAMES or compression_id not in _COMPRESSION_NAMES:
+            raise CodecError(f"Unknown serializer {serializer_id} or compression {compression_id}")
+        try:
+            payload = _decompress(data[_HEADER_SIZE:], _COMPRESSION_NAMES[compression_id])
+            return _deserialize(payload, _SERIALIZER_NAMES[serializer_id])
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Cannot decode value: {str(e)}")
+
+
+DEFAULT_CODEC = Codec()
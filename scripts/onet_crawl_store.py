@@ -0,0 +1,334 @@
+"""
+Checkpoint store for O*NET repository builds
+Persists the crawl frontier and extracted pages in SQLite so an interrupted build can resume
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    depth INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    fetch_state TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_category ON pages (category, seq);
+"""
+
+PAGE_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+class StoredPages(Mapping):
+    """Read-only ``{url: page}`` view of one repository category held in a CrawlStore"""
+
+    def __init__(self, store: 'CrawlStore', category: str):
+        self.store = store
+        self.category = category
+
+    def __getitem__(self, url: str) -> Dict[str, Any]:
+        page = self.store.get_page(self.category, url)
+        if page is None:
+            raise KeyError(url)
+        return page
+
+    def __iter__(self) -> Iterator[str]:
+        for url, _ in self.items():
+            yield url
+
+    def __len__(self) -> int:
+        return self.store.count_pages(self.category)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream pages in insertion order without loading the whole category"""
+        return self.store.iter_pages(self.category)
+
+
+class CrawlStore:
+    """SQLite-backed crawl frontier and partial results
+
+    Writes are buffered and committed every ``batch_size`` operations, so
+    extracted pages leave memory as the build progresses. Commits happen
+    at page boundaries (before ``complete`` buffers the next page), so a
+    page is never marked done without the links enqueued after it. A run
+    left in the ``running`` state by a crash is resumed by the next
+    ``begin`` call with the same mode.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._frontier_rows: List[Tuple[str, int]] = []
+        self._done_rows: List[Tuple[Optional[str], str]] = []
+        self._page_rows: List[Tuple[str, str, str]] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def begin(self, mode: str, seeds: List[str], resume: bool = True) -> bool:
+        """Start a run, resuming an interrupted one of the same mode; returns True when resuming"""
+        with self._lock:
+            run = dict(self._conn.execute('SELECT key, value FROM run'))
+            resuming = resume and run.get('state') == 'running' and run.get('mode') == mode
+            if not resuming:
+                self._discard_buffers()
+                self._conn.execute('DELETE FROM frontier')
+                self._conn.execute('DELETE FROM pages')
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO run (key, value) VALUES (?, ?)',
+                [('state', 'running'), ('mode', mode),
+                 ('started_at' if not resuming else 'resumed_at', datetime.now().isoformat())]
+            )
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, 0)', [(url,) for url in seeds]
+            )
+            self._conn.commit()
+        if resuming:
+            logging.info(f"Resuming interrupted {mode} run from {self.path}: "
+                         f"{len(self.completed())} done, {len(self.pending())} pending")
+        return resuming
+
+    def finish(self):
+        """Flush outstanding writes and mark the run complete"""
+        with self._lock:
+            self.flush()
+            self._conn.execute("INSERT OR REPLACE INTO run (key, value) VALUES ('state', 'complete')")
+            self._conn.commit()
+
+    def enqueue(self, url: str, depth: int):
+        """Add a discovered URL to the frontier; it is committed with the page that linked to it"""
+        with self._lock:
+            self._frontier_rows.append((url, depth))
+
+    def complete(self, url: str, category: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None,
+                 fetch_state: Optional[Dict[str, Any]] = None):
+        """Mark a URL done, storing its extracted page and validators when there are any"""
+        with self._lock:
+            # The only automatic flush: the previous page and the links enqueued after it
+            # are complete, and they commit in one transaction
+            self._maybe_flush()
+            self._done_rows.append((json.dumps(fetch_state) if fetch_state else None, url))
+            if data:
+                self._page_rows.append((url, category, json.dumps(data, ensure_ascii=False)))
+
+    def flush(self):
+        """Commit buffered frontier and page writes in one transaction"""
+        with self._lock:
+            if not (self._frontier_rows or self._done_rows or self._page_rows):
+                return
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)', self._frontier_rows
+                )
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO frontier (url) VALUES (?)', [(url,) for _, url in self._done_rows]
+                )
+                self._conn.executemany(
+                    'UPDATE frontier SET done = 1, fetch_state = ? WHERE url = ?', self._done_rows
+                )
+                self._conn.executemany(
+                    'INSERT INTO pages (url, category, data) VALUES (?, ?, ?) '
+                    'ON CONFLICT (url) DO UPDATE SET category = excluded.category, data = excluded.data',
+                    self._page_rows
+                )
+            self._discard_buffers()
+
+    def _maybe_flush(self):
+        if len(self._frontier_rows) + len(self._done_rows) >= self.batch_size:
+            self.flush()
+
+    def _discard_buffers(self):
+        self._frontier_rows = []
+        self._done_rows = []
+        self._page_rows = []
+
+    # Reads combine committed rows with the write buffers rather than flushing,
+    # so a read can never commit a page without the links it is still enqueuing
+
+    def _buffered_pages(self) -> Dict[str, Tuple[str, str]]:
+        """Buffered page writes as ``{url: (category, data)}``, the latest write winning"""
+        return {url: (category, data) for url, category, data in self._page_rows}
+
+    def _committed_category(self, url: str) -> Optional[str]:
+        row = self._conn.execute('SELECT category FROM pages WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def pending(self) -> List[Tuple[str, int]]:
+        """URLs still to be fetched, with their crawl depth"""
+        with self._lock:
+            done = {url for _, url in self._done_rows}
+            rows = [row for row in self._conn.execute('SELECT url, depth FROM frontier WHERE done = 0 ORDER BY rowid')
+                    if row[0] not in done]
+            known = {url for url, _ in rows}
+            for url, depth in self._frontier_rows:
+                if url in known or url in done:
+                    continue
+                known.add(url)
+                if not self._conn.execute('SELECT 1 FROM frontier WHERE url = ?', (url,)).fetchone():
+                    rows.append((url, depth))
+            return rows
+
+    def completed(self) -> List[str]:
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute('SELECT url FROM frontier WHERE done = 1')]
+            committed = set(urls)
+            for _, url in self._done_rows:
+                if url not in committed:
+                    committed.add(url)
+                    urls.append(url)
+            return urls
+
+    def fetch_states(self) -> Dict[str, Dict[str, Any]]:
+        """Validators recorded for completed URLs"""
+        with self._lock:
+            rows = self._conn.execute('SELECT url, fetch_state FROM frontier WHERE fetch_state IS NOT NULL')
+            states = {url: json.loads(state) for url, state in rows}
+            for state, url in self._done_rows:
+                if state:
+                    states[url] = json.loads(state)
+                else:
+                    states.pop(url, None)
+            return states
+
+    def pages(self, category: str) -> StoredPages:
+        return StoredPages(self, category)
+
+    def get_page(self, category: str, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            buffered = self._buffered_pages().get(url)
+            if buffered is not None:
+                return json.loads(buffered[1]) if buffered[0] == category else None
+            row = self._conn.execute(
+                'SELECT data FROM pages WHERE category = ? AND url = ?', (category, url)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count_pages(self, category: str) -> int:
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM pages WHERE category = ?', (category,)).fetchone()[0]
+            for url, (new_category, _) in self._buffered_pages().items():
+                count += (new_category == category) - (self._committed_category(url) == category)
+            return count
+
+    def iter_pages(self, category: str, chunk_size: int = 200) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield a category's pages in insertion order, reading them a chunk at a time"""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT seq, url, data FROM pages WHERE category = ? AND seq > ? ORDER BY seq LIMIT ?',
+                    (category, last_seq, chunk_size)
+                ).fetchall()
+                buffered = self._buffered_pages()
+                if not rows:
+                    # Pages not committed yet follow the committed ones, as they will once flushed
+                    tail = [(url, data) for url, (page_category, data) in buffered.items()
+                            if page_category == category and self._committed_category(url) is None]
+            if not rows:
+                for url, data in tail:
+                    yield url, json.loads(data)
+                return
+            for last_seq, url, data in rows:
+                if url in buffered:
+                    page_category, data = buffered[url]
+                    if page_category != category:
+                        continue
+                yield url, json.loads(data)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+class PageIndex(Mapping):
+    """SQLite ``{url: page}`` index of a saved repository, read one URL at a time
+
+    Incremental builds look previous extractions up here instead of holding the
+    whole previous repository in memory. The index remembers the fingerprint
+    of the repository files it mirrors, so callers can tell when it is stale.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(PAGE_INDEX_SCHEMA)
+        self._conn.commit()
+
+    def is_current(self, sources: Dict[str, Any]) -> bool:
+        """Whether the index was built from repository files with this fingerprint"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'sources'").fetchone()
+        return row is not None and json.loads(row[0]) == sources
+
+    def rebuild(self, pages: Iterable[Tuple[str, Dict[str, Any]]], sources: Dict[str, Any]):
+        """Replace the indexed pages in one transaction, streaming them from ``pages``"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM pages')
+            self._conn.execute("DELETE FROM meta WHERE key = 'sources'")
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO pages (url, data) VALUES (?, ?)',
+                ((url, json.dumps(data, ensure_ascii=False)) for url, data in pages)
+            )
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('sources', ?)", (json.dumps(sources),))
+
+    def __getitem__(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            raise KeyError(url)
+        return json.loads(row[0])
+
+    def __contains__(self, url: object) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute('SELECT url FROM pages')]
+        return iter(urls)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,247 @@
+"""
+Asynchronous crawl engine for the O*NET reference documentation
+Follows links discovered during extraction with bounded concurrency and per-host politeness
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse
+
+import aiohttp
+
+from .onet_transport import OnetTransport, TransportResponse
+
+
+@dataclass
+class CrawlConfig:
+    """Limits applied to a single crawl run"""
+    max_concurrency: int = 10        # Requests in flight across all hosts
+    per_host_concurrency: int = 2    # Requests in flight against one host
+    per_host_delay: float = 0.25     # Minimum seconds between request starts on one host
+    max_depth: int = 2               # Link hops followed from the seed URLs
+    max_pages: int = 500             # Hard cap on fetched pages
+    allow_patterns: List[str] = field(default_factory=list)  # Regexes a followed URL must match (any)
+    deny_patterns: List[str] = field(default_factory=list)   # Regexes that exclude a URL
+    same_host_only: bool = True      # Only follow links on the seed hosts
+    request_timeout: float = 30.0
+    user_agent: str = 'CareerExplorer-OnetCrawler/1.0'
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single URL"""
+    url: str
+    depth: int
+    status: int
+    text: Optional[str]
+    headers: Dict[str, str]
+    elapsed: float
+    error: Optional[str] = None
+    size: int = 0  # Response body bytes as transferred, before content decoding
+    retries: int = 0  # Attempts retried by the transport before this result
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.text is not None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+# A page handler receives each fetched page and returns the URLs it links to
+PageHandler = Callable[[FetchResult], Awaitable[List[str]]]
+
+# Supplies extra request headers (e.g. conditional-GET validators) for a URL
+HeaderProvider = Callable[[str], Dict[str, str]]
+
+# Notified of every URL added to the crawl queue, with its depth
+EnqueueListener = Callable[[str, int], None]
+
+# Notified of every fetch attempt, including failed ones the page handler never sees
+FetchListener = Callable[[FetchResult], None]
+
+
+class HostThrottle:
+    """Per-host concurrency cap and minimum spacing between requests"""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.concurrency)
+        return self._semaphores[host]
+
+    async def wait_turn(self, host: str):
+        """Sleep until the host's politeness delay has elapsed"""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            wait = self._next_slot.get(host, now) - now
+            self._next_slot[host] = max(now, self._next_slot.get(host, now)) + self.delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncCrawler:
+    """Breadth-first crawler with a global concurrency cap and depth/pattern limits"""
+
+    def __init__(self, config: Optional[CrawlConfig] = None,
+                 transport: Optional[OnetTransport] = None,
+                 request_headers: Optional[HeaderProvider] = None,
+                 on_enqueue: Optional[EnqueueListener] = None,
+                 on_fetched: Optional[FetchListener] = None):
+        self.config = config or CrawlConfig()
+        self._transport = transport
+        self._request_headers = request_headers
+        self._on_enqueue = on_enqueue
+        self._on_fetched = on_fetched
+        self._allow = [re.compile(p) for p in self.config.allow_patterns]
+        self._deny = [re.compile(p) for p in self.config.deny_patterns]
+        self._throttle = HostThrottle(self.config.per_host_concurrency, self.config.per_host_delay)
+        self._seed_hosts: Set[str] = set()
+        self.seen: Set[str] = set()
+        self.stats = {'fetched': 0, 'not_modified': 0, 'failed': 0, 'skipped': 0}
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Drop fragments so the same page is not fetched twice"""
+        return urldefrag(url)[0]
+
+    def should_follow(self, url: str, depth: int) -> bool:
+        """Check a discovered link against the depth, host and pattern limits"""
+        if depth > self.config.max_depth:
+            return False
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        if self.config.same_host_only and parsed.netloc not in self._seed_hosts:
+            return False
+        if any(p.search(url) for p in self._deny):
+            return False
+        if self._allow and not any(p.search(url) for p in self._allow):
+            return False
+        return True
+
+    async def fetch(self, transport: OnetTransport, url: str, depth: int) -> FetchResult:
+        """Fetch a URL while honouring the per-host limits; the transport retries transient failures"""
+        host = urlparse(url).netloc
+        async with self._throttle.semaphore(host):
+            await self._throttle.wait_turn(host)
+            headers = {'User-Agent': self.config.user_agent}
+            if self._request_headers:
+                headers.update(self._request_headers(url))
+            start = time.perf_counter()
+            try:
+                # Per-request timeout so a shared transport keeps the crawl's limits
+                response = await transport.get(url, headers=headers, timeout=self.config.request_timeout)
+                return FetchResult(
+                    url=url,
+                    depth=depth,
+                    status=response.status,
+                    text=response.text if response.status == 200 else None,
+                    headers=response.headers,
+                    elapsed=time.perf_counter() - start,
+                    size=_transferred_bytes(response),
+                    retries=response.retries
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return FetchResult(
+                    url=url,
+                    depth=depth,
+                    status=0,
+                    text=None,
+                    headers={},
+                    elapsed=time.perf_counter() - start,
+                    error=str(e) or type(e).__name__
+                )
+
+    async def crawl(self, seeds: List[str], handle_page: PageHandler,
+                    frontier: Optional[List[Tuple[str, int]]] = None,
+                    visited: Iterable[str] = ()) -> Dict[str, int]:
+        """Crawl from the seed URLs, passing each fetched page to the handler
+
+        To resume an interrupted crawl, pass the still-pending ``frontier`` as
+        (url, depth) pairs and the already ``visited`` URLs; the seeds then only
+        determine which hosts may be followed.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for seed in seeds:
+            self._seed_hosts.add(urlparse(self.normalize_url(seed)).netloc)
+        self.seen.update(self.normalize_url(url) for url in visited)
+        for url, depth in frontier if frontier is not None else [(seed, 0) for seed in seeds]:
+            url = self.normalize_url(url)
+            if url not in self.seen and len(self.seen) < self.config.max_pages:
+                self.seen.add(url)
+                queue.put_nowait((url, depth))
+
+        transport = self._transport
+        owns_transport = transport is None
+        if owns_transport:
+            transport = OnetTransport()
+
+        async def worker():
+            while True:
+                url, depth = await queue.get()
+                try:
+                    await self._process(transport, queue, url, depth, handle_page)
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    logging.error(f"Error processing {url}: {str(e)}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.config.max_concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if owns_transport:
+                await transport.aclose()
+
+        logging.info(f"Crawl finished: {self.stats}")
+        return dict(self.stats)
+
+    async def _process(self, transport: OnetTransport, queue: asyncio.Queue,
+                       url: str, depth: int, handle_page: PageHandler):
+        result = await self.fetch(transport, url, depth)
+        if self._on_fetched:
+            self._on_fetched(result)
+        if result.not_modified:
+            self.stats['not_modified'] += 1
+        elif result.ok:
+            self.stats['fetched'] += 1
+        else:
+            self.stats['failed'] += 1
+            logging.warning(f"Fetch failed for {url}: status={result.status} error={result.error}")
+            return
+
+        links = await handle_page(result)
+        for link in links or []:
+            link = self.normalize_url(link)
+            if link in self.seen:
+                continue
+            if len(self.seen) >= self.config.max_pages or not self.should_follow(link, depth + 1):
+                self.stats['skipped'] += 1
+                continue
+            self.seen.add(link)
+            if self._on_enqueue:
+                self._on_enqueue(link, depth + 1)
+            queue.put_nowait((link, depth + 1))
+
+
+def _transferred_bytes(response: TransportResponse) -> int:
+    """Content-Length of a response, or the decoded body size when the server sent none"""
+    length = next((value for name, value in response.headers.items() if name.lower() == 'content-length'), '')
+    return int(length) if length.isdigit() else len(response.body)
@@ -0,0 +1,193 @@
+"""
+Persistent documentation cache for the O*NET reference helper
+One SQLite database in WAL mode shared by every worker, with per-entry TTL and LRU eviction under a byte budget
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .onet_codec import DEFAULT_CODEC, Codec, CodecError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Reads refresh an entry's LRU position at most this often, so hot keys do not turn every read into a write
+ACCESS_RESOLUTION = 60.0
+
+
+class CachedDocument(NamedTuple):
+    value: Any
+    created_at: float
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class DocumentCache:
+    """SQLite key/value cache safe to share between processes
+
+    Every write is its own transaction, so readers in other processes see
+    either the old or the new value. Entries past their TTL are not
+    returned by ``get``; ``get_entry`` still reports them for another
+    ``stale_ttl`` seconds so callers can serve them while refreshing. When the
+    stored bytes exceed ``max_bytes`` the least recently used entries are
+    evicted. ``generation`` changes whenever an entry is written or
+    deleted, so derived data such as snapshots can tell it is stale.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, default_ttl: float = 86400,
+                 codec: Codec = DEFAULT_CODEC, busy_timeout: float = 30.0, stale_ttl: float = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.codec = codec
+        self.busy_timeout = busy_timeout
+        self.counters = {'hits': 0, 'misses': 0, 'expired': 0, 'sets': 0, 'evictions': 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # A connection must not cross a fork; each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get_entry(self, key: str) -> Optional[CachedDocument]:
+        """The stored entry, expired but within its stale window or not, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT value, created_at, expires_at, accessed_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            now = time.time()
+            # Rows past the stale window linger until the next write evicts them
+            if row is None or row[2] + self.stale_ttl <= now:
+                self.counters['misses'] += 1
+                return None
+            value, created_at, expires_at, accessed_at = row
+            if now - accessed_at > ACCESS_RESOLUTION:
+                self.conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        try:
+            document = CachedDocument(self.codec.decode(value), created_at, expires_at)
+        except CodecError:
+            self.delete(key)
+            self.counters['misses'] += 1
+            return None
+        self.counters['expired' if document.expired else 'hits'] += 1
+        return document
+
+    def get(self, key: str) -> Optional[Any]:
+        """The cached value, or None when missing or expired"""
+        document = self.get_entry(key)
+        return None if document is None or document.expired else document.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store ``value`` atomically for ``ttl`` seconds, then evict down to the byte budget"""
+        encoded = self.codec.encode(value)
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, created_at, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, encoded, len(encoded), now, now + (self.default_ttl if ttl is None else ttl), now)
+                )
+                self._bump_generation(conn)
+                self._evict(conn, keep=key)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self.counters['sets'] += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self.conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if conn.execute('DELETE FROM entries WHERE key = ?', (key,)).rowcount:
+                    self._bump_generation(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection):
+        conn.execute("INSERT INTO meta (key, value) VALUES ('generation', 1) "
+                     "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        """Drop entries past their stale window, then least recently used ones while over budget"""
+        conn.execute('DELETE FROM entries WHERE expires_at <= ? AND key != ?', (time.time() - self.stale_ttl, keep))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries WHERE key != ? ORDER BY accessed_at', (keep,)):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+        self.counters['evictions'] += len(victims)
+
+    def generation(self) -> int:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def expired_keys(self) -> List[str]:
+        """Keys past their TTL but still inside the stale window, due for a refresh"""
+        now = time.time()
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                'SELECT key FROM entries WHERE expires_at <= ? AND expires_at + ? > ? ORDER BY key',
+                (now, self.stale_ttl, now)
+            )]
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.conn.execute('SELECT key FROM entries ORDER BY key')]
+
+    def stats(self) -> Dict[str, int]:
+        """This process's counters plus the shared store's size"""
+        with self._lock:
+            entries, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return dict(self.counters, entries=entries, bytes=size)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -1,28 +1,64 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 import os
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urljoin
 import re
+import threading
+import time
+from collections.abc import Mapping
+from functools import partial
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('onet_extraction.log'),
-        logging.StreamHandler()
-    ]
+from .onet_archive import HtmlArchive
+from .onet_crawl_store import CrawlStore, PageIndex, StoredPages
+from .onet_crawler import AsyncCrawler, CrawlConfig, FetchResult
+from .onet_fetch_state import FetchStateStore, content_hash
+from .onet_html import (
+    DEFAULT_PARSER, LinkCapture, TableCapture, TextCapture, available_backends, get_backend, walk_page
 )
+from .onet_pipeline import ExtractionPipeline, FetchOutcome, StageMetrics, start_workers
+from .onet_shards import (
+    PAGE_CATEGORIES, ShardedRepository, indented_json, remove_repository_shards, write_json_pages,
+    write_repository_shards
+)
+from .onet_snapshot import load_repository, repository_paths, repository_sources, source_fingerprint, write_snapshot
+from .onet_telemetry import CrawlTelemetry
+from .onet_transport import get_transport
+
+DEFAULT_BASE_URL = 'https://services.onetcenter.org/reference/'
+# 'json' writes the single onet_reference.json file; the others write a sharded layout
+OUTPUT_FORMATS = ('json', 'shards', 'ndjson')
+
+def configure_logging():
+    """Configure logging for command-line runs"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('onet_extraction.log'),
+            logging.StreamHandler()
+        ]
+    )
 
 class OnetDataExtractor:
-    def __init__(self):
+    def __init__(self, output_dir: str = 'onet_repository', incremental: bool = True,
+                 archive: bool = True, parser: str = DEFAULT_PARSER,
+                 checkpoint: bool = True, resume: bool = True, output_format: str = 'json'):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'")
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.incremental = incremental
+        # Validate the backend name up front; workers look it up again by name
+        get_backend(parser)
+        self.parser = parser
         self.base_urls = [
-            'https://services.onetcenter.org/reference/',
+            DEFAULT_BASE_URL,
             'https://services.onetcenter.org/about',
             'https://services.onetcenter.org/reference/online',
             'https://services.onetcenter.org/reference/taxonomy',
@@ -40,48 +76,165 @@ class OnetDataExtractor:
             'api_reference': {},
             'statistics': {}
         }
-        self.session = requests.Session()
+        # Pooled keep-alive connections with timeouts and retries, shared with the other O*NET clients
+        self.transport = get_transport()
+        self.session = self.transport.session
+
+        # Validators and extractions from the previous build drive incremental refreshes; the
+        # extractions are looked up per URL in an on-disk index rather than loaded up front
+        self.fetch_state = FetchStateStore(os.path.join(output_dir, 'fetch_state.json'))
+        self.page_index = PageIndex(os.path.join(output_dir, 'previous_pages.sqlite3'))
+        self.previous_pages = self._open_previous_pages() if incremental else {}
+        self.refresh_stats = {'parsed': 0, 'not_modified': 0, 'unchanged': 0}
+        self.pipeline_metrics: Dict[str, Dict[str, Any]] = {}
+        self._stats_lock = threading.Lock()
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        self._crawl_metrics: Dict[str, StageMetrics] = {}
+        # Per-URL latency, size, retries, parse time and element counts for this run
+        self.telemetry = CrawlTelemetry()
+
+        # Raw HTML is archived so extraction can be replayed without the network
+        self.archive = HtmlArchive(os.path.join(output_dir, 'archive')) if archive else None
+
+        # The frontier and extracted pages are checkpointed to SQLite in batches, so an
+        # interrupted build resumes where it stopped and pages do not accumulate in memory
+        self.resume = resume
+        self.resumed_pages = 0
+        self.crawl_store = CrawlStore(os.path.join(output_dir, 'crawl_state.sqlite3')) if checkpoint else None
+        if self.crawl_store is not None:
+            for category in PAGE_CATEGORIES:
+                self.repository[category] = self.crawl_store.pages(category)
 
     def extract_page_content(self, url: str) -> Dict[str, Any]:
         """Extract content from a single page with error handling"""
         try:
-            response = self.session.get(url)
+            response = self._get(url)
+            if response.status_code == 304:
+                return self._reuse_previous(url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract main content
-            main_content = soup.find('main') or soup.find('div', class_='content')
-            if not main_content:
-                logging.warning(f"No main content found for {url}")
-                return {}
-
-            # Extract critical information based on Pareto principle
-            critical_data = {
-                'title': soup.title.string if soup.title else '',
-                'headers': [h.text.strip() for h in main_content.find_all(['h1', 'h2', 'h3'])],
-                'key_points': self._extract_key_points(main_content),
-                'tables': self._extract_tables(main_content),
-                'links': self._extract_important_links(main_content),
-                'metadata': {
-                    'url': url,
-                    'last_extracted': datetime.now().isoformat()
-                }
-            }
-
-            return critical_data
+            return self._process_page(url, response.text, response.headers)
 
         except Exception as e:
             logging.error(f"Error extracting content from {url}: {str(e)}")
             return {}
 
-    def _extract_key_points(self, content) -> List[str]:
+    def _get(self, url: str) -> requests.Response:
+        """GET a page with its validators, recording latency, bytes transferred and retries"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=self._conditional_headers(url))
+        except requests.RequestException as e:
+            self.telemetry.record_fetch(url, None, time.perf_counter() - start, error=str(e))
+            raise
+        self.telemetry.record_fetch(url, response.status_code, time.perf_counter() - start,
+                                    _transferred_bytes(response), _retry_count(response))
+        return response
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators for a conditional GET, only sent when a previous extraction can be reused"""
+        if not self.incremental or url not in self.previous_pages:
+            return {}
+        return self.fetch_state.conditional_headers(url)
+
+    def _reuse_previous(self, url: str) -> Dict[str, Any]:
+        """Return the previous extraction for a page the server reported as not modified"""
+        self._count('not_modified')
+        return self.previous_pages[url]
+
+    def _process_page(self, url: str, html: str, headers) -> Dict[str, Any]:
+        """Parse a full response unless its content hash matches the previous build"""
+        reused, body_hash = self._prepare_page(url, html, headers)
+        if reused is not None:
+            return reused
+        data, seconds = parse_page_task(url, html, self.parser)
+        self.telemetry.record_parse(url, seconds, data)
+        self._accept_parsed(url, data, headers, body_hash)
+        return data
+
+    def _prepare_page(self, url: str, html: str, headers) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Archive a full response and return the previous extraction if its body is unchanged"""
+        body_hash = self.archive.put(url, html) if self.archive is not None else content_hash(html)
+        if (self.incremental and url in self.previous_pages
+                and self.fetch_state.is_unchanged(url, body_hash)):
+            self._count('unchanged')
+            self.fetch_state.record(url, dict(headers), body_hash)
+            return self.previous_pages[url], body_hash
+        return None, body_hash
+
+    def _accept_parsed(self, url: str, data: Dict[str, Any], headers, body_hash: str):
+        """Record the validators of a freshly parsed page"""
+        self._count('parsed')
+        if data:
+            self.fetch_state.record(url, dict(headers), body_hash)
+
+    def _fetch_stage(self, url: str) -> Optional[FetchOutcome]:
+        """Pipeline fetch stage: download a page and decide whether it needs parsing"""
+        try:
+            response = self._get(url)
+            if response.status_code == 304:
+                return FetchOutcome(url=url, result=self._reuse_previous(url))
+            response.raise_for_status()
+        except Exception as e:
+            logging.error(f"Error fetching {url}: {str(e)}")
+            return None
+
+        reused, body_hash = self._prepare_page(url, response.text, response.headers)
+        if reused is not None:
+            return FetchOutcome(url=url, result=reused)
+        return FetchOutcome(url=url, html=response.text, context=(response.headers, body_hash))
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.refresh_stats[key] += 1
+
+    def _open_previous_pages(self) -> Mapping:
+        """Per-URL view of the previously saved repository, re-indexed only when its files changed"""
+        sources = source_fingerprint(repository_sources(self.output_dir))
+        if self.page_index.is_current(sources):
+            return self.page_index
+        try:
+            self.page_index.rebuild(_saved_pages(self.output_dir), sources)
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Cannot reuse previous repository in {self.output_dir}: {str(e)}")
+            self.page_index.rebuild((), {})
+        return self.page_index
+
+    @staticmethod
+    def parse_page_content(url: str, html: str, parser: str = DEFAULT_PARSER) -> Dict[str, Any]:
+        """Extract critical information from already fetched page HTML"""
+        backend = get_backend(parser)
+        document = backend.parse(html)
+        # One traversal collects everything below; the helpers only post-process it
+        page = walk_page(backend, document)
+
+        # Extract main content
+        main_content = page.scopes.get('main') or page.scopes.get('content')
+        if main_content is None:
+            logging.warning(f"No main content found for {url}")
+            return {}
+
+        # Extract critical information based on Pareto principle
+        critical_data = {
+            'title': backend.string(page.title_node) if page.title_node is not None else '',
+            'headers': [h.text.strip() for h in main_content.headers],
+            'key_points': OnetDataExtractor._extract_key_points(main_content.paragraphs),
+            'tables': OnetDataExtractor._extract_tables(main_content.tables),
+            'links': OnetDataExtractor._extract_important_links(main_content.links, url),
+            'metadata': {
+                'url': url,
+                'last_extracted': datetime.now().isoformat()
+            }
+        }
+
+        return critical_data
+
+    @staticmethod
+    def _extract_key_points(paragraphs: List[TextCapture]) -> List[str]:
         """Extract key points from content focusing on critical information"""
         key_points = []
         
         # Extract from paragraphs that contain important keywords
         important_keywords = ['important', 'key', 'critical', 'essential', 'primary', 'core']
-        paragraphs = content.find_all('p')
-        
         for p in paragraphs:
             text = p.text.strip()
             if any(keyword in text.lower() for keyword in important_keywords):
@@ -90,20 +243,21 @@ class OnetDataExtractor:
         # Limit to top 20% most relevant points
         return key_points[:max(1, len(key_points) // 5)]
 
-    def _extract_tables(self, content) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _extract_tables(captured: List[TableCapture]) -> List[Dict[str, Any]]:
         """Extract and structure table data"""
         tables = []
-        for table in content.find_all('table'):
+        for table in captured:
             headers = []
             rows = []
             
             # Extract headers
-            for th in table.find_all('th'):
+            for th in table.headers:
                 headers.append(th.text.strip())
             
             # Extract rows
-            for tr in table.find_all('tr'):
-                row = [td.text.strip() for td in tr.find_all('td')]
+            for tr in table.rows:
+                row = [td.text.strip() for td in tr]
                 if row:
                     rows.append(row)
             
@@ -115,11 +269,13 @@ class OnetDataExtractor:
         
         return tables
 
-    def _extract_important_links(self, content) -> List[Dict[str, str]]:
-        """Extract important links based on context"""
+    @staticmethod
+    def _extract_important_links(links: List[LinkCapture],
+                                 page_url: Optional[str] = None) -> List[Dict[str, str]]:
+        """Extract important links based on context, resolved against the page URL"""
         important_links = []
-        for link in content.find_all('a'):
-            href = link.get('href')
+        for link in links:
+            href = link.href
             text = link.text.strip()
             
             if href and text and not href.startswith('#'):
@@ -127,72 +283,259 @@ class OnetDataExtractor:
                 if any(term in text.lower() for term in ['api', 'database', 'reference', 'guide', 'documentation']):
                     important_links.append({
                         'text': text,
-                        'url': urljoin(self.base_urls[0], href)
+                        'url': urljoin(page_url or DEFAULT_BASE_URL, href)
                     })
         
         return important_links
 
-    def build_repository(self):
-        """Build the complete repository with parallel processing"""
+    def build_repository(self, fetch_workers: int = 5, parse_workers: Optional[int] = None):
+        """Build the complete repository with a fetch/parse pipeline"""
         logging.info("Starting repository build...")
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            # Map URLs to their respective content sections
-            future_to_url = {
-                executor.submit(self.extract_page_content, url): url 
-                for url in self.base_urls
-            }
-            
-            for future in future_to_url:
-                url = future_to_url[future]
-                try:
-                    data = future.result()
-                    if data:
-                        # Categorize content based on URL path
-                        if 'taxonomy' in url:
-                            self.repository['taxonomy'][url] = data
-                        elif 'database' in url:
-                            self.repository['database_structure'][url] = data
-                        elif 'reference' in url:
-                            self.repository['api_reference'][url] = data
-                        else:
-                            self.repository['core_content'][url] = data
-                except Exception as e:
-                    logging.error(f"Error processing {url}: {str(e)}")
+        pending = self._begin_run('build', self.base_urls)
+        urls = self.base_urls if pending is None else [url for url, _ in pending]
+
+        # Fetch threads feed a process pool of parsers so parsing is not serialized by the GIL
+        pipeline = ExtractionPipeline(
+            self._fetch_stage, partial(parse_page_task, parser=self.parser),
+            fetch_workers=fetch_workers, parse_workers=parse_workers
+        )
+        self.pipeline_metrics = pipeline.run(urls, self._store_outcome)
 
         # Generate statistics
         self._generate_statistics()
         self._save_repository()
+        self._finish_run()
         
         logging.info("Repository build completed")
 
-    def _generate_statistics(self):
+    def _store_outcome(self, outcome: FetchOutcome, data: Optional[Dict[str, Any]]):
+        """Pipeline result callback: record validators and store the page"""
+        if outcome.parse_seconds is not None:
+            self.telemetry.record_parse(outcome.url, outcome.parse_seconds, data)
+        if outcome.html is not None:
+            headers, body_hash = outcome.context
+            self._accept_parsed(outcome.url, data, headers, body_hash)
+        if data:
+            self._store_page(outcome.url, data)
+        else:
+            self._skip_page(outcome.url)
+
+    def _begin_run(self, mode: str, seeds: List[str]) -> Optional[List[Tuple[str, int]]]:
+        """Open a checkpointed run and return its pending (url, depth) frontier
+
+        Returns None when checkpointing is disabled.
+        """
+        if self.crawl_store is None:
+            return None
+        if self.crawl_store.begin(mode, seeds, resume=self.resume):
+            # Validators of pages finished before the interruption were never saved
+            self.fetch_state.entries.update(self.crawl_store.fetch_states())
+            self.resumed_pages = len(self.crawl_store.completed())
+        return self.crawl_store.pending()
+
+    def _finish_run(self):
+        """Mark a checkpointed run complete so the next build starts afresh"""
+        if self.crawl_store is not None:
+            self.crawl_store.finish()
+
+    def crawl_repository(self, config: Optional[CrawlConfig] = None,
+                         parse_workers: Optional[int] = None) -> Dict[str, int]:
+        """Build the repository by crawling outward from the base URLs"""
+        config = config or CrawlConfig()
+        logging.info(
+            f"Starting repository crawl (concurrency={config.max_concurrency}, "
+            f"depth={config.max_depth}, max_pages={config.max_pages})..."
+        )
+        pending = self._begin_run('crawl', self.base_urls)
+        self._crawl_metrics = {'fetch': StageMetrics('fetch'), 'parse': StageMetrics('parse')}
+        with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+            start_workers(executor)
+            self._parse_executor = executor
+            try:
+                crawl_stats = asyncio.run(self._crawl(config, pending))
+            finally:
+                self._parse_executor = None
+        self.pipeline_metrics = {name: stage.as_dict() for name, stage in self._crawl_metrics.items()}
+
+        self._generate_statistics(
+            total_pages=crawl_stats['fetched'] + crawl_stats['not_modified'] + self.resumed_pages
+        )
+        self.repository['statistics']['crawl'] = crawl_stats
+        self._save_repository()
+        self._finish_run()
+
+        logging.info("Repository crawl completed")
+        return crawl_stats
+
+    async def _crawl(self, config: CrawlConfig, pending: Optional[List[Tuple[str, int]]]) -> Dict[str, int]:
+        """Run the crawler over the shared transport's connection pool"""
+        crawler = AsyncCrawler(config, transport=self.transport,
+                               request_headers=self._conditional_headers,
+                               on_enqueue=self.crawl_store.enqueue if self.crawl_store is not None else None,
+                               on_fetched=self._record_crawl_fetch)
+        visited = self.crawl_store.completed() if self.crawl_store is not None else ()
+        try:
+            return await crawler.crawl(self.base_urls, self._handle_crawled_page,
+                                       frontier=pending, visited=visited)
+        finally:
+            # The pooled aiohttp session is bound to this event loop, which ends with the crawl
+            await self.transport.aclose()
+
+    def _record_crawl_fetch(self, result: FetchResult):
+        self.telemetry.record_fetch(result.url, result.status or None, result.elapsed,
+                                    result.size, result.retries, error=result.error)
+
+    async def _handle_crawled_page(self, result: FetchResult) -> List[str]:
+        """Parse a crawled page in the process pool and return the links to follow"""
+        self._crawl_metrics['fetch'].record(result.elapsed)
+        if result.not_modified:
+            data = self._reuse_previous(result.url)
+        else:
+            data, body_hash = self._prepare_page(result.url, result.text, result.headers)
+            if data is None:
+                loop = asyncio.get_running_loop()
+                data, seconds = await loop.run_in_executor(
+                    self._parse_executor, partial(parse_page_task, parser=self.parser),
+                    result.url, result.text
+                )
+                self._crawl_metrics['parse'].record(seconds)
+                self.telemetry.record_parse(result.url, seconds, data)
+                self._accept_parsed(result.url, data, result.headers, body_hash)
+        if not data:
+            self._skip_page(result.url)
+            return []
+        self._store_page(result.url, data)
+        return [link['url'] for link in data.get('links', [])]
+
+    def replay_repository(self, parse_workers: Optional[int] = None) -> int:
+        """Rebuild the repository purely from archived HTML, without network access"""
+        if self.archive is None or not len(self.archive):
+            logging.error("No archived pages available for replay")
+            return 0
+
+        logging.info(f"Replaying {len(self.archive)} archived pages...")
+        pending = self._begin_run('replay', self.archive.urls())
+        urls = self.archive.urls() if pending is None else [url for url, _ in pending]
+
+        def read_archived(url: str) -> Optional[FetchOutcome]:
+            html = self.archive.get(url)
+            return FetchOutcome(url=url, html=html) if html is not None else None
+
+        def store(outcome: FetchOutcome, data: Optional[Dict[str, Any]]):
+            self._count('parsed')
+            if outcome.parse_seconds is not None:
+                self.telemetry.record_parse(outcome.url, outcome.parse_seconds, data)
+            if data:
+                self._store_page(outcome.url, data)
+            else:
+                self._skip_page(outcome.url)
+
+        pipeline = ExtractionPipeline(read_archived, partial(parse_page_task, parser=self.parser),
+                                      fetch_workers=2,
+                                      parse_workers=parse_workers)
+        self.pipeline_metrics = pipeline.run(urls, store)
+
+        replayed = sum(len(self.repository[category]) for category in PAGE_CATEGORIES)
+        self._generate_statistics(total_pages=replayed)
+        self.repository['statistics']['replayed_from'] = self.archive.root
+        self._save_repository()
+        self._finish_run()
+
+        logging.info("Repository replay completed")
+        return replayed
+
+    @staticmethod
+    def categorize_url(url: str) -> str:
+        """Map a URL to its repository section based on the URL path"""
+        if 'taxonomy' in url:
+            return 'taxonomy'
+        elif 'database' in url:
+            return 'database_structure'
+        elif 'reference' in url:
+            return 'api_reference'
+        return 'core_content'
+
+    def _store_page(self, url: str, data: Dict[str, Any]):
+        """Store extracted page data under its category"""
+        category = self.categorize_url(url)
+        if self.crawl_store is not None:
+            self.crawl_store.complete(url, category, data, self.fetch_state.get(url))
+        else:
+            self.repository[category][url] = data
+
+    def _skip_page(self, url: str):
+        """Mark a page without extractable content as done"""
+        if self.crawl_store is not None:
+            self.crawl_store.complete(url)
+
+    def _generate_statistics(self, total_pages: Optional[int] = None):
         """Generate repository statistics for monitoring"""
         self.repository['statistics'] = {
-            'total_pages': len(self.base_urls),
+            'total_pages': len(self.base_urls) if total_pages is None else total_pages,
             'content_distribution': {
                 'taxonomy': len(self.repository['taxonomy']),
                 'database': len(self.repository['database_structure']),
                 'api': len(self.repository['api_reference']),
                 'core': len(self.repository['core_content'])
             },
+            'refresh': dict(self.refresh_stats),
+            'resumed_pages': self.resumed_pages,
+            'pipeline': self.pipeline_metrics,
+            'telemetry': self.telemetry.summary(),
             'extraction_timestamp': datetime.now().isoformat()
         }
 
     def _save_repository(self):
         """Save the repository to a JSON file with error handling"""
         try:
-            output_dir = 'onet_repository'
-            os.makedirs(output_dir, exist_ok=True)
+            os.makedirs(self.output_dir, exist_ok=True)
             
-            output_file = os.path.join(output_dir, 'onet_reference.json')
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.repository, f, indent=2, ensure_ascii=False)
+            paths = repository_paths(self.output_dir)
+            output_file, shard_dir = paths['json'], paths['shards']
+            if self.output_format == 'json':
+                tmp_file = f"{output_file}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    self._write_repository(f)
+                os.replace(tmp_file, output_file)
+                # Only one layout may exist, so the next build reuses the right one
+                remove_repository_shards(shard_dir)
+            else:
+                write_repository_shards(shard_dir, self.repository,
+                                        'json' if self.output_format == 'shards' else 'ndjson')
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+                output_file = shard_dir
+            # Binary image of the same content for fast startup of API workers
+            write_snapshot(paths['snapshot'], 'repository', self.repository,
+                           repository_sources(self.output_dir))
+            # The next incremental build then finds this run's pages without reloading them
+            self.page_index.rebuild(
+                (item for category in PAGE_CATEGORIES for item in self.repository[category].items()),
+                source_fingerprint(repository_sources(self.output_dir))
+            )
+            self.fetch_state.save()
+            self.telemetry.write_records(os.path.join(self.output_dir, 'telemetry.ndjson'))
             
             logging.info(f"Repository saved to {output_file}")
         except Exception as e:
             logging.error(f"Error saving repository: {str(e)}")
 
+    def write_metrics(self, path: str):
+        """Dump this run's telemetry in the Prometheus text format"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.telemetry.to_prometheus())
+
+    def _write_repository(self, f):
+        """Write the repository as indented JSON, streaming checkpointed pages one at a time"""
+        f.write('{')
+        for i, (key, value) in enumerate(self.repository.items()):
+            f.write(f"{',' if i else ''}\n  {json.dumps(key)}: ")
+            if isinstance(value, StoredPages):
+                write_json_pages(f, value.items(), level=2)
+            else:
+                f.write(indented_json(value, 2))
+        f.write('\n}')
+
     def search_repository(self, query: str) -> Dict[str, Any]:
         """Search through the repository content"""
         results = {
@@ -201,10 +544,10 @@ class OnetDataExtractor:
         }
         
         def search_dict(data, path=''):
-            if isinstance(data, dict):
+            if isinstance(data, Mapping):
                 for key, value in data.items():
                     new_path = f"{path}.{key}" if path else key
-                    if isinstance(value, (dict, list)):
+                    if isinstance(value, (Mapping, list)):
                         search_dict(value, new_path)
                     elif isinstance(value, str) and query.lower() in value.lower():
                         results['matches'].append({
@@ -218,12 +561,105 @@ class OnetDataExtractor:
         search_dict(self.repository)
         return results
 
-def main():
+def _retry_count(response: requests.Response) -> int:
+    """Retries urllib3 made before returning a response, when the adapter allows retries"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(getattr(retries, 'history', None) or ())
+
+def _saved_pages(output_dir: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream the pages of a saved repository, a shard at a time when it is sharded"""
+    shard_dir = repository_paths(output_dir)['shards']
+    if ShardedRepository.exists(shard_dir):
+        for category in PAGE_CATEGORIES:
+            # A fresh reader per category keeps at most one loaded shard alive
+            yield from ShardedRepository(shard_dir).iter_pages(category)
+        return
+    previous = load_repository(output_dir)
+    for category in PAGE_CATEGORIES:
+        yield from previous.get(category, {}).items()
+
+def _transferred_bytes(response: requests.Response) -> int:
+    """Body bytes as sent on the wire, before any Content-Encoding is undone"""
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        return int(length)
+    tell = getattr(response.raw, 'tell', None)
+    if callable(tell):
+        response.content  # Reads the stream to the end so the raw count is complete
+        return tell()
+    return len(response.content)
+
+def parse_page_task(url: str, html: str, parser: str = DEFAULT_PARSER) -> Tuple[Dict[str, Any], float]:
+    """Process-pool entry point: parse page HTML and report the time spent parsing"""
+    start = time.perf_counter()
+    data = OnetDataExtractor.parse_page_content(url, html, parser)
+    return data, time.perf_counter() - start
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Build the O*NET reference repository')
+    parser.add_argument('--crawl', action='store_true',
+                        help='Follow extracted links with the asyncio crawler')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore stored validators and re-parse every page')
+    parser.add_argument('--replay', action='store_true',
+                        help='Rebuild the repository from the raw HTML archive without fetching')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='Do not archive raw HTML responses')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json',
+                        help='Single onet_reference.json file, or one JSON/NDJSON shard per category')
+    parser.add_argument('--metrics-file',
+                        help='Write per-run telemetry in the Prometheus text format to this file')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='Keep the build in memory instead of checkpointing it to SQLite')
+    parser.add_argument('--restart', action='store_true',
+                        help='Discard an interrupted build instead of resuming it')
+    parser.add_argument('--parser', choices=available_backends(), default=DEFAULT_PARSER,
+                        help='HTML parser backend used for extraction')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Parser processes (defaults to the number of CPUs)')
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help='Maximum requests in flight during a crawl')
+    parser.add_argument('--per-host', type=int, default=2,
+                        help='Maximum requests in flight per host during a crawl')
+    parser.add_argument('--delay', type=float, default=0.25,
+                        help='Minimum seconds between requests to the same host')
+    parser.add_argument('--max-depth', type=int, default=2,
+                        help='Maximum number of link hops from the base URLs')
+    parser.add_argument('--max-pages', type=int, default=500,
+                        help='Maximum number of pages to fetch')
+    parser.add_argument('--allow', action='append', default=[],
+                        help='Regex a followed URL must match (repeatable)')
+    parser.add_argument('--deny', action='append', default=[],
+                        help='Regex excluding a URL from the crawl (repeatable)')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main execution function"""
+    configure_logging()
+    args = parse_args(argv)
     try:
-        extractor = OnetDataExtractor()
-        extractor.build_repository()
+        extractor = OnetDataExtractor(incremental=not args.full, archive=not args.no_archive,
+                                      parser=args.parser, checkpoint=not args.no_checkpoint,
+                                      resume=not args.restart, output_format=args.format)
+        if args.replay:
+            extractor.replay_repository(parse_workers=args.parse_workers)
+        elif args.crawl:
+            extractor.crawl_repository(CrawlConfig(
+                max_concurrency=args.concurrency,
+                per_host_concurrency=args.per_host,
+                per_host_delay=args.delay,
+                max_depth=args.max_depth,
+                max_pages=args.max_pages,
+                allow_patterns=args.allow,
+                deny_patterns=args.deny
+            ), parse_workers=args.parse_workers)
+        else:
+            extractor.build_repository(parse_workers=args.parse_workers)
         
+        if args.metrics_file:
+            extractor.write_metrics(args.metrics_file)
+
         # Example search functionality
         sample_search = extractor.search_repository("API")
         logging.info(f"Sample search results: {len(sample_search['matches'])} matches found")
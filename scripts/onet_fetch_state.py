@@ -0,0 +1,71 @@
+"""
+Per-URL HTTP validator state for incremental O*NET repository refreshes
+Persists ETag, Last-Modified and a content hash for every fetched page
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a page body used to detect unchanged content"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FetchStateStore:
+    """JSON-backed store of the validators seen for each URL"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self):
+        """Load previously persisted validators, if any"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable fetch state {self.path}: {str(e)}")
+            self.entries = {}
+
+    def save(self):
+        """Write the validators atomically next to the repository"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a URL"""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, url: str, headers: Dict[str, str], body_hash: str):
+        """Remember the validators returned with a full response"""
+        lowered = {k.lower(): v for k, v in headers.items()}
+        self.entries[url] = {
+            'etag': lowered.get('etag'),
+            'last_modified': lowered.get('last-modified'),
+            'content_hash': body_hash
+        }
+
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        entry = self.entries.get(url)
+        return bool(entry) and entry.get('content_hash') == body_hash
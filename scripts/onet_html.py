@@ -0,0 +1,390 @@
+"""
+HTML parser backends for O*NET documentation extraction
+Gives the extractor and reference helper one tree API over BeautifulSoup and native lxml
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:  # lxml is optional; the html.parser backend always works
+    lxml = None
+
+DEFAULT_PARSER = 'html.parser'
+
+# Tags whose text BeautifulSoup leaves out of get_text() on an enclosing element
+_NON_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Events produced by HtmlBackend.walk
+START, END, TEXT, OTHER = range(4)
+
+
+class HtmlBackend(ABC):
+    """Minimal tree interface used by the extraction code
+
+    Every accessor mirrors the BeautifulSoup semantics the extraction code was
+    written against so all backends produce the same output.
+    """
+    name = ''
+
+    @abstractmethod
+    def parse(self, html: str) -> Any:
+        ...
+
+    @abstractmethod
+    def tag_name(self, node: Any) -> Optional[str]:
+        """Tag name of an element, None for text and comment nodes"""
+
+    @abstractmethod
+    def attr(self, element: Any, name: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def classes(self, element: Any) -> List[str]:
+        ...
+
+    @abstractmethod
+    def walk(self, root: Any) -> Iterator[Tuple[int, Any]]:
+        """Single pre-order traversal yielding (event, value) pairs
+
+        START/END carry the element, TEXT carries a string that counts towards
+        the element's text, and OTHER carries the string form of comments and
+        other strings that do not (script bodies, processing instructions).
+        """
+
+    @abstractmethod
+    def string(self, element: Any) -> Optional[str]:
+        """Single descendant string of an element, like ``Tag.string``"""
+
+    @abstractmethod
+    def markup(self, node: Any) -> str:
+        """String form of a child node, like ``str(node)``"""
+
+
+class SoupBackend(HtmlBackend):
+    """BeautifulSoup with a configurable tree builder ('html.parser' or 'lxml')"""
+
+    def __init__(self, builder: str = DEFAULT_PARSER):
+        if builder == 'lxml' and lxml is None:
+            raise ImportError("The 'bs4-lxml' parser backend requires the lxml package")
+        self.builder = builder
+        self.name = builder if builder == DEFAULT_PARSER else f"bs4-{builder}"
+
+    def parse(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, self.builder)
+
+    def tag_name(self, node):
+        return node.name if isinstance(node, Tag) else None
+
+    def attr(self, element, name):
+        return element.get(name)
+
+    def classes(self, element):
+        return element.get('class') or []
+
+    def walk(self, root):
+        stack = [iter(root.contents)]
+        parents = []
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                if parents:
+                    yield END, parents.pop()
+            elif isinstance(node, Tag):
+                yield START, node
+                parents.append(node)
+                stack.append(iter(node.contents))
+            elif type(node) in (NavigableString, CData):
+                yield TEXT, str(node)
+            else:
+                yield OTHER, str(node)
+
+    def string(self, element):
+        return element.string
+
+    def markup(self, node):
+        return str(node)
+
+
+class LxmlBackend(HtmlBackend):
+    """Native lxml.html tree; skips BeautifulSoup's object model entirely"""
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("The 'lxml' parser backend requires the lxml package")
+
+    def parse(self, html: str):
+        try:
+            return lxml.html.document_fromstring(html)
+        except (lxml.etree.ParserError, ValueError):
+            # Empty documents and strings with encoding declarations
+            return lxml.html.document_fromstring(
+                html.encode('utf-8') if html.strip() else b'<html></html>'
+            )
+
+    def tag_name(self, node):
+        if isinstance(node, str) or not isinstance(node.tag, str):
+            return None
+        return node.tag
+
+    def attr(self, element, name):
+        return element.get(name)
+
+    def classes(self, element):
+        return (element.get('class') or '').split()
+
+    def walk(self, root):
+        suppressed = 0
+        # iterwalk generates the start/end events in C; only text is stitched in here
+        for event, element in lxml.etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+            if event == 'start':
+                if element.tag in _NON_TEXT_TAGS:
+                    suppressed += 1
+                yield START, element
+                if element.text:
+                    yield (OTHER if suppressed else TEXT), element.text
+                continue
+            if event == 'end':
+                yield END, element
+                if element.tag in _NON_TEXT_TAGS:
+                    suppressed -= 1
+                if element is root:
+                    continue
+            else:
+                # Comments and processing instructions
+                yield OTHER, element.text or ''
+            if element.tail:
+                yield (OTHER if suppressed else TEXT), element.tail
+
+    def string(self, element):
+        while element is not None:
+            children = list(element)
+            if not children:
+                return element.text
+            if element.text or len(children) > 1 or children[0].tail:
+                return None
+            element = children[0]
+            if not isinstance(element.tag, str):
+                return element.text
+        return None
+
+    def markup(self, node):
+        if isinstance(node, str):
+            return node
+        if not isinstance(node.tag, str):
+            # Comments and processing instructions stringify to their text
+            return node.text or ''
+        return lxml.html.tostring(node, encoding='unicode', with_tail=False)
+
+
+class TextCapture:
+    """Strings collected beneath one element during a walk"""
+    __slots__ = ('parts',)
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+    @property
+    def stripped(self) -> str:
+        return ''.join(part.strip() for part in self.parts if part.strip())
+
+
+class LinkCapture(TextCapture):
+    __slots__ = ('href',)
+
+    def __init__(self, href: Optional[str]):
+        super().__init__()
+        self.href = href
+
+
+class TableCapture:
+    """Header cells and rows of a table; nested tables also feed their ancestors"""
+    __slots__ = ('headers', 'rows')
+
+    def __init__(self):
+        self.headers: List[TextCapture] = []
+        self.rows: List[List[TextCapture]] = []
+
+
+class ScopeElements:
+    """Elements found beneath one scope root, in document order"""
+    __slots__ = ('headers', 'paragraphs', 'tables', 'links')
+
+    def __init__(self):
+        self.headers: List[TextCapture] = []
+        self.paragraphs: List[TextCapture] = []
+        self.tables: List[TableCapture] = []
+        self.links: List[LinkCapture] = []
+
+
+class PageElements:
+    """Everything the extractor and the reference helper read from a page
+
+    ``scopes`` holds the whole document plus the first ``<main>`` and first
+    ``div.content`` when present. ``content_children`` lists the direct
+    children of the first ``div#content`` as ('heading', TextCapture),
+    ('node', element) or ('text', str) entries.
+    """
+
+    def __init__(self):
+        self.title_node: Any = None
+        self.meta: List[Tuple[str, Optional[str]]] = []
+        self.scopes: Dict[str, ScopeElements] = {'document': ScopeElements()}
+        self.content_children: Optional[List[Tuple[str, Any]]] = None
+
+
+_HEADING_TAGS = frozenset(['h1', 'h2', 'h3'])
+_COLLECTED_TAGS = _HEADING_TAGS | {'p', 'a', 'table', 'tr', 'th', 'td', 'meta', 'title', 'main', 'div'}
+_PLAIN_FRAME = (None, None, None, None, False)
+
+
+def walk_page(backend: HtmlBackend, document: Any) -> PageElements:
+    """Collect headings, paragraphs, tables, links, meta tags and sections in one traversal"""
+    page = PageElements()
+    active = [page.scopes['document']]
+    captures: List[TextCapture] = []
+    tables: List[TableCapture] = []
+    rows: List[List[TextCapture]] = []
+    # Per open element: (capture, table, row, scope, is_content_root)
+    frames: List[Tuple[Any, Any, Any, Any, bool]] = []
+    content_depth: Optional[int] = None  # index in frames of the div#content element
+
+    for event, value in backend.walk(document):
+        if event == TEXT:
+            for capture in captures:
+                capture.parts.append(value)
+            if len(frames) - 1 == content_depth:
+                page.content_children.append(('text', value))
+            continue
+        if event == OTHER:
+            if len(frames) - 1 == content_depth:
+                page.content_children.append(('text', value))
+            continue
+        if event == END:
+            capture, table, row, scope, is_content_root = frames.pop()
+            if capture is not None:
+                captures.pop()
+            if table is not None:
+                tables.pop()
+            if row is not None:
+                rows.pop()
+            if scope is not None:
+                active.remove(scope)
+            if is_content_root:
+                content_depth = None
+            continue
+
+        tag = backend.tag_name(value)
+        direct_child = len(frames) - 1 == content_depth
+        if tag not in _COLLECTED_TAGS and not direct_child:
+            frames.append(_PLAIN_FRAME)
+            continue
+
+        capture = table = row = scope = None
+        is_content_root = False
+
+        if tag in _HEADING_TAGS:
+            capture = TextCapture()
+            for s in active:
+                s.headers.append(capture)
+        elif tag == 'p':
+            capture = TextCapture()
+            for s in active:
+                s.paragraphs.append(capture)
+        elif tag == 'a':
+            capture = LinkCapture(backend.attr(value, 'href'))
+            for s in active:
+                s.links.append(capture)
+        elif tag == 'table':
+            table = TableCapture()
+            for s in active:
+                s.tables.append(table)
+        elif tag == 'tr':
+            row = []
+            for t in tables:
+                t.rows.append(row)
+        elif tag == 'th':
+            capture = TextCapture()
+            for t in tables:
+                t.headers.append(capture)
+        elif tag == 'td':
+            capture = TextCapture()
+            for r in rows:
+                r.append(capture)
+        elif tag == 'meta':
+            name = backend.attr(value, 'name')
+            if name:
+                page.meta.append((name, backend.attr(value, 'content')))
+        elif tag == 'title':
+            if page.title_node is None:
+                page.title_node = value
+        elif tag == 'main':
+            if 'main' not in page.scopes:
+                scope = page.scopes['main'] = ScopeElements()
+        elif tag == 'div':
+            if 'content' not in page.scopes and 'content' in backend.classes(value):
+                scope = page.scopes['content'] = ScopeElements()
+            if page.content_children is None and backend.attr(value, 'id') == 'content':
+                page.content_children = []
+                is_content_root = True
+
+        if direct_child:
+            if tag in _HEADING_TAGS:
+                page.content_children.append(('heading', capture))
+            else:
+                page.content_children.append(('node', value))
+
+        if capture is not None:
+            captures.append(capture)
+        if table is not None:
+            tables.append(table)
+        if row is not None:
+            rows.append(row)
+        if scope is not None:
+            active.append(scope)
+        frames.append((capture, table, row, scope, is_content_root))
+        if is_content_root:
+            content_depth = len(frames) - 1
+
+    return page
+
+
+_BACKEND_FACTORIES = {
+    'html.parser': lambda: SoupBackend('html.parser'),
+    'bs4-lxml': lambda: SoupBackend('lxml'),
+    'lxml': LxmlBackend,
+}
+_backends: Dict[str, HtmlBackend] = {}
+
+
+def get_backend(name: str = DEFAULT_PARSER) -> HtmlBackend:
+    """Return a shared backend instance by name"""
+    if name not in _backends:
+        if name not in _BACKEND_FACTORIES:
+            raise ValueError(
+                f"Unknown parser backend '{name}', expected one of {sorted(_BACKEND_FACTORIES)}"
+            )
+        _backends[name] = _BACKEND_FACTORIES[name]()
+    return _backends[name]
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose dependencies are installed"""
+    names = []
+    for name in _BACKEND_FACTORIES:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
@@ -0,0 +1,360 @@
+"""
+Memory-mapped knowledge base and search index for the O*NET reference helper
+Offset tables over string blobs and flat posting arrays that open in milliseconds and are shared through the page cache
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .onet_codec import Codec
+from .onet_search import SearchIndex, TrigramIndex
+from .onet_snapshot import SnapshotError
+
+MAPPED_MAGIC = b'ONETKBMM'
+MAPPED_VERSION = 2
+# magic, format version, cache generation, created at, total document length, then the offset of every region
+_REGIONS = ('source_names', 'sources', 'documents', 'lengths', 'terms', 'term_postings', 'postings',
+            'term_sizes', 'trigrams', 'trigram_terms', 'trigram_ids')
+_HEADER = struct.Struct(f'<8sHqdQ{len(_REGIONS)}Q')
+_ALIGN = 8
+
+# Blobs are decoded on every first access, so they are stored uncompressed
+_BLOB_CODEC = Codec(compression='none')
+
+
+def _native(typecode: str, values) -> bytes:
+    """Little-endian bytes of an integer array"""
+    data = array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _string_table(items: List[bytes]) -> bytes:
+    """Count, ``count + 1`` offsets into the blob, then the blob itself"""
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    return _native('Q', [len(items)]) + _native('Q', offsets) + b''.join(items)
+
+
+class StringTable(Sequence):
+    """Read-only view of a string table; each item is copied out of the mapping on access"""
+
+    def __init__(self, view: memoryview, offset: int):
+        count = view[offset:offset + 8].cast('Q')[0]
+        self._offsets = view[offset + 8:offset + 8 + (count + 1) * 8].cast('Q')
+        self._view = view
+        self._start = offset + 8 + (count + 1) * 8
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self._view[self._start + self._offsets[i]:self._start + self._offsets[i + 1]])
+
+    def release(self):
+        self._offsets.release()
+
+
+class _Terms(Sequence):
+    """Sorted term strings, for bisecting"""
+
+    def __init__(self, table: StringTable):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, i: int) -> str:
+        return self.table[i].decode('utf-8')
+
+
+class _SortedKeys:
+    """Position lookup over a sorted string table by binary search"""
+
+    def __init__(self, table: StringTable):
+        self._terms = _Terms(table)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return self._position(term) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._terms)
+
+    def _position(self, term: str) -> Optional[int]:
+        i = bisect.bisect_left(self._terms, term)
+        return i if i < len(self._terms) and self._terms[i] == term else None
+
+
+class MappedPostings(_SortedKeys):
+    """``term -> [(document id, term frequency)]`` read straight from the mapping"""
+
+    def __init__(self, terms: StringTable, term_postings: memoryview, postings: memoryview):
+        super().__init__(terms)
+        self._term_postings = term_postings
+        self._postings = postings
+
+    def __getitem__(self, term: str) -> List[Tuple[int, int]]:
+        postings = self.get(term)
+        if postings is None:
+            raise KeyError(term)
+        return postings
+
+    def get(self, term: str, default: Any = None) -> Any:
+        i = self._position(term)
+        if i is None:
+            return default
+        pairs = self._postings[self._term_postings[i] * 2:self._term_postings[i + 1] * 2]
+        return list(zip(pairs[0::2], pairs[1::2]))
+
+
+class MappedGrams(_SortedKeys):
+    """``trigram -> term ids`` as slices of the mapping"""
+
+    def __init__(self, grams: StringTable, gram_terms: memoryview, term_ids: memoryview):
+        super().__init__(grams)
+        self._gram_terms = gram_terms
+        self._term_ids = term_ids
+
+    def get(self, gram: str, default: Any = None) -> Any:
+        i = self._position(gram)
+        if i is None:
+            return default
+        return self._term_ids[self._gram_terms[i]:self._gram_terms[i + 1]]
+
+
+class _Documents(Sequence):
+    """Search results and title terms per document, decoded once per process"""
+
+    def __init__(self, table: StringTable):
+        self.table = table
+        self._decoded: Dict[int, Tuple[Dict[str, Any], frozenset]] = {}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def entry(self, i: int) -> Tuple[Dict[str, Any], frozenset]:
+        if i not in self._decoded:
+            result, title_terms = _BLOB_CODEC.decode(self.table[i])
+            self._decoded[i] = (result, frozenset(title_terms))
+        return self._decoded[i]
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.entry(i)[0]
+
+
+class _TitleTerms(Sequence):
+    def __init__(self, documents: _Documents):
+        self.documents = documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __getitem__(self, i: int) -> frozenset:
+        return self.documents.entry(i)[1]
+
+
+class MappedSearchIndex(SearchIndex):
+    """Read-only SearchIndex whose documents, lengths and postings live in a mapped file"""
+
+    def __init__(self, documents: StringTable, lengths: memoryview, postings: MappedPostings, total_length: int,
+                 trigrams: TrigramIndex):
+        self.documents = _Documents(documents)
+        self.title_terms = _TitleTerms(self.documents)
+        self.lengths = lengths
+        self.postings = postings
+        self.total_length = total_length
+        self.trigrams = trigrams
+
+    def add(self, result: Dict[str, Any], title: str, body: str):
+        raise TypeError("A mapped search index is read-only; build a SearchIndex instead")
+
+
+class MappedKnowledgeBase(MutableMapping):
+    """Knowledge base sources decoded from the mapping on first access
+
+    Assignments and deletions only change this process's view; the file
+    is rewritten by ``write_mapped_index``.
+    """
+
+    def __init__(self, names: List[str], sources: StringTable):
+        self._names = names
+        self._positions: Dict[str, Optional[int]] = {name: i for i, name in enumerate(names)}
+        self._sources = sources
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            position = self._positions[name]
+            self._values[name] = _BLOB_CODEC.decode(self._sources[position])
+        return self._values[name]
+
+    def __setitem__(self, name: str, value: Any):
+        if name not in self._positions:
+            self._positions[name] = None
+            self._names.append(name)
+        self._values[name] = value
+
+    def __delitem__(self, name: str):
+        del self._positions[name]
+        self._names.remove(name)
+        self._values.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class MappedIndex:
+    """An open mapped knowledge base file"""
+
+    def __init__(self, path: str, fileobj, mapping: mmap.mmap, generation: int, created_at: float,
+                 knowledge_base: MappedKnowledgeBase, index: MappedSearchIndex, views: List[Any]):
+        self.path = path
+        self.generation = generation
+        self.created_at = created_at
+        self.knowledge_base = knowledge_base
+        self.index = index
+        self._file = fileobj
+        self._mapping = mapping
+        self._views = views
+
+    def close(self):
+        """Unmap the file; fails with BufferError while results still reference it"""
+        for view in reversed(self._views):
+            view.release()
+        self._mapping.close()
+        self._file.close()
+
+
+def write_mapped_index(path: str, knowledge_base: Dict[str, Any], index: SearchIndex, generation: int = 0) -> int:
+    """Atomically write the knowledge base and its search index, returning the file size"""
+    names = list(knowledge_base)
+    # Trigram entries refer to terms by their position in the sorted vocabulary
+    trigram_index = index.trigram_index
+    terms = list(trigram_index.terms)
+    grams = sorted(trigram_index.grams)
+    gram_terms = [0]
+    term_ids: List[int] = []
+    for gram in grams:
+        term_ids += trigram_index.grams[gram]
+        gram_terms.append(len(term_ids))
+    term_postings = [0]
+    postings: List[int] = []
+    for term in terms:
+        for doc_id, frequency in index.postings[term]:
+            postings += (doc_id, frequency)
+        term_postings.append(len(postings) // 2)
+
+    regions = {
+        'source_names': _string_table([name.encode('utf-8') for name in names]),
+        'sources': _string_table([_BLOB_CODEC.encode(knowledge_base[name]) for name in names]),
+        'documents': _string_table([
+            _BLOB_CODEC.encode([result, sorted(title_terms)])
+            for result, title_terms in zip(index.documents, index.title_terms)
+        ]),
+        'lengths': _native('I', index.lengths),
+        'terms': _string_table([term.encode('utf-8') for term in terms]),
+        'term_postings': _native('Q', term_postings),
+        'postings': _native('I', postings),
+        'term_sizes': _native('I', trigram_index.sizes),
+        'trigrams': _string_table([gram.encode('utf-8') for gram in grams]),
+        'trigram_terms': _native('Q', gram_terms),
+        'trigram_ids': _native('I', term_ids)
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    offsets = []
+    with open(tmp_path, 'wb') as f:
+        f.write(bytes(_HEADER.size))
+        for name in _REGIONS:
+            f.write(bytes(-f.tell() % _ALIGN))
+            offsets.append(f.tell())
+            f.write(regions[name])
+        size = f.tell()
+        f.seek(0)
+        f.write(_HEADER.pack(MAPPED_MAGIC, MAPPED_VERSION, generation, time.time(), index.total_length, *offsets))
+    # Readers that already mapped the previous file keep its inode until they reopen
+    os.replace(tmp_path, path)
+    return size
+
+
+def open_mapped_index(path: str, max_age: Optional[float] = None) -> MappedIndex:
+    """Map a file written by ``write_mapped_index``, raising SnapshotError if it cannot be used"""
+    if sys.byteorder != 'little':
+        raise SnapshotError("mapped indexes are little-endian")
+    try:
+        f = open(path, 'rb')
+    except OSError as e:
+        raise SnapshotError(f"cannot read {path}: {e.strerror}")
+    try:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise SnapshotError(f"{path} is truncated")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+
+    magic, version, generation, created_at, total_length, *offsets = _HEADER.unpack_from(mapping)
+    try:
+        if magic != MAPPED_MAGIC:
+            raise SnapshotError(f"{path} is not a mapped index")
+        if version != MAPPED_VERSION:
+            raise SnapshotError(f"{path} has format version {version}, expected {MAPPED_VERSION}")
+        if max_age is not None and time.time() - created_at > max_age:
+            raise SnapshotError(f"{path} is older than {max_age:.0f}s")
+        if any(offset > size for offset in offsets):
+            raise SnapshotError(f"{path} is truncated")
+    except SnapshotError:
+        mapping.close()
+        f.close()
+        raise
+
+    view = memoryview(mapping)
+    region = dict(zip(_REGIONS, offsets))
+    try:
+        source_names = StringTable(view, region['source_names'])
+        sources = StringTable(view, region['sources'])
+        documents = StringTable(view, region['documents'])
+        terms = StringTable(view, region['terms'])
+        lengths = view[region['lengths']:region['lengths'] + len(documents) * 4].cast('I')
+        term_postings = view[region['term_postings']:region['term_postings'] + (len(terms) + 1) * 8].cast('Q')
+        postings = view[region['postings']:region['postings'] + term_postings[-1] * 8].cast('I')
+        term_sizes = view[region['term_sizes']:region['term_sizes'] + len(terms) * 4].cast('I')
+        grams = StringTable(view, region['trigrams'])
+        gram_terms = view[region['trigram_terms']:region['trigram_terms'] + (len(grams) + 1) * 8].cast('Q')
+        term_ids = view[region['trigram_ids']:region['trigram_ids'] + gram_terms[-1] * 4].cast('I')
+        if len(term_ids) != gram_terms[-1] or len(postings) != term_postings[-1] * 2:
+            raise ValueError("regions are shorter than their offset tables")
+        names = [name.decode('utf-8') for name in source_names]
+    except (IndexError, TypeError, ValueError) as e:
+        view.release()
+        mapping.close()
+        f.close()
+        raise SnapshotError(f"{path} is corrupt: {str(e)}")
+
+    knowledge_base = MappedKnowledgeBase(names, sources)
+    index = MappedSearchIndex(documents, lengths, MappedPostings(terms, term_postings, postings), total_length,
+                              TrigramIndex(_Terms(terms), MappedGrams(grams, gram_terms, term_ids), term_sizes))
+    views = [view, source_names, sources, documents, terms, lengths, term_postings, postings,
+             term_sizes, grams, gram_terms, term_ids]
+    return MappedIndex(path, f, mapping, generation, created_at, knowledge_base, index, views)
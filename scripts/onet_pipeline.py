@@ -0,0 +1,191 @@
+"""
+Two-stage extraction pipeline for O*NET documentation pages
+I/O-bound fetch threads feed CPU-bound parsers in a process pool through a bounded queue
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for one pipeline stage"""
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, seconds: float, error: bool = False):
+        with self._lock:
+            now = time.perf_counter()
+            if self.started_at is None:
+                self.started_at = now - seconds
+            self.finished_at = now
+            self.items += 1
+            self.busy_seconds += seconds
+            if error:
+                self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall = (self.finished_at - self.started_at) if self.started_at is not None else 0.0
+        return {
+            'items': self.items,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 4),
+            'wall_seconds': round(wall, 4),
+            'items_per_second': round(self.items / wall, 2) if wall > 0 else None,
+            # Average number of workers kept busy over the stage's lifetime
+            'concurrency': round(self.busy_seconds / wall, 2) if wall > 0 else None
+        }
+
+
+@dataclass
+class FetchOutcome:
+    """Result of the fetch stage
+
+    ``html`` is handed to the parse stage; when it is None the item skips
+    parsing and ``result`` (e.g. a reused extraction) is delivered as-is.
+    ``parse_seconds`` is filled in once the page has been parsed.
+    """
+    url: str
+    html: Optional[str] = None
+    result: Any = None
+    context: Any = None
+    parse_seconds: Optional[float] = None
+
+
+def _noop() -> None:
+    return None
+
+
+def start_workers(executor: Executor):
+    """Start pool workers up front so they fork before any fetch threads exist"""
+    executor.submit(_noop).result()
+
+
+class ExtractionPipeline:
+    """Runs ``fetch`` on a thread pool and ``parse`` on a process pool
+
+    ``parse`` must be a picklable module-level callable taking ``(url, html)``
+    and returning ``(parsed, seconds)``. Parsed results are delivered to the
+    ``on_result`` callback on the calling thread in completion order.
+    """
+
+    def __init__(self, fetch: Callable[[str], Optional[FetchOutcome]],
+                 parse: Callable[[str, str], Tuple[Any, float]],
+                 fetch_workers: int = 8, parse_workers: Optional[int] = None,
+                 queue_size: int = 32,
+                 executor_factory: Optional[Callable[[int], Executor]] = None):
+        self.fetch = fetch
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers or os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self.executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+        self.metrics = {
+            'fetch': StageMetrics('fetch'),
+            'parse': StageMetrics('parse')
+        }
+
+    def run(self, urls: Iterable[str],
+            on_result: Callable[[FetchOutcome, Any], None]) -> Dict[str, Dict[str, Any]]:
+        """Process every URL and return per-stage metrics"""
+        url_queue: queue.Queue = queue.Queue()
+        for url in urls:
+            url_queue.put(url)
+        parse_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        with self.executor_factory(self.parse_workers) as executor:
+            start_workers(executor)
+
+            fetchers = [
+                threading.Thread(target=self._fetch_worker, args=(url_queue, parse_queue), daemon=True)
+                for _ in range(self.fetch_workers)
+            ]
+            for thread in fetchers:
+                thread.start()
+
+            self._dispatch(executor, parse_queue, on_result)
+
+            for thread in fetchers:
+                thread.join()
+
+        return self.summary()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.as_dict() for name, stage in self.metrics.items()}
+
+    def _fetch_worker(self, url_queue: queue.Queue, parse_queue: queue.Queue):
+        try:
+            while True:
+                try:
+                    url = url_queue.get_nowait()
+                except queue.Empty:
+                    return
+                start = time.perf_counter()
+                try:
+                    outcome = self.fetch(url)
+                except Exception as e:
+                    logging.error(f"Fetch stage failed for {url}: {str(e)}")
+                    outcome = None
+                self.metrics['fetch'].record(time.perf_counter() - start, error=outcome is None)
+                if outcome is not None:
+                    # Blocks when parsers fall behind, bounding buffered HTML
+                    parse_queue.put(outcome)
+        finally:
+            parse_queue.put(_DONE)
+
+    def _dispatch(self, executor: Executor, parse_queue: queue.Queue,
+                  on_result: Callable[[FetchOutcome, Any], None]):
+        """Feed fetched pages to the pool and deliver results as they complete"""
+        pending: Dict[Future, FetchOutcome] = {}
+        finished_fetchers = 0
+        max_in_flight = self.parse_workers * 2
+
+        while finished_fetchers < self.fetch_workers or pending:
+            if finished_fetchers == self.fetch_workers or len(pending) >= max_in_flight:
+                # Nothing can be submitted until a parse finishes, so block rather than poll
+                done, _ = wait(set(pending), return_when=FIRST_COMPLETED)
+                self._harvest(done, pending, on_result)
+                continue
+            if pending:
+                done, _ = wait(set(pending), timeout=0 if not parse_queue.empty() else 0.05,
+                               return_when=FIRST_COMPLETED)
+                self._harvest(done, pending, on_result)
+
+            try:
+                outcome = parse_queue.get(timeout=0.05 if not pending else 0)
+            except queue.Empty:
+                continue
+            if outcome is _DONE:
+                finished_fetchers += 1
+            elif outcome.html is None:
+                on_result(outcome, outcome.result)
+            else:
+                pending[executor.submit(self.parse, outcome.url, outcome.html)] = outcome
+
+    def _harvest(self, done: Set[Future], pending: Dict[Future, FetchOutcome],
+                 on_result: Callable[[FetchOutcome, Any], None]):
+        for future in done:
+            outcome = pending.pop(future)
+            try:
+                parsed, seconds = future.result()
+            except Exception as e:
+                logging.error(f"Parse stage failed for {outcome.url}: {str(e)}")
+                self.metrics['parse'].record(0.0, error=True)
+                on_result(outcome, None)
+                continue
+            self.metrics['parse'].record(seconds)
+            outcome.parse_seconds = seconds
+            on_result(outcome, parsed)
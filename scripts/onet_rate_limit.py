@@ -0,0 +1,199 @@
+"""
+Token-bucket rate limiting for the O*NET web services budget
+Bucket state is shared across worker processes through a locked file or Redis
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows; FileBucketState is unavailable there
+    fcntl = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; the file backend always works on POSIX
+    aioredis = None
+
+
+def refill_and_take(tokens: float, updated: float, now: float, rate: float, capacity: float,
+                    requested: float) -> Tuple[float, float]:
+    """Apply the refill since ``updated`` and try to take ``requested`` tokens
+
+    Returns the new token count and the seconds to wait before retrying (0 when taken).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= requested:
+        return tokens - requested, 0.0
+    return tokens, (requested - tokens) / rate
+
+
+class LocalBucketState:
+    """Bucket state held in this process only"""
+
+    def __init__(self):
+        self._state: Optional[Tuple[float, float]] = None
+        self._lock = threading.Lock()
+
+    async def take(self, requested: float, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._state or (capacity, now)
+            tokens, wait = refill_and_take(tokens, updated, now, rate, capacity, requested)
+            self._state = (tokens, now)
+        return wait
+
+
+class FileBucketState:
+    """Bucket state in a small file guarded by flock, shared by every process on the host"""
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileBucketState needs fcntl, which is not available on this platform")
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def take(self, requested: float, rate: float, capacity: float) -> float:
+        # The critical section is a few microseconds, so blocking the loop on the lock is acceptable
+        with open(self.path, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                now = time.time()
+                try:
+                    state = json.loads(f.read() or 'null')
+                    tokens, updated = float(state['tokens']), float(state['updated'])
+                except (ValueError, TypeError, KeyError):
+                    tokens, updated = capacity, now
+                tokens, wait = refill_and_take(tokens, updated, now, rate, capacity, requested)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({'tokens': tokens, 'updated': now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+
+# Refill and take atomically on the server, using the server clock so workers on
+# different hosts agree on elapsed time. Floats are returned as strings because
+# Lua numbers are truncated to integers in replies.
+_REDIS_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RedisBucketState:
+    """Bucket state in a Redis hash, shared by every process that can reach the server"""
+
+    def __init__(self, client: Any, key: str = 'onet:rate_limit'):
+        self.client = client
+        self.key = key
+        self._script = client.register_script(_REDIS_TAKE_SCRIPT)
+
+    async def take(self, requested: float, rate: float, capacity: float) -> float:
+        wait = await self._script(keys=[self.key], args=[rate, capacity, requested])
+        return float(wait)
+
+
+async def shared_bucket_state(redis_url: Optional[str] = None, path: Optional[str] = None,
+                              key: str = 'onet:rate_limit') -> Any:
+    """Redis state when the server answers, else a locked file on this host, else process-local"""
+    if redis_url and aioredis is not None:
+        client = aioredis.from_url(redis_url)
+        try:
+            await client.ping()
+            return RedisBucketState(client, key)
+        except Exception as e:
+            logging.warning(f"Redis rate-limit backend unavailable ({str(e)}), using local state")
+            await client.aclose()
+    if path and fcntl is not None:
+        return FileBucketState(path)
+    return LocalBucketState()
+
+
+class TokenBucket:
+    """Async token bucket with burst control and priority-ordered waiters
+
+    ``rate`` tokens per second refill up to ``capacity``, which bounds bursts.
+    Waiters are served lowest ``priority`` first, then in arrival order; only
+    the head waiter polls the (possibly shared) state, so a long queue does
+    not hammer the backend. Priority applies within a process; processes
+    share the budget through ``state``.
+    """
+
+    def __init__(self, rate: float, capacity: float, state: Any = None):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.state = state or LocalBucketState()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def acquire(self, tokens: float = 1, priority: int = 0) -> None:
+        """Wait until ``tokens`` are available; lower ``priority`` values are served first"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and self._dispatcher.get_loop() is not loop:
+            # A process-wide bucket outlives event loops; waiters of a finished loop can never be served
+            self._waiters = [waiter for waiter in self._waiters if waiter[3].get_loop() is loop]
+            heapq.heapify(self._waiters)
+            self._dispatcher = None
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), tokens, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    async def _dispatch(self):
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            try:
+                wait = await self.state.take(tokens, self.rate, self.capacity)
+            except Exception as e:
+                heapq.heappop(self._waiters)
+                future.set_exception(e)
+                continue
+            if wait <= 0:
+                heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                continue
+            await asyncio.sleep(wait)
@@ -0,0 +1,231 @@
+"""
+Inverted index with BM25 ranking over the O*NET reference knowledge base
+Sections and table rows become documents; queries only touch the posting lists of their terms,
+and a trigram index over the vocabulary matches misspelled or truncated terms
+"""
+
+import heapq
+import html
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_TAG = re.compile(r'<[^>]+>')
+_TOKEN = re.compile(r'[a-z0-9]+(?:[._-][a-z0-9]+)*')
+
+# BM25 parameters, the usual defaults
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Section titles count this many times towards a document's term frequencies
+TITLE_BOOST = 3
+# Fuzzy lookups keep vocabulary terms at least this similar (trigram overlap), at most this many per query term
+FUZZY_THRESHOLD = 0.3
+FUZZY_EXPANSIONS = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of text or HTML markup; codes like 15-1252.00 stay one token"""
+    if '<' in text:
+        text = _TAG.sub(' ', text)
+    return _TOKEN.findall(html.unescape(text).lower())
+
+
+def trigrams(term: str) -> frozenset:
+    """Character trigrams of a term, padded so prefixes and suffixes weigh in"""
+    padded = f"  {term} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def knowledge_base_documents(knowledge_base: Dict[str, Any]) -> Iterable[Tuple[Dict[str, Any], str, str]]:
+    """(result, title, body) for every section and table row, as search results report them"""
+    for source, data in knowledge_base.items():
+        for section_title, content in data.get('sections', {}).items():
+            yield {'source': source, 'section': section_title, 'content': content}, section_title, content
+        for table in data.get('tables', []):
+            for row in table['rows']:
+                yield ({'source': source, 'type': 'table', 'content': row, 'headers': table['headers']},
+                       '', ' '.join(row))
+
+
+class TrigramIndex:
+    """Trigram index over a vocabulary for similarity-ranked fuzzy term lookup
+
+    ``grams`` maps a trigram to the ids of the ``terms`` containing it and
+    ``sizes`` holds each term's trigram count, so a lookup only counts
+    overlaps along the posting lists of the query's own trigrams.
+    """
+
+    def __init__(self, terms: Sequence[str], grams: Mapping[str, Sequence[int]], sizes: Sequence[int]):
+        self.terms = terms
+        self.grams = grams
+        self.sizes = sizes
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> 'TrigramIndex':
+        terms = sorted(terms)
+        grams: Dict[str, List[int]] = {}
+        sizes = []
+        for term_id, term in enumerate(terms):
+            term_grams = trigrams(term)
+            for gram in term_grams:
+                grams.setdefault(gram, []).append(term_id)
+            sizes.append(len(term_grams))
+        return cls(terms, grams, sizes)
+
+    def lookup(self, term: str, threshold: float = FUZZY_THRESHOLD,
+               k: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """Vocabulary terms at least ``threshold`` similar to ``term``, most similar first
+
+        Similarity is trigram Jaccard, or containment of the query's trigrams
+        when the query is the shorter of the two, so prefixes like ``auth``
+        still find ``authentication``.
+        """
+        query_grams = trigrams(term)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            ids = self.grams.get(gram)
+            if ids:
+                shared.update(ids)
+        size = len(query_grams)
+        matches = []
+        for term_id, common in shared.items():
+            term_size = self.sizes[term_id]
+            if size < term_size:
+                # Containment: a truncated term is not penalised for the tail it lacks
+                similarity = common / size
+            else:
+                similarity = common / (size + term_size - common)
+            if similarity >= threshold:
+                matches.append((similarity, term_size, term_id))
+        # Equally similar terms rank shortest first, i.e. closest to the query
+        if k is None:
+            ranked = sorted(matches, key=lambda match: (-match[0], match[1], match[2]))
+        else:
+            ranked = heapq.nsmallest(k, matches, key=lambda match: (-match[0], match[1], match[2]))
+        return [(self.terms[term_id], round(similarity, 4)) for similarity, _, term_id in ranked]
+
+
+class SearchIndex:
+    """BM25-ranked inverted index
+
+    ``postings`` maps a term to ``(document id, term frequency)`` pairs, so
+    a query costs time proportional to the postings of its terms rather
+    than to the size of the knowledge base.
+    """
+
+    def __init__(self):
+        self.documents: List[Dict[str, Any]] = []
+        self.title_terms: List[frozenset] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.total_length = 0
+        self.trigrams: Optional[TrigramIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, result: Dict[str, Any], title: str, body: str):
+        doc_id = len(self.documents)
+        title_tokens = tokenize(title)
+        counts = Counter(tokenize(body))
+        for token in title_tokens:
+            counts[token] += TITLE_BOOST
+        for term, frequency in counts.items():
+            self.postings.setdefault(term, []).append((doc_id, frequency))
+        self.documents.append(result)
+        self.title_terms.append(frozenset(title_tokens))
+        self.lengths.append(sum(counts.values()))
+        self.total_length += self.lengths[-1]
+        self.trigrams = None
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / len(self.lengths) if self.lengths else 0.0
+
+    @classmethod
+    def from_knowledge_base(cls, knowledge_base: Dict[str, Any]) -> 'SearchIndex':
+        index = cls()
+        for result, title, body in knowledge_base_documents(knowledge_base):
+            index.add(result, title, body)
+        index.trigrams = TrigramIndex.from_terms(index.postings)
+        return index
+
+    @property
+    def trigram_index(self) -> TrigramIndex:
+        """Trigram index over the vocabulary, rebuilt after documents are added"""
+        if self.trigrams is None:
+            self.trigrams = TrigramIndex.from_terms(self.postings)
+        return self.trigrams
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency, kept positive for very common terms"""
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - df + 0.5) / (df + 0.5))
+
+    def scores(self, terms: Iterable[str], sections_only: bool = False) -> Dict[int, float]:
+        """BM25 score of every document containing at least one of ``terms``
+
+        Each distinct term's postings are read once; a term repeated in the
+        query weighs 1 + log(count), so a long message dominated by one
+        word does not drown out the rest.
+        """
+        return self.weighted_scores({term: 1 + math.log(count) for term, count in Counter(terms).items()},
+                                    sections_only)
+
+    def weighted_scores(self, weights: Dict[str, float], sections_only: bool = False) -> Dict[int, float]:
+        """BM25 scores with each term's contribution scaled by its weight"""
+        scores: Dict[int, float] = {}
+        average = self.average_length or 1.0
+        for term, term_weight in weights.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            weight = self.idf(term) * term_weight
+            for doc_id, frequency in postings:
+                if sections_only and 'section' not in self.documents[doc_id]:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, k: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Top ``k`` results (all matches if None), best first, each with its BM25 ``score``"""
+        return self.search_terms(tokenize(query), k)
+
+    def search_terms(self, terms: Iterable[str], k: Optional[int] = 10,
+                     sections_only: bool = False) -> List[Dict[str, Any]]:
+        """Rank documents for many terms in one pass, each document once with its combined score"""
+        terms = list(terms)
+        return self._ranked(self.scores(terms, sections_only), set(terms), k)
+
+    def fuzzy_search(self, query: str, k: Optional[int] = 10, threshold: float = FUZZY_THRESHOLD,
+                     expansions: int = FUZZY_EXPANSIONS) -> List[Dict[str, Any]]:
+        """Like ``search``, but a term missing from the vocabulary matches its most similar terms
+
+        Each expansion counts in proportion to its trigram similarity, so
+        queries whose terms are all known rank exactly as ``search`` does.
+        """
+        weights: Dict[str, float] = {}
+        for term, count in Counter(tokenize(query)).items():
+            if term in self.postings:
+                matches = [(term, 1.0)]
+            else:
+                matches = self.trigram_index.lookup(term, threshold, expansions)
+            for match, similarity in matches:
+                weights[match] = max(weights.get(match, 0.0), similarity * (1 + math.log(count)))
+        return self._ranked(self.weighted_scores(weights), set(weights), k)
+
+    def _ranked(self, scores: Dict[int, float], query_terms: set, k: Optional[int]) -> List[Dict[str, Any]]:
+        if k is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            dict(self.documents[doc_id], score=round(score, 4),
+                 relevance='high' if query_terms & self.title_terms[doc_id] else 'medium')
+            for doc_id, score in ranked
+        ]
@@ -0,0 +1,203 @@
+"""
+Sharded on-disk layout for the O*NET reference repository
+Streams one shard per category plus a manifest, and loads shards lazily on first access
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple
+
+PAGE_CATEGORIES = ('core_content', 'taxonomy', 'database_structure', 'api_reference')
+SHARD_FORMATS = ('json', 'ndjson')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+# Shard files as written by any generation (or by the older unversioned layout)
+SHARD_FILE = re.compile(r'^(?:%s)\.(?:\d+\.)?(?:%s)$' % ('|'.join(PAGE_CATEGORIES), '|'.join(SHARD_FORMATS)))
+
+
+def indented_json(value: Any, level: int) -> str:
+    """Serialise a value as it would appear nested ``level`` spaces deep in an indent=2 dump"""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + ' ' * level)
+
+
+def write_json_pages(f: TextIO, pages: Iterable[Tuple[str, Dict[str, Any]]], level: int = 0) -> int:
+    """Stream ``{url: page}`` pairs as an indent=2 JSON object and return the page count"""
+    count = 0
+    inner = ' ' * (level + 2)
+    for url, data in pages:
+        f.write(f"{'{' if not count else ','}\n{inner}{json.dumps(url, ensure_ascii=False)}: ")
+        f.write(indented_json(data, level + 2))
+        count += 1
+    f.write('{}' if not count else f"\n{' ' * level}}}")
+    return count
+
+
+def write_ndjson_pages(f: TextIO, pages: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+    """Stream pages as one ``{"url": ..., "page": ...}`` object per line"""
+    count = 0
+    for url, data in pages:
+        f.write(json.dumps({'url': url, 'page': data}, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def write_repository_shards(directory: str, repository: Dict[str, Any], fmt: str = 'json') -> Dict[str, Any]:
+    """Write each category to its own shard, then the manifest that makes them visible
+
+    Every write is a new generation with its own shard names, so a reader
+    holding the previous manifest never sees a shard from this one. Category
+    values only need an ``items()`` method, so checkpointed pages are
+    streamed from disk rather than materialised. Returns the manifest.
+    """
+    if fmt not in SHARD_FORMATS:
+        raise ValueError(f"Unknown shard format '{fmt}'")
+    os.makedirs(directory, exist_ok=True)
+    generation = _current_generation(directory) + 1
+
+    shards = {}
+    for category in PAGE_CATEGORIES:
+        name = f"{category}.{generation}.{fmt}"
+        path = os.path.join(directory, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            pages = repository.get(category, {}).items()
+            count = write_json_pages(f, pages) if fmt == 'json' else write_ndjson_pages(f, pages)
+        os.replace(tmp_path, path)
+        shards[category] = {'file': name, 'pages': count, 'bytes': os.path.getsize(path)}
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'format': fmt,
+        'generation': generation,
+        'written_at': datetime.now().isoformat(),
+        'metadata': repository.get('metadata', {}),
+        'statistics': repository.get('statistics', {}),
+        'shards': shards
+    }
+    # Swapping the manifest switches readers to the new generation in one step
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    # Only now drop the shards of earlier generations and formats
+    current = {shard['file'] for shard in shards.values()}
+    for name in os.listdir(directory):
+        if SHARD_FILE.match(name) and name not in current:
+            os.remove(os.path.join(directory, name))
+    return manifest
+
+
+def remove_repository_shards(directory: str):
+    """Delete a sharded repository: the manifest first, so readers stop finding it, then every shard"""
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if SHARD_FILE.match(name):
+            os.remove(os.path.join(directory, name))
+    if not os.listdir(directory):
+        os.rmdir(directory)
+
+
+def _current_generation(directory: str) -> int:
+    """Generation of the manifest in ``directory``, or 0 when there is none to read"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('generation', 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+class ShardedRepository:
+    """Lazy reader for a sharded repository
+
+    Only the manifest is read up front. A category shard is opened the first
+    time it is accessed and then cached; ``iter_pages`` streams NDJSON shards
+    without caching them at all.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported repository manifest version {self.manifest.get('version')}")
+        self._categories: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, MANIFEST_NAME))
+
+    @property
+    def format(self) -> str:
+        return self.manifest['format']
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest['metadata']
+
+    @property
+    def statistics(self) -> Dict[str, Any]:
+        return self.manifest['statistics']
+
+    @property
+    def loaded(self) -> Set[str]:
+        """Categories whose shard has been read into memory"""
+        return set(self._categories)
+
+    def page_count(self, category: str) -> int:
+        return self.manifest['shards'][category]['pages']
+
+    def _shard_path(self, category: str) -> str:
+        if category not in self.manifest['shards']:
+            raise KeyError(category)
+        return os.path.join(self.directory, self.manifest['shards'][category]['file'])
+
+    def category(self, category: str) -> Dict[str, Any]:
+        """Load (once) and return every page of a category"""
+        if category not in self._categories:
+            path = self._shard_path(category)
+            if self.format == 'json':
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._categories[category] = json.load(f)
+            else:
+                self._categories[category] = dict(self.iter_pages(category))
+        return self._categories[category]
+
+    def iter_pages(self, category: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (url, page) pairs, streaming NDJSON shards line by line"""
+        if category in self._categories or self.format == 'json':
+            yield from self.category(category).items()
+            return
+        with open(self._shard_path(category), 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt line {line_number} in {category} shard")
+                    continue
+                yield entry['url'], entry['page']
+
+    def get_page(self, category: str, url: str) -> Optional[Dict[str, Any]]:
+        return self.category(category).get(url)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ('metadata', 'statistics'):
+            return self.manifest[key]
+        return self.category(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialise the repository in the single-file ``onet_reference.json`` shape"""
+        repository = {'metadata': self.metadata}
+        for category in PAGE_CATEGORIES:
+            repository[category] = self.category(category)
+        repository['statistics'] = self.statistics
+        return repository
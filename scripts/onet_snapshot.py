@@ -0,0 +1,224 @@
+"""
+Binary snapshots of the O*NET reference repository and knowledge base
+Checksummed msgpack (or pickle) images that load much faster than pretty-printed JSON at startup
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import pickle
+import struct
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; pickle snapshots always work
+    msgpack = None
+
+from .onet_shards import ShardedRepository
+
+SNAPSHOT_MAGIC = b'ONETSNAP'
+SNAPSHOT_VERSION = 1
+# magic, format version, codec id, SHA-256 of the payload, payload length
+_HEADER = struct.Struct('>8sHB32sQ')
+_CODEC_IDS = {'msgpack': 1, 'pickle': 2}
+_CODEC_NAMES = {v: k for k, v in _CODEC_IDS.items()}
+
+DEFAULT_CODEC = 'msgpack' if msgpack is not None else 'pickle'
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt, stale or from another format version"""
+
+
+def available_codecs() -> List[str]:
+    return [name for name in _CODEC_IDS if name != 'msgpack' or msgpack is not None]
+
+
+def source_fingerprint(paths: Iterable[str]) -> Dict[str, Optional[List[int]]]:
+    """Size and mtime of the files a snapshot was built from, to detect stale snapshots"""
+    fingerprint = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint[os.path.abspath(path)] = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            fingerprint[os.path.abspath(path)] = None
+    return fingerprint
+
+
+def _plain(data: Any) -> Any:
+    """Materialise lazy top-level mappings (e.g. checkpointed page views) as dicts"""
+    if isinstance(data, dict):
+        return {key: dict(value.items()) if isinstance(value, Mapping) and not isinstance(value, dict) else value
+                for key, value in data.items()}
+    return data
+
+
+def _msgpack_chunks(packer: Any, value: Any, depth: int) -> Iterator[bytes]:
+    """Pack mappings up to ``depth`` levels down entry by entry, so lazy page views stream"""
+    if depth and isinstance(value, Mapping):
+        yield packer.pack_map_header(len(value))
+        for key, item in value.items():
+            yield packer.pack(key)
+            yield from _msgpack_chunks(packer, item, depth - 1)
+    else:
+        yield packer.pack(value)
+
+
+def _encode(envelope: Dict[str, Any], codec: str) -> Iterator[bytes]:
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise SnapshotError("msgpack is not installed")
+        # envelope -> data -> category -> page
+        yield from _msgpack_chunks(msgpack.Packer(use_bin_type=True), envelope, 3)
+        return
+    # Out-of-band buffers only pay off for large binary blobs; this data is all str/dict/list
+    yield pickle.dumps(dict(envelope, data=_plain(envelope['data'])), protocol=5)
+
+
+@contextmanager
+def _gc_paused():
+    """Suspend cyclic GC while decoding; rebuilding millions of containers otherwise triggers
+    repeated full collections that cost more than the decoding itself"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _decode(payload: bytes, codec: str) -> Dict[str, Any]:
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise SnapshotError("msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return pickle.loads(payload)
+
+
+def write_snapshot(path: str, kind: str, data: Any, sources: Iterable[str] = (),
+                   codec: str = DEFAULT_CODEC) -> int:
+    """Atomically write a snapshot of ``data`` and return its size in bytes"""
+    if codec not in _CODEC_IDS:
+        raise ValueError(f"Unknown snapshot codec '{codec}'")
+    envelope = {
+        'kind': kind,
+        'created_at': time.time(),
+        'sources': source_fingerprint(sources),
+        'data': data
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    digest = hashlib.sha256()
+    length = 0
+    with open(tmp_path, 'wb') as f:
+        # The header is filled in once the payload's checksum and length are known
+        f.write(bytes(_HEADER.size))
+        for chunk in _encode(envelope, codec):
+            digest.update(chunk)
+            f.write(chunk)
+            length += len(chunk)
+        f.seek(0)
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _CODEC_IDS[codec], digest.digest(), length))
+    os.replace(tmp_path, path)
+    return _HEADER.size + length
+
+
+def read_snapshot(path: str, kind: str, sources: Optional[Iterable[str]] = None,
+                  max_age: Optional[float] = None) -> Any:
+    """Load and verify a snapshot, raising SnapshotError if it cannot be trusted"""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise SnapshotError(f"cannot read {path}: {e.strerror}")
+    if len(raw) < _HEADER.size:
+        raise SnapshotError(f"{path} is truncated")
+
+    magic, version, codec_id, checksum, length = _HEADER.unpack_from(raw)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{path} is not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"{path} has format version {version}, expected {SNAPSHOT_VERSION}")
+    if codec_id not in _CODEC_NAMES:
+        raise SnapshotError(f"{path} uses unknown codec {codec_id}")
+    payload = memoryview(raw)[_HEADER.size:]
+    if len(payload) != length or hashlib.sha256(payload).digest() != checksum:
+        raise SnapshotError(f"{path} failed its checksum")
+
+    try:
+        with _gc_paused():
+            envelope = _decode(payload, _CODEC_NAMES[codec_id])
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"cannot decode {path}: {str(e)}")
+    if envelope.get('kind') != kind:
+        raise SnapshotError(f"{path} holds a {envelope.get('kind')} snapshot, not {kind}")
+    if sources is not None and envelope.get('sources') != source_fingerprint(sources):
+        raise SnapshotError(f"{path} is older than its source files")
+    if max_age is not None and time.time() - envelope.get('created_at', 0) > max_age:
+        raise SnapshotError(f"{path} is older than {max_age:.0f}s")
+    return envelope['data']
+
+
+def load_with_fallback(path: str, kind: str, sources: List[str], load_source: Callable[[], Any],
+                       codec: str = DEFAULT_CODEC, max_age: Optional[float] = None) -> Any:
+    """Load a snapshot, falling back to ``load_source`` and rewriting the snapshot when unusable"""
+    try:
+        return read_snapshot(path, kind, sources, max_age)
+    except SnapshotError as e:
+        logging.info(f"Snapshot not used, loading {kind} from source: {str(e)}")
+    data = load_source()
+    if data:
+        try:
+            write_snapshot(path, kind, data, sources, codec)
+        except OSError as e:
+            logging.warning(f"Could not refresh snapshot {path}: {str(e)}")
+    return data
+
+
+def repository_paths(output_dir: str) -> Dict[str, str]:
+    """Locations of the saved repository files in an output directory"""
+    return {
+        'json': os.path.join(output_dir, 'onet_reference.json'),
+        'shards': os.path.join(output_dir, 'onet_reference'),
+        'snapshot': os.path.join(output_dir, 'onet_reference.snapshot')
+    }
+
+
+def repository_sources(output_dir: str) -> List[str]:
+    """Files whose changes invalidate the repository snapshot"""
+    paths = repository_paths(output_dir)
+    if ShardedRepository.exists(paths['shards']):
+        return [os.path.join(paths['shards'], 'manifest.json')]
+    return [paths['json']]
+
+
+def _load_repository_source(output_dir: str) -> Dict[str, Any]:
+    paths = repository_paths(output_dir)
+    if ShardedRepository.exists(paths['shards']):
+        return ShardedRepository(paths['shards']).to_dict()
+    if not os.path.exists(paths['json']):
+        return {}
+    with open(paths['json'], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_repository(output_dir: str = 'onet_repository') -> Dict[str, Any]:
+    """Load a saved repository for serving, preferring its binary snapshot over JSON"""
+    return load_with_fallback(
+        repository_paths(output_dir)['snapshot'], 'repository', repository_sources(output_dir),
+        lambda: _load_repository_source(output_dir)
+    )
+
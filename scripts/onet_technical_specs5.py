@@ -0,0 +1,508 @@
+"""
+O*NET Web Services Integration and Data Structure Specifications
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin
+
+import redis.asyncio as redis
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from .enhanced_data_models import Base
+from .onet_cache import NOT_FOUND, SingleFlight, TwoTierCache
+from .onet_rate_limit import TokenBucket, shared_bucket_state
+from .onet_transport import OnetTransport, get_transport
+
+# Configuration and Authentication
+class OnetAPIConfig:
+    def __init__(self):
+        self.BASE_URL = "https://services.onetcenter.org/ws/"
+        self.VERSION = "v1"
+        self.AUTH_HEADERS = {
+            "Authorization": "Basic {credentials}",  # Base64 encoded username:password
+            "Accept": "application/json"
+        }
+        self.RATE_LIMIT = 50  # Requests per minute allowed by O*NET
+        self.RATE_BURST = 5   # Requests that may go out back to back before pacing starts
+        self.ENDPOINT_TIMEOUT = 10.0  # Seconds one endpoint may take before its section is marked missing
+        self.HEDGE_AFTER = None       # Seconds before a slow endpoint gets a second request; None disables
+        self.PARTIAL_TTL = 300        # Cache seconds for records with missing sections
+        self.REFRESH_RETRY_AFTER = 60  # Seconds stale reads wait before retrying a failed background refresh
+        # Rate limit state shared by every worker: Redis when reachable, else a locked file on this host
+        self.REDIS_URL = os.environ.get('ONET_REDIS_URL')
+        self.RATE_LIMIT_STATE_FILE = os.path.join(tempfile.gettempdir(), 'onet_rate_limit.state')
+        
+# Core Data Models
+class OccupationModel:
+    """Core occupation data structure"""
+    schema = {
+        "occupation_code": "str",  # O*NET-SOC code
+        "title": "str",            # Occupation title
+        "description": "str",      # Detailed description
+        "requirements": {
+            "education": {
+                "required_level": "int",
+                "preferred_level": "int",
+                "certifications": ["str"],
+                "licenses": ["str"],
+                "training_programs": [{
+                    "name": "str",
+                    "duration": "str",
+                    "provider_type": "str"
+                }]
+            },
+            "experience": {
+                "years_required": "float",
+                "level_required": "int",
+                "preferred_fields": ["str"]
+            },
+            "skills_required": [{
+                "skill_id": "str",
+                "name": "str",
+                "importance": "float",
+                "level_required": "float",
+                "category": "str"
+            }]
+        },
+        "career_pathways": {
+            "related_occupations": [{
+                "code": "str",
+                "title": "str",
+                "similarity_score": "float",
+                "transition_difficulty": "float"
+            }],
+            "advancement_paths": [{
+                "role": "str",
+                "requirements": ["str"],
+                "typical_timeframe": "str"
+            }]
+        },
+        "work_context": {
+            "environment": {
+                "physical_conditions": [{
+                    "factor": "str",
+                    "level": "float",
+                    "frequency": "str"
+                }],
+                "schedule_type": "str",
+                "remote_work_options": "str"
+            },
+            "activities": [{
+                "activity_id": "str",
+                "name": "str",
+                "importance": "float",
+                "frequency": "str"
+            }]
+        },
+        "automation_analysis": {
+            "overall_risk_score": "float",
+            "task_automation": [{
+                "task_id": "str",
+                "automation_probability": "float",
+                "timeline_estimate": "str"
+            }],
+            "required_adaptations": [{
+                "skill_area": "str",
+                "importance": "float",
+                "timeline": "str"
+            }]
+        }
+    }
+
+# API Service Classes
+class OnetDataService:
+    """Core data fetching and processing service"""
+
+    def __init__(self, config: Optional[OnetAPIConfig] = None,
+                 transport: Optional[OnetTransport] = None,
+                 rate_limiter: Optional['OnetRateLimiter'] = None):
+        self.config = config or OnetAPIConfig()
+        # Pooled keep-alive connections shared with the other O*NET clients
+        self.transport = transport or get_transport()
+        # Every endpoint request counts against the O*NET budget, not every occupation
+        self.rate_limiter = rate_limiter
+    
+    @staticmethod
+    def occupation_endpoints(onet_code: str, sections: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Endpoint paths behind one occupation record, optionally limited to ``sections``"""
+        endpoints = {
+            'details': f'/occupations/{onet_code}',
+            'requirements': f'/occupations/{onet_code}/requirements',
+            'skills': f'/occupations/{onet_code}/skills',
+            'knowledge': f'/occupations/{onet_code}/knowledge',
+            'abilities': f'/occupations/{onet_code}/abilities',
+            'tasks': f'/occupations/{onet_code}/tasks',
+            'technology': f'/occupations/{onet_code}/technology'
+        }
+        if sections is None:
+            return endpoints
+        unknown = set(sections) - set(endpoints)
+        if unknown:
+            raise ValueError(f"Unknown occupation sections: {', '.join(sorted(unknown))}")
+        return {name: path for name, path in endpoints.items() if name in sections}
+
+    async def fetch_occupation_details(self, onet_code, sections: Optional[Iterable[str]] = None,
+                                       priority: int = 0):
+        """Fetches comprehensive occupation data"""
+        return await self._fetch_sections(onet_code, self.occupation_endpoints(onet_code, sections), priority)
+
+    async def _fetch_sections(self, onet_code: str, endpoints: Dict[str, str], priority: int = 0) -> Dict[str, Any]:
+        """Fetch endpoints concurrently and merge whatever succeeded
+
+        Raises the first error when every section failed, or when the
+        occupation itself is unknown (404 on its details).
+        """
+        tasks = [
+            self._fetch_endpoint(endpoint, priority)
+            for endpoint in endpoints.values()
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        sections = dict(zip(endpoints, results))
+        failures = [r for r in results if isinstance(r, BaseException)]
+        for failure in failures:
+            if not isinstance(failure, Exception):  # cancellation
+                raise failure
+        details = sections.get('details')
+        if isinstance(details, OnetAPIError) and details.status_code == 404:
+            raise details
+        if failures and len(failures) == len(results):
+            raise failures[0]
+        return self._merge_occupation_data(onet_code, sections)
+
+    async def fetch_many(self, codes: Iterable[str], sections: Optional[Sequence[str]] = None,
+                         cache: Optional['OnetCache'] = None,
+                         priorities: Optional[Dict[str, int]] = None,
+                         max_in_flight: int = 10,
+                         ttl: int = 3600) -> AsyncIterator[Tuple[str, Union[Dict[str, Any], Exception]]]:
+        """Fetch many occupations, yielding ``(code, data)`` as each one completes
+
+        Duplicate codes are fetched once and cache hits, looked up in one
+        batch, are yielded first without touching the API; codes cached as
+        404 yield an OnetAPIError. Misses are fetched lowest ``priorities``
+        value first (input order breaks ties); each occupation's endpoint
+        requests take rate limiter tokens at that rank, so the budget is
+        spent finishing occupations in order rather than interleaving all
+        of them. ``max_in_flight`` occupations are queued on the limiter at
+        a time, enough to keep it saturated. A failed occupation yields its
+        exception instead of aborting the batch.
+        """
+        priorities = priorities or {}
+        unique = list(dict.fromkeys(codes))
+
+        keys = {code: occupation_cache_key(code, sections) for code in unique}
+        cached = await cache.get_many(keys.values()) if cache else {}
+        misses: List[str] = []
+        for code in unique:
+            value = cached.get(keys[code])
+            if value is NOT_FOUND:
+                yield code, OnetAPIError(f"Occupation {code} not found (cached)", status_code=404)
+            elif value is not None:
+                yield code, value
+            else:
+                misses.append(code)
+        # sorted() is stable, so equal priorities keep their input order
+        misses.sort(key=lambda code: priorities.get(code, 0))
+
+        window = asyncio.Semaphore(max_in_flight)
+
+        async def fetch(rank: int, code: str) -> Tuple[str, Union[Dict[str, Any], Exception]]:
+            async with window:
+                try:
+                    data = await self.fetch_occupation_details(code, sections, priority=rank)
+                except Exception as e:
+                    logging.error(f"Fetching occupation {code} failed: {str(e)}")
+                    if cache and isinstance(e, OnetAPIError) and e.status_code == 404:
+                        await cache.set_not_found([keys[code]])
+                    return code, e
+            if cache:
+                partial = 'missing_sections' in data
+                await cache.set_many({keys[code]: data}, self.config.PARTIAL_TTL if partial else ttl)
+            return code, data
+
+        # Semaphore waiters are woken in creation order, which is priority order
+        tasks = [asyncio.ensure_future(fetch(rank, code)) for rank, code in enumerate(misses)]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_endpoint(self, endpoint: str, priority: int = 0) -> Any:
+        """Fetch one API endpoint within ENDPOINT_TIMEOUT, hedging it with a second request if slow
+
+        The timeout starts once a rate limit token is held, so queueing for
+        the budget is not mistaken for a slow endpoint. The hedge takes its
+        own token and the first successful response wins.
+        """
+        loop = asyncio.get_running_loop()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(priority)
+        timeout, hedge_after = self.config.ENDPOINT_TIMEOUT, self.config.HEDGE_AFTER
+        deadline = loop.time() + timeout
+        hedge_at = loop.time() + hedge_after if hedge_after is not None else None
+
+        async def hedge():
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(priority)
+            return await self._request_endpoint(endpoint)
+
+        attempts = [asyncio.ensure_future(self._request_endpoint(endpoint))]
+        error: Optional[BaseException] = None
+        try:
+            while attempts:
+                wake = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, _ = await asyncio.wait(attempts, timeout=max(0.0, wake - loop.time()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    attempts.remove(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if loop.time() >= deadline:
+                    break
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    hedge_at = None
+                    # Only slowness is hedged; a request that already failed was retried by the transport
+                    if attempts:
+                        logging.info(f"Hedging slow request to {endpoint}")
+                        attempts.append(asyncio.ensure_future(hedge()))
+        finally:
+            for task in attempts:
+                task.cancel()
+        if error is not None and not attempts:
+            raise error
+        raise OnetAPIError(f"Request to {endpoint} timed out after {timeout}s")
+
+    async def _request_endpoint(self, endpoint: str) -> Any:
+        """Fetch one API endpoint as JSON over the shared transport"""
+        url = urljoin(self.config.BASE_URL, endpoint.lstrip('/'))
+        response = await self.transport.get(url, headers=self.config.AUTH_HEADERS)
+        if not response.ok:
+            raise OnetAPIError(f"Request to {endpoint} failed with status {response.status}",
+                               status_code=response.status, response=response.text)
+        try:
+            return response.json()
+        except ValueError:
+            raise OnetAPIError(f"Invalid JSON from {endpoint}", status_code=response.status,
+                               response=response.text)
+
+    def _merge_occupation_data(self, onet_code: str, sections: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine endpoint payloads: occupation details at the top level, the rest by endpoint name
+
+        Sections whose fetch raised are set to None and listed, with the
+        error, under ``missing_sections``.
+        """
+        merged = {'occupation_code': onet_code}
+        missing = {}
+        for name, payload in sections.items():
+            if isinstance(payload, Exception):
+                missing[name] = {'error': str(payload), 'status_code': getattr(payload, 'status_code', None)}
+                payload = None
+            if name != 'details':
+                merged[name] = payload
+            elif isinstance(payload, dict):
+                merged.update(payload)
+        if missing:
+            merged['missing_sections'] = missing
+        return merged
+
+    async def fetch_career_pathways(self, onet_code):
+        """Fetches career progression data"""
+        endpoints = {
+            'related': f'/occupations/{onet_code}/related',
+            'careers': f'/careers/{onet_code}',
+            'transitions': f'/occupation-transitions/{onet_code}'
+        }
+        return await self._fetch_sections(onet_code, endpoints)
+
+    async def fetch_work_context(self, onet_code):
+        """Fetches work environment and activity data"""
+        endpoints = {
+            'context': f'/occupations/{onet_code}/work_context',
+            'activities': f'/occupations/{onet_code}/work_activities',
+            'values': f'/occupations/{onet_code}/work_values'
+        }
+        return await self._fetch_sections(onet_code, endpoints)
+
+# Database Models (Using SQLAlchemy)
+class OccupationTable(Base):
+    """SQLAlchemy model for occupation data"""
+    __tablename__ = 'occupations'
+    
+    id = Column(Integer, primary_key=True)
+    onet_code = Column(String, unique=True)
+    title = Column(String)
+    description = Column(Text)
+    last_updated = Column(DateTime)
+    
+    # Relationships
+    requirements = relationship("RequirementTable", back_populates="occupation")
+    pathways = relationship("PathwayTable", back_populates="occupation")
+    work_context = relationship("WorkContextTable", back_populates="occupation")
+    automation = relationship("AutomationTable", back_populates="occupation")
+
+# Cache Implementation
+class OnetCache(TwoTierCache):
+    """Redis-based caching system with an in-process LRU in front"""
+    
+    def __init__(self, redis_client: Any = None, max_bytes: int = 32 * 1024 * 1024, **kwargs):
+        self.redis_client = redis_client or redis.Redis(
+            host='localhost',
+            port=6379,
+            db=0,
+            decode_responses=False  # values are binary codec payloads
+        )
+        kwargs.setdefault('default_ttl', 3600)  # 1 hour cache
+        kwargs.setdefault('stale_ttl', 6 * 3600)  # then served stale while a refresh runs
+        super().__init__(self.redis_client, max_bytes=max_bytes, **kwargs)
+    
+    async def get_cached_data(self, key):
+        """Retrieve cached data with error handling; None for misses and cached 404s"""
+        data = (await self.get_many([key])).get(key)
+        return None if data is NOT_FOUND else data
+
+    async def set_cached_data(self, key, data, ttl=None):
+        """Store data with error handling; a cache outage must not fail the request"""
+        await self.set_many({key: data}, ttl)
+
+
+_occupation_cache: Optional[OnetCache] = None
+
+
+def get_occupation_cache() -> OnetCache:
+    """The cache shared by this process, so hot occupations stay in its local tier"""
+    global _occupation_cache
+    if _occupation_cache is None:
+        _occupation_cache = OnetCache()
+    return _occupation_cache
+
+
+def occupation_cache_key(onet_code: str, sections: Optional[Iterable[str]] = None) -> str:
+    """Cache key of an occupation record; partial records are keyed by their sections"""
+    if sections is None:
+        return f"occupation:{onet_code}"
+    return f"occupation:{onet_code}:{'+'.join(sorted(sections))}"
+
+# API Rate Limiting
+class OnetRateLimiter:
+    """Token bucket rate limiter shared by every worker process"""
+    
+    def __init__(self, config: Optional[OnetAPIConfig] = None, state: Any = None):
+        self.config = config or OnetAPIConfig()
+        self.rate_limit = self.config.RATE_LIMIT  # requests per minute
+        self.bucket = TokenBucket(
+            rate=self.rate_limit/60,  # tokens per second
+            capacity=self.config.RATE_BURST,
+            state=state
+        )
+        # The shared backend is chosen on first use, since probing Redis needs the event loop
+        self._state_ready = state is not None
+        # Created for the loop that needs it, as the shared limiter outlives event loops
+        self._state_lock: Optional[asyncio.Lock] = None
+        self._state_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def acquire(self, priority: int = 0):
+        """Acquire rate limit token; lower priority values are served first"""
+        if not self._state_ready:
+            loop = asyncio.get_running_loop()
+            if self._state_loop is not loop:
+                self._state_lock, self._state_loop = asyncio.Lock(), loop
+            async with self._state_lock:
+                if not self._state_ready:
+                    self.bucket.state = await shared_bucket_state(self.config.REDIS_URL,
+                                                                  self.config.RATE_LIMIT_STATE_FILE)
+                    self._state_ready = True
+        return await self.bucket.acquire(priority=priority)
+
+_data_service: Optional[OnetDataService] = None
+
+
+def get_data_service() -> OnetDataService:
+    """The data service shared by this process, so every caller draws from one rate limiter queue"""
+    global _data_service
+    if _data_service is None:
+        _data_service = OnetDataService(rate_limiter=OnetRateLimiter())
+    return _data_service
+
+# Error Handling
+class OnetAPIError(Exception):
+    """Custom exception for O*NET API errors"""
+    
+    def __init__(self, message, status_code=None, response=None):
+        self.message = message
+        self.status_code = status_code
+        self.response = response
+        super().__init__(self.message)
+
+# Implementation Examples
+# Upstream fetches in flight in this process, by cache key
+_occupation_flights = SingleFlight()
+# When each key's last background refresh failed, so an outage does not drain the rate limiter
+_refresh_failures: Dict[str, float] = {}
+
+
+async def fetch_occupation_data(onet_code: str, data_service: Optional[OnetDataService] = None,
+                                cache: Optional[OnetCache] = None):
+    """Example implementation of occupation data fetching
+
+    Concurrent misses for the same occupation share one upstream fetch.
+    Expired entries are returned immediately while a single background
+    refresh replaces them; after a failed refresh, stale reads wait
+    REFRESH_RETRY_AFTER seconds before trying again.
+    """
+    try:
+        # Initialize services
+        data_service = data_service or get_data_service()
+        cache = cache or get_occupation_cache()
+        key = occupation_cache_key(onet_code)
+
+        async def refresh():
+            # Each endpoint request acquires a rate limit token
+            try:
+                occupation_data = await data_service.fetch_occupation_details(onet_code)
+            except OnetAPIError as e:
+                if e.status_code == 404:
+                    await cache.set_not_found([key])
+                raise
+            partial = 'missing_sections' in occupation_data
+            await cache.set_cached_data(key, occupation_data,
+                                        ttl=data_service.config.PARTIAL_TTL if partial else 3600)
+            _refresh_failures.pop(key, None)
+            return occupation_data
+
+        async def background_refresh():
+            # Returns or raises like refresh(), since a later miss may join this flight
+            try:
+                return await refresh()
+            except Exception as e:
+                _refresh_failures[key] = time.monotonic()
+                logging.warning(f"Background refresh of {onet_code} failed, keeping stale data: {str(e)}")
+                raise
+        
+        # Check cache first
+        entry = (await cache.lookup([key])).get(key)
+        if entry is not None:
+            if entry.value is NOT_FOUND:
+                raise OnetAPIError(f"Occupation {onet_code} not found (cached)", status_code=404)
+            failed_at = _refresh_failures.get(key)
+            if entry.stale and (failed_at is None
+                                or time.monotonic() - failed_at >= data_service.config.REFRESH_RETRY_AFTER):
+                _occupation_flights.start(key, background_refresh)
+            return entry.value
+        
+        # Fetch fresh data, joining any fetch of the same occupation already in flight
+        return await _occupation_flights.do(key, refresh)
+        
+    except OnetAPIError as e:
+        logging.error(f"API Error: {str(e)}")
+        raise
+    except Exception as e:
+        logging.error(f"Unexpected error: {str(e)}")
+        raise
@@ -0,0 +1,202 @@
+"""
+Per-URL crawl telemetry for O*NET repository builds
+Aggregates fetch latency, status, size, retries, parse time and element counts into histograms
+"""
+
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+# Histogram upper bounds, Prometheus style; a final +Inf bucket is implied
+FETCH_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+BYTES_BUCKETS = (1024, 10240, 51200, 102400, 512000, 1048576)
+
+# Extracted page fields counted per URL
+ELEMENT_KINDS = ('headers', 'key_points', 'tables', 'links')
+
+
+@dataclass
+class UrlTelemetry:
+    """Everything measured for one URL during a run"""
+    url: str
+    status: Optional[int] = None
+    fetch_seconds: Optional[float] = None
+    bytes: int = 0
+    retries: int = 0
+    parse_seconds: Optional[float] = None
+    elements: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def total_seconds(self) -> float:
+        return (self.fetch_seconds or 0.0) + (self.parse_seconds or 0.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram that also keeps raw values for percentiles"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.values: List[float] = []
+
+    def observe(self, value: float):
+        self.values.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile, ``q`` in [0, 100]"""
+        if not self.values:
+            return None
+        ordered = sorted(self.values)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def cumulative_counts(self) -> List[int]:
+        """Count of values <= each bucket bound, followed by the total for +Inf"""
+        return [sum(1 for v in self.values if v <= bound) for bound in self.buckets] + [len(self.values)]
+
+    def as_dict(self, digits: int = 4) -> Dict[str, Any]:
+        if not self.values:
+            return {'count': 0}
+        counts = self.cumulative_counts()
+        return {
+            'count': len(self.values),
+            'sum': round(sum(self.values), digits),
+            'mean': round(sum(self.values) / len(self.values), digits),
+            'p50': round(self.percentile(50), digits),
+            'p90': round(self.percentile(90), digits),
+            'p95': round(self.percentile(95), digits),
+            'p99': round(self.percentile(99), digits),
+            'max': round(max(self.values), digits),
+            'buckets': {_format_bound(b): c for b, c in zip(self.buckets + (math.inf,), counts)}
+        }
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == math.inf else repr(bound)
+
+
+def _status_counts(records: List[UrlTelemetry]) -> Dict[str, int]:
+    """Fetches per HTTP status; connection failures count as 'error'"""
+    counts: Dict[str, int] = {}
+    for record in records:
+        if record.fetch_seconds is not None:
+            key = str(record.status or 'error')
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+class CrawlTelemetry:
+    """Thread-safe collector of per-URL measurements for one build"""
+
+    def __init__(self):
+        self.records: Dict[str, UrlTelemetry] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, url: str) -> UrlTelemetry:
+        if url not in self.records:
+            self.records[url] = UrlTelemetry(url=url)
+        return self.records[url]
+
+    def record_fetch(self, url: str, status: Optional[int], seconds: float, size: int = 0,
+                     retries: int = 0, error: Optional[str] = None):
+        with self._lock:
+            record = self._record(url)
+            record.status = status
+            record.fetch_seconds = seconds
+            record.bytes = size
+            record.retries = retries
+            record.error = error
+
+    def record_parse(self, url: str, seconds: float, data: Optional[Dict[str, Any]]):
+        with self._lock:
+            record = self._record(url)
+            record.parse_seconds = seconds
+            record.elements = {kind: len((data or {}).get(kind, [])) for kind in ELEMENT_KINDS}
+
+    def summary(self, slowest: int = 10) -> Dict[str, Any]:
+        """Aggregate the run into the ``statistics['telemetry']`` block"""
+        with self._lock:
+            records = list(self.records.values())
+
+        fetch = Histogram(FETCH_SECONDS_BUCKETS)
+        parse = Histogram(PARSE_SECONDS_BUCKETS)
+        size = Histogram(BYTES_BUCKETS)
+        elements = {kind: 0 for kind in ELEMENT_KINDS}
+        for record in records:
+            if record.fetch_seconds is not None:
+                fetch.observe(record.fetch_seconds)
+            if record.bytes:
+                size.observe(record.bytes)
+            if record.parse_seconds is not None:
+                parse.observe(record.parse_seconds)
+            for kind, count in record.elements.items():
+                elements[kind] += count
+
+        return {
+            'urls': len(records),
+            'status_counts': _status_counts(records),
+            'retries': sum(r.retries for r in records),
+            'bytes_total': sum(r.bytes for r in records),
+            'fetch_seconds': fetch.as_dict(),
+            'parse_seconds': parse.as_dict(),
+            'response_bytes': size.as_dict(digits=1),
+            'elements': elements,
+            # The pages that dominate refresh time
+            'slowest': [
+                {'url': r.url, 'total_seconds': round(r.total_seconds, 4), 'fetch_seconds': r.fetch_seconds,
+                 'parse_seconds': r.parse_seconds, 'status': r.status}
+                for r in sorted(records, key=lambda r: r.total_seconds, reverse=True)[:slowest]
+            ]
+        }
+
+    def write_records(self, path: str):
+        """Write one JSON line per URL"""
+        with self._lock:
+            records = list(self.records.values())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(asdict(record)) + '\n')
+        os.replace(tmp_path, path)
+
+    def to_prometheus(self, prefix: str = 'onet') -> str:
+        """Render the aggregates in the Prometheus text exposition format"""
+        with self._lock:
+            records = list(self.records.values())
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, buckets: Sequence[float], values: List[float]):
+            hist = Histogram(buckets)
+            for value in values:
+                hist.observe(value)
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for bound, count in zip(hist.buckets + (math.inf,), hist.cumulative_counts()):
+                lines.append(f'{prefix}_{name}_bucket{{le="{_format_bound(bound)}"}} {count}')
+            lines.append(f"{prefix}_{name}_sum {sum(values)}")
+            lines.append(f"{prefix}_{name}_count {len(values)}")
+
+        def counter(name: str, help_text: str, label: str, counts: Dict[str, int]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, value in sorted(counts.items()):
+                lines.append(f'{prefix}_{name}{{{label}="{key}"}} {value}')
+
+        fetched = [r for r in records if r.fetch_seconds is not None]
+        histogram('fetch_duration_seconds', 'Page fetch latency', FETCH_SECONDS_BUCKETS,
+                  [r.fetch_seconds for r in fetched])
+        histogram('parse_duration_seconds', 'Page parse time', PARSE_SECONDS_BUCKETS,
+                  [r.parse_seconds for r in records if r.parse_seconds is not None])
+        histogram('response_bytes', 'Response body bytes transferred', BYTES_BUCKETS, [r.bytes for r in records if r.bytes])
+
+        counter('fetch_responses_total', 'Fetches by HTTP status', 'status', _status_counts(records))
+        lines.append(f"# HELP {prefix}_fetch_retries_total Retried requests")
+        lines.append(f"# TYPE {prefix}_fetch_retries_total counter")
+        lines.append(f"{prefix}_fetch_retries_total {sum(r.retries for r in records)}")
+        counter('extracted_elements_total', 'Elements extracted from parsed pages', 'kind',
+                {kind: sum(r.elements.get(kind, 0) for r in records) for kind in ELEMENT_KINDS})
+        return '\n'.join(lines) + '\n'
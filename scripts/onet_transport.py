@@ -0,0 +1,261 @@
+"""
+Shared HTTP transport for the O*NET clients
+One pooled keep-alive requests session and aiohttp session per process, with timeouts and jittered retries
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401 - enables 'br' decoding in urllib3 and aiohttp
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+# Only advertise brotli when a decoder is installed, or responses would be undecodable
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+@dataclass
+class TransportConfig:
+    """Connection pool, timeout and retry settings shared by every client"""
+    pool_connections: int = 10       # Hosts with a connection pool
+    pool_maxsize: int = 20           # Keep-alive connections per host
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    keepalive_timeout: float = 30.0  # Idle seconds before an aiohttp connection is closed
+    max_retries: int = 3
+    backoff_base: float = 0.5        # Backoff ceiling doubles from here on every retry
+    backoff_max: float = 10.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    user_agent: str = 'CareerExplorer-Onet/1.0'
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform between 0 and min(cap, base * 2**attempt)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _retry_after(headers: Any, cap: float) -> Optional[float]:
+    """Seconds requested by a numeric Retry-After header, capped"""
+    value = headers.get('Retry-After') if headers else None
+    try:
+        return min(cap, max(0.0, float(value))) if value is not None else None
+    except ValueError:
+        return None
+
+
+class JitteredRetry(Retry):
+    """urllib3 retry policy using the same full-jitter backoff as the async client"""
+
+    def get_backoff_time(self) -> float:
+        if not self.history:
+            return 0
+        return backoff_delay(len(self.history) - 1, self.backoff_factor, self.backoff_max)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests that do not set one"""
+
+    def __init__(self, timeout: Tuple[float, float], **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+@dataclass
+class TransportResponse:
+    """Fully read response from the async client"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    retries: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class OnetTransport:
+    """Process-wide pooled HTTP transport
+
+    ``session`` is a thread-safe requests session for synchronous clients.
+    ``async_session()`` returns an aiohttp session bound to the running event
+    loop; ``request()`` adds retries with backoff on top of it.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        self.config = config or TransportConfig()
+        self._session: Optional[requests.Session] = None
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_closer: Optional[AsyncIterator[None]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def default_headers(self) -> Dict[str, str]:
+        return {'User-Agent': self.config.user_agent, 'Accept-Encoding': ACCEPT_ENCODING}
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self) -> requests.Session:
+        config = self.config
+        retry = JitteredRetry(
+            total=config.max_retries,
+            status_forcelist=config.retry_statuses,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            backoff_factor=config.backoff_base,
+            backoff_max=config.backoff_max,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = TimeoutHTTPAdapter(
+            timeout=(config.connect_timeout, config.read_timeout),
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.default_headers)
+        return session
+
+    async def async_session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session for the running loop, created on first use
+
+        A session left open by an earlier loop is closed on that loop when it is
+        still alive. Each session also closes itself when its loop shuts down
+        (``asyncio.run`` does so on exit), so callers that skip ``aclose()`` leak
+        no connections.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_session
+        if session is None or session.closed or self._async_loop is not loop:
+            previous = (self._async_loop, self._async_closer)
+            config = self.config
+            connector = aiohttp.TCPConnector(
+                limit=config.pool_connections * config.pool_maxsize,
+                limit_per_host=config.pool_maxsize,
+                keepalive_timeout=config.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=config.connect_timeout,
+                                              sock_read=config.read_timeout),
+                headers=self.default_headers
+            )
+            closer = self._close_at_loop_shutdown(session)
+            await closer.__anext__()  # Runs to the yield without suspending
+            self._async_session, self._async_loop, self._async_closer = session, loop, closer
+            await self._close_async_session(*previous)
+        return session
+
+    @staticmethod
+    async def _close_at_loop_shutdown(session: aiohttp.ClientSession) -> AsyncIterator[None]:
+        # The loop finalises suspended async generators before it closes
+        try:
+            yield
+        finally:
+            if not session.closed:
+                await session.close()
+
+    @staticmethod
+    async def _close_async_session(loop: Optional[asyncio.AbstractEventLoop],
+                                   closer: Optional[AsyncIterator[None]]):
+        """Close a replaced session, on its own loop when that loop still runs"""
+        if closer is None:
+            return
+        if loop is not None and not loop.is_closed() and loop is not asyncio.get_running_loop():
+            asyncio.run_coroutine_threadsafe(closer.aclose(), loop)
+        else:
+            await closer.aclose()
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> TransportResponse:
+        """Send a request, retrying connection errors and retryable statuses with jittered backoff
+
+        ``timeout`` bounds each attempt in seconds, on top of the session's connect and read timeouts.
+        """
+        config = self.config
+        session = await self.async_session()
+        options = {'timeout': aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        for attempt in range(config.max_retries + 1):
+            try:
+                async with session.request(method, url, headers=headers, params=params, **options) as response:
+                    body = await response.read()
+                    if response.status not in config.retry_statuses or attempt == config.max_retries:
+                        return TransportResponse(url, response.status, dict(response.headers), body, attempt)
+                    delay = _retry_after(response.headers, config.backoff_max)
+                    reason = f"status {response.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == config.max_retries:
+                    raise
+                delay, reason = None, str(e) or type(e).__name__
+            if delay is None:
+                delay = backoff_delay(attempt, config.backoff_base, config.backoff_max)
+            logging.warning(f"Retrying {url} in {delay:.2f}s after {reason} "
+                            f"(attempt {attempt + 1}/{config.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> TransportResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def aclose(self):
+        """Close the aiohttp session; call before the owning event loop ends"""
+        closer = self._async_closer
+        self._async_session = self._async_loop = self._async_closer = None
+        if closer is not None:
+            await closer.aclose()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_shared_transport: Optional[OnetTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> OnetTransport:
+    """Return the transport shared by every O*NET client in this process"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = OnetTransport()
+        return _shared_transport
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+def make_page(title, body):
+    return f"""<html><head><title>{title}</title>
+<meta name="description" content="{title} page"></head>
+<body><main>{body}</main></body></html>"""
+
+
+class FixtureSite:
+    """Small in-memory website served over HTTP for crawler tests"""
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+        self.delay = 0.0
+        self.etags = True
+        self.gzip = False  # Compress bodies for clients that accept gzip
+        self.failures = {}  # path -> number of 503 responses to send before succeeding
+        self.stalls = {}  # path -> extra delays for successive requests
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    @staticmethod
+    def page(title, body):
+        return make_page(title, body)
+
+
+@pytest.fixture
+def fixture_site():
+    site = FixtureSite()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with site._lock:
+                site.requests.append((self.path, dict(self.headers)))
+                site.in_flight += 1
+                site.max_in_flight = max(site.max_in_flight, site.in_flight)
+            try:
+                with site._lock:
+                    stalls = site.stalls.get(self.path)
+                    stall = stalls.pop(0) if stalls else 0.0
+                if site.delay or stall:
+                    time.sleep(site.delay + stall)
+                with site._lock:
+                    failing = site.failures.get(self.path, 0) > 0
+                    if failing:
+                        site.failures[self.path] -= 1
+                if failing:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = site.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                payload = body.encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                if site.etags and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if site.etags:
+                    self.send_header('ETag', etag)
+                if site.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    payload = gzip.compress(payload)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            finally:
+                with site._lock:
+                    site.in_flight -= 1
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 64  # The default backlog of 5 drops bursts of concurrent connects
+
+        def handle_error(self, request, client_address):
+            # Timeout and hedging tests hang up on stalled requests on purpose
+            if not isinstance(sys.exc_info()[1], ConnectionError):
+                super().handle_error(request, client_address)
+
+    site.server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=site.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield site
+    site.server.shutdown()
+    site.server.server_close()
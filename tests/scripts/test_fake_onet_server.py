@@ -0,0 +1,76 @@
+import asyncio
+
+import aiohttp
+from redis._parsers.encoders import Encoder
+
+from scripts.benchmarks.bench_data_service import run_load
+from scripts.benchmarks.fake_onet_server import FakeOnetServer, FakeServerConfig, occupation_codes, serve
+from scripts.onet_cache import LocalRedis
+
+
+def test_fake_server_serves_known_codes_and_throttles():
+    code = occupation_codes(1)[0]
+    server = FakeOnetServer(FakeServerConfig(occupations=1, latency=0, latency_jitter=0, rate_limit=60, burst=2))
+
+    async def run():
+        async with serve(server) as base_url, aiohttp.ClientSession() as session:
+            statuses = []
+            for path in (f'occupations/{code}/skills', 'occupations/99-9999.00', f'careers/{code}'):
+                async with session.get(base_url + path) as response:
+                    statuses.append(response.status)
+                    if response.status == 200:
+                        payload = await response.json()
+            return statuses, payload, response.headers.get('Retry-After')
+
+    statuses, payload, retry_after = asyncio.run(run())
+    assert statuses == [200, 404, 429]
+    assert payload['code'] == code and payload['element']
+    assert float(retry_after) > 0
+
+
+def test_load_benchmark_reports_latency_upstream_calls_and_hit_ratio():
+    report = asyncio.run(run_load(requests=60, concurrency=10, occupations=5,
+                                  server=FakeServerConfig(latency=0.005, latency_jitter=0)))
+
+    # Each occupation is fetched once, however many concurrent requests missed it
+    assert report['upstream_calls'] == 5 * 7
+    assert report['errors'] == 0
+    assert report['cache_hit_ratio'] > 0.5
+    assert report['latency_ms']['p50'] <= report['latency_ms']['p99']
+
+
+class ScratchRedis(LocalRedis):
+    """LocalRedis that answers reads the way redis-py does for the client options it was created with"""
+
+    def __init__(self, decode_responses=False):
+        super().__init__()
+        self.encoder = Encoder('utf-8', 'strict', decode_responses)
+        self.closed = False
+
+    async def get(self, key):
+        value = await super().get(key)
+        return None if value is None else self.encoder.decode(value)
+
+    async def mget(self, keys):
+        return [None if value is None else self.encoder.decode(value) for value in await super().mget(keys)]
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_load_benchmark_reads_binary_payloads_back_from_redis(monkeypatch):
+    clients = []
+
+    def from_url(url, **kwargs):
+        clients.append(ScratchRedis(**kwargs))
+        return clients[-1]
+
+    monkeypatch.setattr('redis.asyncio.from_url', from_url)
+    report = asyncio.run(run_load(requests=30, concurrency=5, occupations=3, redis_url='redis://scratch',
+                                  local_cache_bytes=1, server=FakeServerConfig(latency=0, latency_jitter=0)))
+
+    # With no room in the local tier every hit is a Redis read of a codec frame
+    assert report['cache']['errors'] == 0
+    assert report['cache']['redis_hits'] > 0
+    assert report['upstream_calls'] == 3 * 7
+    assert clients[0].closed
@@ -0,0 +1,46 @@
+import json
+
+from scripts.onet_archive import HtmlArchive
+from scripts.onet_extractor import OnetDataExtractor
+
+
+def test_archive_deduplicates_identical_bodies(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    first = archive.put('https://example.org/a', '<html>same</html>')
+    second = archive.put('https://example.org/b', '<html>same</html>')
+
+    assert first == second
+    assert len(list((tmp_path / 'objects').rglob('*.html.gz'))) == 1
+    assert HtmlArchive(str(tmp_path)).get('https://example.org/b') == '<html>same</html>'
+
+
+def test_archive_index_keeps_latest_version(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    archive.put('https://example.org/a', 'v1')
+    archive.put('https://example.org/a', 'v2')
+
+    reopened = HtmlArchive(str(tmp_path))
+    assert reopened.get('https://example.org/a') == 'v2'
+    assert len(reopened) == 1
+
+
+def test_replay_rebuilds_repository_without_network(fixture_site, tmp_path):
+    fixture_site.pages = {
+        '/reference/taxonomy': fixture_site.page('Taxonomy', """
+            <h2>Taxonomy</h2>
+            <table><tr><th>Code</th></tr><tr><td>11-1011.00</td></tr></table>"""),
+    }
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [fixture_site.url('/reference/taxonomy')]
+    extractor.build_repository()
+    fixture_site.requests.clear()
+
+    replayer = OnetDataExtractor(output_dir=str(tmp_path))
+    replayer.base_urls = []
+    assert replayer.replay_repository() == 1
+
+    assert fixture_site.requests == []
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    page = saved['taxonomy'][fixture_site.url('/reference/taxonomy')]
+    assert page['tables'] == [{'headers': ['Code'], 'rows': [['11-1011.00']]}]
+    assert saved['statistics']['total_pages'] == 1
@@ -0,0 +1,56 @@
+import asyncio
+
+from scripts.onet_cache import NOT_FOUND, ByteLRU, LocalRedis, TwoTierCache
+
+
+def test_lru_evicts_least_recently_used_past_byte_cap():
+    lru = ByteLRU(max_bytes=30)
+    lru.set('a', 'A', 10, ttl=60)
+    lru.set('b', 'B', 10, ttl=60)
+    lru.set('c', 'C', 10, ttl=60)
+    assert lru.get('a') == 'A'  # now most recently used
+    lru.set('d', 'D', 10, ttl=60)
+
+    assert lru.get('b') is None
+    assert (lru.get('a'), lru.get('d'), lru.size, lru.evictions) == ('A', 'D', 30, 1)
+    lru.set('huge', 'X', 100, ttl=60)
+    assert lru.get('huge') is None and lru.size == 30
+    lru.set('gone', 'G', 1, ttl=0)
+    assert lru.get('gone') is None
+
+
+def test_two_tier_batches_redis_and_serves_hot_keys_locally():
+    redis = LocalRedis()
+    cache = TwoTierCache(redis, default_ttl=100, ttl_jitter=0.2)
+
+    async def run():
+        await cache.set_many({'a': {'v': 1}, 'b': {'v': 2}, 'c': [3]})
+        await cache.set_not_found(['gone'])
+        assert redis.round_trips == 2
+
+        # A fresh process sharing the same Redis: one MGET for every key
+        other = TwoTierCache(redis)
+        found = await other.get_many(['a', 'b', 'c', 'gone', 'missing'])
+        assert redis.round_trips == 3
+        assert found == {'a': {'v': 1}, 'b': {'v': 2}, 'c': [3], 'gone': NOT_FOUND}
+
+        # Now hot in its local tier: no network hop at all
+        assert await other.get_many(['a', 'gone']) == {'a': {'v': 1}, 'gone': NOT_FOUND}
+        assert redis.round_trips == 3
+        return other.stats()
+
+    stats = asyncio.run(run())
+    assert stats['redis_hits'] == 4 and stats['local_hits'] == 2
+    assert stats['misses'] == 1 and stats['negative_hits'] == 2
+    ttls = [expires for _, expires in redis.data.values()]
+    assert len(set(ttls)) > 1  # jittered
+
+
+def test_redis_outage_degrades_to_misses():
+    class DownRedis(LocalRedis):
+        async def mget(self, keys):
+            raise ConnectionError('down')
+
+    cache = TwoTierCache(DownRedis(), local_ttl=0)
+    assert asyncio.run(cache.get_many(['a'])) == {}
+    assert cache.stats()['errors'] == 1
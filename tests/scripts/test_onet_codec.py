@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from scripts.onet_codec import Codec, CodecError, available_compressions, available_serializers
+
+PAYLOAD = {
+    'code': '15-1252.00',
+    'title': 'Software Developers – Ünïcode',
+    'element': [{'id': f'2.A.1.{i}', 'name': 'Reading Comprehension', 'score': {'value': 4.5 + i}}
+                for i in range(50)],
+    'flags': [True, False, None],
+}
+
+
+@pytest.mark.parametrize('serializer', available_serializers())
+@pytest.mark.parametrize('compression', available_compressions())
+def test_round_trip_and_cross_decoding(serializer, compression):
+    codec = Codec(serializer, compression, threshold=256)
+    encoded = codec.encode(PAYLOAD)
+
+    assert Codec.decode(encoded) == PAYLOAD
+    assert len(encoded) < len(json.dumps(PAYLOAD, indent=2))
+    assert Codec.decode(codec.encode({'small': 1})) == {'small': 1}
+
+
+def test_compression_only_above_threshold():
+    codec = Codec('json', 'zlib', threshold=1024)
+    small = codec.encode({'a': 'x' * 10})
+    large = codec.encode({'a': 'x' * 5000})
+    assert small[4] == 0 and large[4] == 1
+    assert len(large) < 200
+
+
+def test_legacy_json_decodes_and_garbage_is_rejected():
+    legacy = json.dumps(PAYLOAD, indent=2)
+    assert Codec.decode(legacy) == PAYLOAD
+    assert Codec.decode(legacy.encode('utf-8')) == PAYLOAD
+    with pytest.raises(CodecError):
+        Codec.decode(b'\xc1O\x09\x01\x00{}')  # future format version
+    with pytest.raises(CodecError):
+        Codec.decode(b'\x00\x01garbage')
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from scripts.onet_crawl_store import CrawlStore
+from scripts.onet_crawler import CrawlConfig
+from scripts.onet_extractor import OnetDataExtractor
+
+
+class Interrupted(Exception):
+    pass
+
+
+def seed_pages(site, count):
+    site.pages = {
+        f'/reference/page{i}': site.page(f'Page {i}', f'<h2>Section {i}</h2>') for i in range(count)
+    }
+    return [site.url(path) for path in site.pages]
+
+
+def test_interrupted_build_resumes_without_refetching(fixture_site, tmp_path):
+    urls = seed_pages(fixture_site, 6)
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = urls
+    extractor.crawl_store.batch_size = 1
+    stored = []
+    store_page = extractor._store_page
+
+    def crash_after_three(url, data):
+        if len(stored) == 3:
+            raise Interrupted()
+        store_page(url, data)
+        stored.append(url)
+
+    extractor._store_page = crash_after_three
+    with pytest.raises(Interrupted):
+        extractor.build_repository(fetch_workers=1, parse_workers=1)
+    assert not (tmp_path / 'onet_reference.json').exists()
+
+    fixture_site.requests.clear()
+    resumed = OnetDataExtractor(output_dir=str(tmp_path))
+    resumed.base_urls = urls
+    resumed.build_repository(fetch_workers=2, parse_workers=1)
+
+    # Writes are flushed before the next one is buffered, so the last stored page was lost
+    durable = stored[:-1]
+    refetched = {fixture_site.url(path) for path, _ in fixture_site.requests}
+    assert refetched == set(urls) - set(durable)
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    assert list(saved['api_reference'])[:2] == durable
+    assert len(saved['api_reference']) == 6
+    assert saved['statistics']['resumed_pages'] == 2
+
+
+def test_crawl_resumes_from_checkpointed_frontier(fixture_site, tmp_path):
+    fixture_site.pages = {
+        '/reference/': fixture_site.page('Reference', '<a href="/reference/database">Database reference</a>'),
+        '/reference/database': fixture_site.page('Database', '<h2>Database</h2>'),
+    }
+    root, database = fixture_site.url('/reference/'), fixture_site.url('/reference/database')
+    store = CrawlStore(str(tmp_path / 'crawl_state.sqlite3'))
+    store.begin('crawl', [root])
+    store.complete(root, 'api_reference', {'title': 'Reference', 'links': []})
+    store.enqueue(database, 1)
+    store.close()
+
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [root]
+    stats = extractor.crawl_repository(CrawlConfig(per_host_delay=0))
+
+    assert [path for path, _ in fixture_site.requests] == ['/reference/database']
+    assert stats['fetched'] == 1
+    assert root in extractor.repository['api_reference']
+    assert database in extractor.repository['database_structure']
+    assert extractor.repository['statistics']['total_pages'] == 2
+
+
+def test_completed_or_different_runs_start_afresh(tmp_path):
+    store = CrawlStore(str(tmp_path / 'state.sqlite3'))
+    store.begin('build', ['a', 'b'])
+    store.complete('a', 'core_content', {'title': 'A'})
+
+    assert not store.begin('replay', ['c'])
+    assert store.pending() == [('c', 0)]
+    assert store.count_pages('core_content') == 0
+
+    store.finish()
+    assert not store.begin('replay', ['c'])
+    assert store.begin('replay', ['c'])
+
+
+def test_crash_at_a_batch_boundary_keeps_a_page_with_its_links(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    store = CrawlStore(path, batch_size=1)
+    store.begin('crawl', ['root'])
+    store.complete('root', 'api_reference', {'title': 'Root'})
+    store.enqueue('a', 1)
+    store.enqueue('b', 1)
+
+    # Crash before the next page: the root page and its links are both still pending
+    crashed = CrawlStore(path)
+    assert crashed.completed() == [] and crashed.pending() == [('root', 0)]
+
+    store.complete('a', 'api_reference', {'title': 'A'})
+    store.enqueue('c', 2)
+
+    # Crash after it: the root page is durable together with every link it enqueued
+    crashed = CrawlStore(path)
+    assert crashed.completed() == ['root']
+    assert crashed.pending() == [('a', 1), ('b', 1)]
+
+
+def test_reads_see_buffered_writes_without_committing_them(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    store = CrawlStore(path)
+    store.begin('crawl', ['root'])
+    store.complete('root', 'api_reference', {'title': 'Root'}, {'etag': '"r"'})
+    store.enqueue('a', 1)
+    store.complete('a', 'taxonomy', {'title': 'A'})
+    store.complete('a', 'api_reference', {'title': 'A again'})
+
+    assert store.pending() == []
+    assert store.completed() == ['root', 'a']
+    assert store.fetch_states() == {'root': {'etag': '"r"'}}
+    assert store.get_page('api_reference', 'a') == {'title': 'A again'}
+    assert store.get_page('taxonomy', 'a') is None
+    assert store.count_pages('api_reference') == 2 and store.count_pages('taxonomy') == 0
+    assert dict(store.pages('api_reference')) == {'root': {'title': 'Root'}, 'a': {'title': 'A again'}}
+
+    store.enqueue('b', 2)
+    assert store.pending() == [('b', 2)]
+    # None of those reads committed the half-enqueued page
+    crashed = CrawlStore(path)
+    assert crashed.completed() == [] and crashed.pending() == [('root', 0)]
+    store.close()
+    assert CrawlStore(path).pages('api_reference')['a'] == {'title': 'A again'}
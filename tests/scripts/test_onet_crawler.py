@@ -0,0 +1,123 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from scripts.onet_crawler import AsyncCrawler, CrawlConfig
+from scripts.onet_extractor import OnetDataExtractor
+from scripts.onet_transport import OnetTransport, TransportConfig
+
+
+@pytest.fixture
+def linked_site(fixture_site):
+    fixture_site.pages = {
+        '/reference/': fixture_site.page('Reference', """
+            <h1>Reference</h1>
+            <p>This is an important overview.</p>
+            <a href="/reference/taxonomy">Taxonomy reference</a>
+            <a href="database">Database guide</a>
+            <a href="/private/api">Private API</a>
+            <a href="#top">Back to top reference</a>"""),
+        '/reference/taxonomy': fixture_site.page('Taxonomy', """
+            <h2>Taxonomy</h2>
+            <table><tr><th>Code</th></tr><tr><td>11-1011.00</td></tr></table>
+            <a href="/reference/taxonomy/deep">Deeper reference</a>"""),
+        '/reference/database': fixture_site.page('Database', '<h2>Database</h2>'),
+        '/reference/taxonomy/deep': fixture_site.page('Deep', '<h2>Deep</h2>'),
+    }
+    return fixture_site
+
+
+def test_crawler_follows_links_within_depth(linked_site):
+    config = CrawlConfig(max_depth=1, per_host_delay=0, deny_patterns=[r'/private/'])
+    fetched = []
+
+    async def handle(result):
+        fetched.append(result.url)
+        return [linked_site.url(p) for p in ('/reference/taxonomy', '/reference/database',
+                                              '/reference/taxonomy/deep', '/private/api')
+                if result.url == linked_site.url('/reference/')]
+
+    stats = asyncio.run(AsyncCrawler(config).crawl([linked_site.url('/reference/')], handle))
+
+    assert sorted(fetched) == sorted([
+        linked_site.url('/reference/'),
+        linked_site.url('/reference/taxonomy'),
+        linked_site.url('/reference/database'),
+        linked_site.url('/reference/taxonomy/deep'),
+    ])
+    assert stats['fetched'] == 4
+    assert stats['skipped'] == 1
+
+
+def test_crawler_respects_concurrency_caps(fixture_site):
+    fixture_site.delay = 0.05
+    fixture_site.pages = {f'/page/{i}': fixture_site.page(str(i), '') for i in range(12)}
+    seeds = [fixture_site.url(p) for p in fixture_site.pages]
+    config = CrawlConfig(max_concurrency=8, per_host_concurrency=3, per_host_delay=0)
+
+    async def handle(result):
+        return []
+
+    stats = asyncio.run(AsyncCrawler(config).crawl(seeds, handle))
+
+    assert stats['fetched'] == 12
+    assert 1 < fixture_site.max_in_flight <= 3
+
+
+def test_crawler_stops_at_max_pages(linked_site):
+    config = CrawlConfig(max_depth=5, max_pages=2, per_host_delay=0)
+
+    async def handle(result):
+        return [linked_site.url('/reference/taxonomy'), linked_site.url('/reference/database')]
+
+    stats = asyncio.run(AsyncCrawler(config).crawl([linked_site.url('/reference/')], handle))
+
+    assert stats['fetched'] == 2
+    assert len(linked_site.requests) == 2
+
+
+def test_extractor_crawl_builds_repository(linked_site, tmp_path):
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [linked_site.url('/reference/')]
+    config = CrawlConfig(max_depth=2, per_host_delay=0, deny_patterns=[r'/private/'])
+
+    stats = extractor.crawl_repository(config)
+
+    assert stats['fetched'] == 4
+    assert linked_site.url('/reference/taxonomy/deep') in extractor.repository['taxonomy']
+    assert linked_site.url('/reference/database') in extractor.repository['database_structure']
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    assert saved['statistics']['total_pages'] == 4
+    assert saved['statistics']['crawl']['fetched'] == 4
+
+
+def test_crawler_retries_transient_failures_through_the_transport(linked_site):
+    linked_site.failures = {'/reference/': 2}
+    transport = OnetTransport(TransportConfig(max_retries=2, backoff_base=0.01, backoff_max=0.05))
+    fetched = []
+
+    async def handle(result):
+        return []
+
+    crawler = AsyncCrawler(CrawlConfig(per_host_delay=0), transport=transport, on_fetched=fetched.append)
+    stats = asyncio.run(crawler.crawl([linked_site.url('/reference/')], handle))
+
+    assert stats['fetched'] == 1 and stats['failed'] == 0
+    assert [(r.status, r.retries) for r in fetched] == [(200, 2)]
+
+
+def test_fetch_size_is_the_compressed_transfer(linked_site):
+    linked_site.gzip = True
+    fetched = []
+
+    async def handle(result):
+        return []
+
+    crawler = AsyncCrawler(CrawlConfig(per_host_delay=0), on_fetched=fetched.append)
+    asyncio.run(crawler.crawl([linked_site.url('/reference/')], handle))
+
+    page = linked_site.pages['/reference/'].encode()
+    assert fetched[0].text == page.decode()
+    assert fetched[0].size == len(gzip.compress(page)) < len(page)
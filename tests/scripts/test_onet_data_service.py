@@ -0,0 +1,252 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from scripts.onet_cache import LocalRedis
+from scripts.onet_rate_limit import LocalBucketState
+from scripts.onet_technical_specs5 import (
+    OnetAPIConfig,
+    OnetAPIError,
+    OnetCache,
+    OnetDataService,
+    OnetRateLimiter,
+    _occupation_flights,
+    fetch_occupation_data,
+    get_data_service,
+    occupation_cache_key,
+)
+from scripts.onet_transport import OnetTransport, TransportConfig
+
+
+@pytest.fixture
+def transport():
+    transport = OnetTransport(TransportConfig(max_retries=2, backoff_base=0.01, backoff_max=0.05))
+    yield transport
+    transport.close()
+
+
+def test_data_service_merges_endpoints_over_shared_transport(fixture_site, transport):
+    code = '15-1252.00'
+    fixture_site.pages = {
+        f'/ws/occupations/{code}': json.dumps({'code': code, 'title': 'Software Developers'}),
+    }
+    for name in ('requirements', 'skills', 'knowledge', 'abilities', 'tasks', 'technology'):
+        fixture_site.pages[f'/ws/occupations/{code}/{name}'] = json.dumps({'element': [name]})
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    service = OnetDataService(config, transport)
+
+    async def run(onet_code):
+        try:
+            return await service.fetch_occupation_details(onet_code)
+        finally:
+            await transport.aclose()
+
+    data = asyncio.run(run(code))
+    assert data['occupation_code'] == code
+    assert data['title'] == 'Software Developers'
+    assert data['skills'] == {'element': ['skills']}
+    with pytest.raises(OnetAPIError) as error:
+        asyncio.run(run('00-0000.00'))
+    assert error.value.status_code == 404
+
+
+def test_fetch_many_dedupes_cache_hits_and_saturates_the_budget(fixture_site, transport):
+    codes = ['11-1011.00', '15-1252.00', '29-1141.00']
+    for code in codes:
+        fixture_site.pages[f'/ws/occupations/{code}'] = json.dumps({'code': code})
+        fixture_site.pages[f'/ws/occupations/{code}/skills'] = json.dumps({'element': [code]})
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    config.RATE_LIMIT, config.RATE_BURST = 60 * 50, 2  # 50 requests per second
+    limiter = OnetRateLimiter(config, state=LocalBucketState())
+    service = OnetDataService(config, transport, rate_limiter=limiter)
+    cache = OnetCache(LocalRedis())
+    missing = '99-9999.00'
+
+    async def run():
+        await cache.set_cached_data(occupation_cache_key('00-0000.00', ['details', 'skills']), {'cached': True})
+        await cache.set_not_found([occupation_cache_key(missing, ['details', 'skills'])])
+        start = time.monotonic()
+        try:
+            results = [item async for item in service.fetch_many(
+                codes + ['00-0000.00', missing, codes[0]], sections=['details', 'skills'], cache=cache,
+                priorities={'29-1141.00': -1})]
+        finally:
+            await transport.aclose()
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert [code for code, _ in results] == ['00-0000.00', missing, '29-1141.00', '11-1011.00', '15-1252.00']
+    assert results[1][1].status_code == 404
+    assert results[2][1]['skills'] == {'element': ['29-1141.00']}
+    assert len(fixture_site.requests) == 6
+    assert occupation_cache_key('15-1252.00', ['skills', 'details']) in cache.redis_client.data
+    # Six requests with a burst of two need 4/50 s; anything much slower means the budget sat idle
+    assert 4 / 50 - 0.02 <= elapsed < 4 / 50 + 0.5
+
+
+def test_fetch_occupation_data_coalesces_misses_and_revalidates_stale(fixture_site, transport):
+    code = '15-1252.00'
+    fixture_site.pages[f'/ws/occupations/{code}'] = json.dumps({'title': 'Software Developers'})
+    for name in ('requirements', 'skills', 'knowledge', 'abilities', 'tasks', 'technology'):
+        fixture_site.pages[f'/ws/occupations/{code}/{name}'] = json.dumps({'element': [name]})
+    fixture_site.delay = 0.05
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    service = OnetDataService(config, transport)
+    redis = LocalRedis()
+
+    async def run():
+        try:
+            cache = OnetCache(redis)
+            misses = await asyncio.gather(*[fetch_occupation_data(code, service, cache) for _ in range(20)])
+            coalesced = len(fixture_site.requests)
+
+            # Another worker finds the entry past its freshness but inside the stale window
+            redis.data[occupation_cache_key(code)] = (
+                json.dumps({'fresh_until': 0, 'value': {'title': 'Old title'}}), None)
+            cache = OnetCache(redis)
+            stale = await asyncio.gather(*[fetch_occupation_data(code, service, cache) for _ in range(5)])
+            while len(_occupation_flights):
+                await asyncio.sleep(0.01)
+            refreshed = await fetch_occupation_data(code, service, OnetCache(redis))
+            return misses, coalesced, stale, refreshed
+        finally:
+            await transport.aclose()
+
+    misses, coalesced, stale, refreshed = asyncio.run(run())
+    assert coalesced == 7
+    assert all(data['title'] == 'Software Developers' for data in misses)
+    assert [data['title'] for data in stale] == ['Old title'] * 5
+    assert len(fixture_site.requests) == 14  # one background refresh for five stale reads
+    assert refreshed['title'] == 'Software Developers'
+
+
+def test_failed_background_refreshes_back_off(fixture_site, transport, monkeypatch):
+    code = '15-1252.00'
+    main = f'/ws/occupations/{code}'
+    fixture_site.failures = {main: 1000}  # O*NET is down
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    config.REFRESH_RETRY_AFTER = 0.3
+    service = OnetDataService(config, transport)
+    redis = LocalRedis()
+    redis.data[occupation_cache_key(code)] = (json.dumps({'fresh_until': 0, 'value': {'title': 'Old title'}}), None)
+    monkeypatch.setattr('scripts.onet_technical_specs5._refresh_failures', {})
+
+    def main_requests():
+        return sum(path == main for path, _ in fixture_site.requests)
+
+    async def read():
+        data = await fetch_occupation_data(code, service, OnetCache(redis))
+        while len(_occupation_flights):
+            await asyncio.sleep(0.01)
+        return data['title']
+
+    async def run():
+        try:
+            titles = [await read() for _ in range(5)]
+            backed_off = main_requests()
+            await asyncio.sleep(0.3)
+            titles.append(await read())
+            return titles, backed_off
+        finally:
+            await transport.aclose()
+
+    titles, backed_off = asyncio.run(run())
+    assert titles == ['Old title'] * 6
+    # One refresh (three attempts) for five stale reads, then one retry once the interval passed
+    assert backed_off == 3
+    assert main_requests() == 6
+
+
+def test_slow_and_failing_endpoints_are_hedged_or_marked_missing(fixture_site, transport):
+    code = '15-1252.00'
+    fixture_site.pages[f'/ws/occupations/{code}'] = json.dumps({'title': 'Software Developers'})
+    fixture_site.pages[f'/ws/occupations/{code}/skills'] = json.dumps({'element': ['skills']})
+    fixture_site.pages[f'/ws/occupations/{code}/related'] = json.dumps({'occupation': []})
+    fixture_site.stalls = {f'/ws/occupations/{code}/skills': [1.0],
+                           f'/ws/occupations/{code}/tasks': [1.0]}
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    config.ENDPOINT_TIMEOUT, config.HEDGE_AFTER = 0.5, 0.1
+    service = OnetDataService(config, transport)
+
+    async def run():
+        try:
+            start = time.monotonic()
+            details = await service.fetch_occupation_details(code, ['details', 'skills', 'tasks', 'technology'])
+            elapsed = time.monotonic() - start
+            pathways = await service.fetch_career_pathways(code)
+            return details, elapsed, pathways
+        finally:
+            await transport.aclose()
+
+    details, elapsed, pathways = asyncio.run(run())
+    assert details['title'] == 'Software Developers'
+    assert details['skills'] == {'element': ['skills']}  # answered by the hedge
+    assert details['tasks'] is None and details['technology'] is None
+    assert 'timed out' in details['missing_sections']['tasks']['error']
+    assert details['missing_sections']['technology']['status_code'] == 404
+    assert elapsed < 0.9
+    assert pathways['related'] == {'occupation': []}
+    assert set(pathways['missing_sections']) == {'careers', 'transitions'}
+
+
+def test_default_data_service_is_shared_by_every_call(fixture_site, transport, monkeypatch):
+    code = '15-1252.00'
+    for path in OnetDataService.occupation_endpoints(code).values():
+        fixture_site.pages[f'/ws{path}'] = json.dumps({'title': path})
+    config = OnetAPIConfig()
+    config.BASE_URL = fixture_site.url('/ws/')
+    states = []
+
+    async def fake_state(*args):
+        states.append(LocalBucketState())
+        return states[-1]
+
+    monkeypatch.setattr('scripts.onet_technical_specs5._data_service', None)
+    monkeypatch.setattr('scripts.onet_technical_specs5.shared_bucket_state', fake_state)
+    service = get_data_service()
+    service.config, service.transport = config, transport
+    service.rate_limiter.config = config
+    service.rate_limiter.bucket.rate = 1000
+
+    async def run():
+        try:
+            return await asyncio.gather(*[fetch_occupation_data(code, cache=OnetCache(LocalRedis()))
+                                          for _ in range(3)])
+        finally:
+            await transport.aclose()
+
+    assert len(asyncio.run(run())) == 3
+    # One limiter, so one backend probe, however many callers
+    assert get_data_service() is service and len(states) == 1
+    # The shared bucket keeps working when a later event loop uses it
+    assert asyncio.run(asyncio.wait_for(service.rate_limiter.acquire(), 1)) is None
+
+
+def test_rate_limiter_setup_lock_follows_the_event_loop(monkeypatch):
+    probes = []
+
+    async def flaky_state(*args):
+        probes.append(args)
+        await asyncio.sleep(0.01)
+        if len(probes) <= 2:
+            raise ConnectionError('backend probe failed')
+        return LocalBucketState()
+
+    monkeypatch.setattr('scripts.onet_technical_specs5.shared_bucket_state', flaky_state)
+    limiter = OnetRateLimiter()
+    limiter.bucket.rate = 1000
+
+    async def contend():
+        return await asyncio.gather(limiter.acquire(), limiter.acquire(), return_exceptions=True)
+
+    # The first loop's probe fails, so a later loop still has to take the setup lock
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(contend()))
+    assert asyncio.run(contend()) == [None, None]
+    assert len(probes) == 3
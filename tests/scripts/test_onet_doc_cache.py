@@ -0,0 +1,63 @@
+import multiprocessing
+
+from scripts.onet_doc_cache import DocumentCache
+
+
+def test_ttl_lru_eviction_and_generation(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'docs.sqlite3'), max_bytes=3000, default_ttl=60)
+    page = {'sections': {'body': 'x' * 900}}
+
+    cache.set('a', page)
+    cache.set('b', page)
+    cache.set('expired', page, ttl=-1)
+    assert cache.get('expired') is None and cache.get_entry('expired') is None  # no stale window
+    generation = cache.generation()
+
+    # Reads refresh LRU order at most once a minute, so age 'b' directly
+    with cache._lock:
+        cache.conn.execute("UPDATE entries SET accessed_at = accessed_at - 1000 WHERE key = 'b'")
+    cache.set('c', page)
+    cache.set('d', page)  # over budget: the least recently used entry goes
+
+    assert cache.generation() == generation + 2
+    assert cache.keys() == ['a', 'c', 'd']
+    assert cache.get('a') == page
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['bytes'] <= 3000
+
+
+def test_expired_entries_survive_eviction_for_the_stale_window(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'docs.sqlite3'), stale_ttl=60)
+    cache.set('stale', {'v': 1}, ttl=-1)
+    cache.set('gone', {'v': 2}, ttl=-120)
+    cache.set('fresh', {'v': 3})
+
+    assert cache.keys() == ['fresh', 'stale']
+    assert cache.get('stale') is None and cache.get_entry('stale').value == {'v': 1}
+
+    # Past the window an entry is a miss even before a write evicts it
+    cache.set('old', {'v': 4}, ttl=-100)
+    cache.stale_ttl = 1
+    assert 'old' in cache.keys() and cache.get_entry('old') is None
+
+
+def _writer(path, worker, count):
+    cache = DocumentCache(path)
+    for i in range(count):
+        cache.set(f"{worker}-{i}", {'worker': worker, 'i': i})
+        assert cache.get(f"{worker}-{i}") == {'worker': worker, 'i': i}
+
+
+def test_concurrent_processes_share_one_store(tmp_path):
+    path = str(tmp_path / 'docs.sqlite3')
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_writer, args=(path, w, 50)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    cache = DocumentCache(path)
+    assert len(cache.keys()) == 200
+    assert cache.generation() == 200
@@ -0,0 +1,54 @@
+import pytest
+
+from scripts.onet_extractor import OnetDataExtractor
+from scripts.onet_html import DEFAULT_PARSER, available_backends, get_backend, walk_page
+
+TRICKY_PAGE = """<!DOCTYPE html>
+<html><head><title>O*NET &amp; Reference</title>
+<meta name="description" content="Docs"><meta name="keywords"><meta charset="utf-8"></head>
+<body><div class="page content">
+<h1>  Web <em>Services</em> </h1>
+<p>An <b>important</b> note <script>var ignored = 1;</script>about <!-- hidden --> keys &lt;here&gt;.</p>
+<p>Key: the core API is essential.</p>
+<table>
+  <tr><th> Code </th><th>Title <sup>1</sup></th></tr>
+  <tr><td>11-1011.00</td><td> Chief <i>Executives</i> </td></tr>
+  <tr><td colspan="2"><table><tr><th>Nested</th></tr><tr><td>inner</td></tr></table></td></tr>
+</table>
+<a href="/reference/taxonomy">Taxonomy <b>reference</b></a>
+<a href="#top">API top</a>
+<a href="https://services.onetcenter.org/reference/database">Database guide</a>
+<a>Documentation without href</a>
+</div></body></html>"""
+
+
+@pytest.mark.parametrize('parser', available_backends())
+def test_backends_match_html_parser_output(parser):
+    reference = OnetDataExtractor.parse_page_content('https://example.org/ref/', TRICKY_PAGE)
+    result = OnetDataExtractor.parse_page_content('https://example.org/ref/', TRICKY_PAGE, parser)
+
+    reference.pop('metadata')
+    result.pop('metadata')
+    assert result == reference
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend('selectolax')
+    assert DEFAULT_PARSER in available_backends()
+
+
+@pytest.mark.parametrize('parser', available_backends())
+def test_walk_page_collects_scopes_and_content_sections(parser):
+    backend = get_backend(parser)
+    html = ('<html><body><main><p>Main text</p></main>'
+            '<div id="content"><h2>Intro</h2><p>Body</p>tail<h3>Next</h3></div>'
+            '<table><tr><td><table><tr><td>deep</td></tr></table></td></tr></table></body></html>')
+    page = walk_page(backend, backend.parse(html))
+
+    assert [c.stripped for c in page.scopes['main'].paragraphs] == ['Main text']
+    assert [c.stripped for c in page.scopes['document'].paragraphs] == ['Main text', 'Body']
+    kinds = [kind for kind, _ in page.content_children]
+    assert kinds[0] == 'heading' and kinds[-1] == 'heading'
+    assert ('text', 'tail') in page.content_children
+    assert len(page.scopes['document'].tables) == 2
@@ -0,0 +1,106 @@
+import json
+
+from scripts.onet_crawler import CrawlConfig
+from scripts.onet_extractor import OnetDataExtractor
+
+
+def seed_site(site):
+    site.pages = {
+        '/reference/': site.page('Reference', """
+            <h1>Reference</h1>
+            <a href="/reference/taxonomy">Taxonomy reference</a>"""),
+        '/reference/taxonomy': site.page('Taxonomy', '<h2>Taxonomy</h2>'),
+    }
+
+
+def build(site, output_dir, crawl=False):
+    extractor = OnetDataExtractor(output_dir=str(output_dir))
+    extractor.base_urls = [site.url('/reference/'), site.url('/reference/taxonomy')]
+    if crawl:
+        extractor.base_urls = extractor.base_urls[:1]
+        extractor.crawl_repository(CrawlConfig(per_host_delay=0))
+    else:
+        extractor.build_repository()
+    return extractor
+
+
+def test_refresh_sends_validators_and_reuses_extractions(fixture_site, tmp_path):
+    seed_site(fixture_site)
+    first = build(fixture_site, tmp_path)
+    assert first.refresh_stats['parsed'] == 2
+    assert (tmp_path / 'fetch_state.json').exists()
+
+    fixture_site.requests.clear()
+    fixture_site.pages['/reference/taxonomy'] = fixture_site.page('Taxonomy', '<h2>Taxonomy v2</h2>')
+    second = build(fixture_site, tmp_path)
+
+    assert all('If-None-Match' in headers for _, headers in fixture_site.requests)
+    assert second.refresh_stats == {'parsed': 1, 'not_modified': 1, 'unchanged': 0}
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    assert saved['api_reference'][fixture_site.url('/reference/')] == \
+        first.repository['api_reference'][fixture_site.url('/reference/')]
+    assert saved['taxonomy'][fixture_site.url('/reference/taxonomy')]['headers'] == ['Taxonomy v2']
+
+
+def test_refresh_skips_parsing_when_content_hash_matches(fixture_site, tmp_path):
+    fixture_site.etags = False
+    seed_site(fixture_site)
+    build(fixture_site, tmp_path)
+
+    second = build(fixture_site, tmp_path)
+
+    assert second.refresh_stats == {'parsed': 0, 'not_modified': 0, 'unchanged': 2}
+    assert len(second.repository['taxonomy']) == 1
+
+
+def test_crawl_refresh_follows_links_of_unmodified_pages(fixture_site, tmp_path):
+    seed_site(fixture_site)
+    build(fixture_site, tmp_path, crawl=True)
+
+    second = build(fixture_site, tmp_path, crawl=True)
+
+    assert second.refresh_stats['not_modified'] == 2
+    assert second.repository['statistics']['total_pages'] == 2
+
+
+def test_full_build_ignores_previous_state(fixture_site, tmp_path):
+    seed_site(fixture_site)
+    build(fixture_site, tmp_path)
+    fixture_site.requests.clear()
+
+    extractor = OnetDataExtractor(output_dir=str(tmp_path), incremental=False)
+    extractor.base_urls = [fixture_site.url('/reference/')]
+    extractor.build_repository()
+
+    assert 'If-None-Match' not in fixture_site.requests[0][1]
+    assert extractor.refresh_stats['parsed'] == 1
+
+
+def test_previous_pages_are_looked_up_per_url_not_loaded(fixture_site, tmp_path, monkeypatch):
+    seed_site(fixture_site)
+    build(fixture_site, tmp_path)
+
+    def load_everything(*args):
+        raise AssertionError('the previous repository was loaded in full')
+
+    monkeypatch.setattr('scripts.onet_extractor.load_repository', load_everything)
+    monkeypatch.setattr('scripts.onet_snapshot.load_repository', load_everything)
+    second = build(fixture_site, tmp_path)
+
+    assert not isinstance(second.previous_pages, dict)
+    assert second.refresh_stats['not_modified'] == 2
+    assert fixture_site.url('/reference/taxonomy') in second.previous_pages
+
+
+def test_previous_pages_are_reindexed_when_the_saved_repository_changes(fixture_site, tmp_path):
+    seed_site(fixture_site)
+    build(fixture_site, tmp_path)
+    url = fixture_site.url('/reference/taxonomy')
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    saved['taxonomy'][url]['title'] = 'Edited by hand'
+    (tmp_path / 'onet_reference.json').write_text(json.dumps(saved))
+
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+
+    assert extractor.previous_pages[url]['title'] == 'Edited by hand'
+    assert len(extractor.previous_pages) == 2
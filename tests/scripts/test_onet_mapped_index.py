@@ -0,0 +1,50 @@
+import pytest
+
+from scripts.onet_mapped_index import open_mapped_index, write_mapped_index
+from scripts.onet_search import SearchIndex, tokenize
+from scripts.onet_snapshot import SnapshotError
+
+from test_onet_search import KNOWLEDGE_BASE
+
+
+def test_mapped_index_searches_like_the_in_memory_index(tmp_path):
+    path = str(tmp_path / 'kb.index')
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+    write_mapped_index(path, KNOWLEDGE_BASE, index, generation=7)
+
+    mapped = open_mapped_index(path)
+
+    assert mapped.generation == 7
+    assert dict(mapped.knowledge_base) == KNOWLEDGE_BASE
+    assert len(mapped.index) == len(index) and len(mapped.index.postings) == len(index.postings)
+    assert mapped.index.postings.get('429') == index.postings['429']
+    assert mapped.index.postings.get('missing') is None
+    for query in ('authentication', 'throttled 429 status', '15-1252.00', 'the api occupation', 'nonexistent'):
+        assert mapped.index.search(query) == index.search(query)
+    assert mapped.index.fuzzy_search('authentcation ratelimit') == index.fuzzy_search('authentcation ratelimit')
+    assert mapped.index.trigram_index.lookup('occupaton') == index.trigram_index.lookup('occupaton')
+    message = tokenize('HTTPError: 429 Client Error: throttled')
+    assert mapped.index.search_terms(message, None, True) == index.search_terms(message, None, True)
+
+    # Updates stay in this process's view
+    mapped.knowledge_base['extra'] = {'sections': {}}
+    assert list(mapped.knowledge_base) == ['main', 'taxonomy', 'extra']
+    mapped.close()
+
+
+def test_unusable_files_raise_snapshot_errors(tmp_path):
+    path = tmp_path / 'kb.index'
+    write_mapped_index(str(path), KNOWLEDGE_BASE, SearchIndex.from_knowledge_base(KNOWLEDGE_BASE))
+
+    with pytest.raises(SnapshotError, match='older than'):
+        open_mapped_index(str(path), max_age=-1)
+
+    path.write_bytes(path.read_bytes()[:200])
+    with pytest.raises(SnapshotError):
+        open_mapped_index(str(path))
+
+    path.write_bytes(b'{"not": "an index"}' * 10)
+    with pytest.raises(SnapshotError, match='not a mapped index'):
+        open_mapped_index(str(path))
+    with pytest.raises(SnapshotError, match='cannot read'):
+        open_mapped_index(str(tmp_path / 'missing.index'))
@@ -0,0 +1,84 @@
+import os
+import time
+
+from scripts.onet_extractor import OnetDataExtractor
+from scripts.onet_pipeline import ExtractionPipeline, FetchOutcome
+
+
+def parse_upper(url, html):
+    return {'url': url, 'text': html.upper(), 'pid': os.getpid()}, 0.001
+
+
+def fail_on_bad(url, html):
+    if 'bad' in url:
+        raise ValueError('unparseable')
+    return html, 0.0
+
+
+def slow_parse(url, html):
+    time.sleep(0.1)
+    return html, 0.1
+
+
+def test_pipeline_parses_in_worker_processes():
+    def fetch(url):
+        if url.endswith('cached'):
+            return FetchOutcome(url=url, result={'reused': True})
+        return FetchOutcome(url=url, html=f'page {url}')
+
+    results = {}
+    pipeline = ExtractionPipeline(fetch, parse_upper, fetch_workers=3, parse_workers=2, queue_size=2)
+    metrics = pipeline.run([f'u{i}' for i in range(10)] + ['u-cached'],
+                           lambda outcome, data: results.__setitem__(outcome.url, data))
+
+    assert len(results) == 11
+    assert results['u3']['text'] == 'PAGE U3'
+    assert results['u-cached'] == {'reused': True}
+    assert all(r['pid'] != os.getpid() for url, r in results.items() if url != 'u-cached')
+    assert metrics['fetch']['items'] == 11
+    assert metrics['parse']['items'] == 10
+    assert metrics['parse']['errors'] == 0
+
+
+def test_pipeline_reports_stage_errors():
+    def fetch(url):
+        if url == 'missing':
+            return None
+        return FetchOutcome(url=url, html='x')
+
+    results = {}
+    pipeline = ExtractionPipeline(fetch, fail_on_bad, fetch_workers=2, parse_workers=1)
+    metrics = pipeline.run(['ok', 'bad', 'missing'],
+                           lambda outcome, data: results.__setitem__(outcome.url, data))
+
+    assert results == {'ok': 'x', 'bad': None}
+    assert metrics['fetch']['errors'] == 1
+    assert metrics['parse']['errors'] == 1
+
+
+def test_saturated_pipeline_waits_without_spinning():
+    results = {}
+    pipeline = ExtractionPipeline(lambda url: FetchOutcome(url=url, html=url), slow_parse,
+                                  fetch_workers=2, parse_workers=1)
+    wall, cpu = time.perf_counter(), time.process_time()
+    pipeline.run([f'u{i}' for i in range(8)], lambda outcome, data: results.__setitem__(outcome.url, data))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    assert len(results) == 8
+    # Parsing happens in the worker; the parent should mostly sleep in wait()
+    assert cpu < 0.25 * wall
+
+
+def test_build_repository_records_pipeline_metrics(fixture_site, tmp_path):
+    fixture_site.pages = {
+        f'/reference/page{i}': fixture_site.page(f'Page {i}', f'<h2>Section {i}</h2>') for i in range(6)
+    }
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [fixture_site.url(path) for path in fixture_site.pages]
+
+    extractor.build_repository(fetch_workers=3, parse_workers=2)
+
+    assert len(extractor.repository['api_reference']) == 6
+    pipeline = extractor.repository['statistics']['pipeline']
+    assert pipeline['fetch']['items'] == 6
+    assert pipeline['parse']['items'] == 6
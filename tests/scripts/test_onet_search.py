@@ -0,0 +1,82 @@
+from scripts.onet_search import SearchIndex, tokenize
+
+KNOWLEDGE_BASE = {
+    'main': {
+        'sections': {
+            'Authentication': '<p>Use HTTP basic authentication with your API key.</p>',
+            'Rate limits': '<p>Clients are throttled when exceeding the request budget. '
+                           'Throttled clients receive status 429.</p>',
+            'Overview': '<p>The API returns occupation data, including skills &amp; knowledge.</p>',
+        },
+        'tables': [{'headers': ['Code', 'Meaning'], 'rows': [['429', 'Too many requests'],
+                                                             ['401', 'Authentication required']]}],
+    },
+    'taxonomy': {
+        'sections': {'Codes': '<p>Occupation 15-1252.00 is Software Developers.</p>'},
+        'tables': [],
+    },
+}
+
+
+def test_tokenize_strips_markup_and_keeps_codes_whole():
+    assert tokenize('<p>Skills &amp; <b>Knowledge</b> for 15-1252.00</p>') == \
+        ['skills', 'knowledge', 'for', '15-1252.00']
+
+
+def test_bm25_ranks_titles_and_rare_terms_first():
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+
+    results = index.search('authentication')
+    assert [r.get('section', r.get('type')) for r in results] == ['Authentication', 'table']
+    assert results[0]['relevance'] == 'high' and results[1]['relevance'] == 'medium'
+    assert results[0]['score'] > results[1]['score']
+
+    throttled = index.search('throttled 429 status')
+    assert throttled[0]['section'] == 'Rate limits'
+    assert throttled[1]['content'] == ['429', 'Too many requests']
+
+    assert index.search('15-1252.00')[0]['source'] == 'taxonomy'
+    assert index.search('nonexistent') == []
+    assert len(index.search('the api occupation', k=1)) == 1
+
+
+def test_scores_only_visit_matching_postings():
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+    assert set(index.scores(['budget'])) == {1}
+    assert index.scores(['nonexistent']) == {}
+
+
+def test_search_terms_combines_terms_per_section_in_one_pass():
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+    trace = tokenize('HTTPError: 429 Client Error: Too Many Requests for url ... throttled, throttled, throttled')
+
+    results = index.search_terms(trace, k=None, sections_only=True)
+
+    assert all('section' in r for r in results)
+    keys = [(r['source'], r['section']) for r in results]
+    assert len(keys) == len(set(keys))
+    assert keys[0] == ('main', 'Rate limits')
+    assert [r['score'] for r in results] == sorted((r['score'] for r in results), reverse=True)
+
+
+def test_trigram_lookup_ranks_similar_terms():
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+
+    matches = index.trigram_index.lookup('authentcation')
+    assert matches[0][0] == 'authentication' and 0.5 < matches[0][1] < 1
+    assert index.trigram_index.lookup('authentication', k=1) == [('authentication', 1.0)]
+    assert index.trigram_index.lookup('occupation', threshold=0.99) == [('occupation', 1.0)]
+    assert index.trigram_index.lookup('zzzz') == []
+
+
+def test_fuzzy_search_matches_misspelled_and_truncated_terms():
+    index = SearchIndex.from_knowledge_base(KNOWLEDGE_BASE)
+
+    assert index.search('throtled') == []
+    assert index.fuzzy_search('throtled')[0]['section'] == 'Rate limits'
+    assert index.fuzzy_search('authent')[0]['section'] == 'Authentication'
+    assert index.fuzzy_search('auth')[0]['section'] == 'Authentication'
+    assert index.trigram_index.lookup('occ', k=1) == [('occupation', 0.75)]
+    # Known terms are not expanded, so exact queries rank as before
+    assert index.fuzzy_search('throttled 429 status') == index.search('throttled 429 status')
+    assert index.fuzzy_search('throtled', threshold=0.9) == []
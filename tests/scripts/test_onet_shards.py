@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from scripts.onet_extractor import OnetDataExtractor
+from scripts.onet_shards import ShardedRepository, write_repository_shards
+
+REPOSITORY = {
+    'metadata': {'version': '1.0'},
+    'core_content': {},
+    'taxonomy': {'https://x/taxonomy': {'title': 'Taxonomy', 'headers': ['Kodé']}},
+    'database_structure': {},
+    'api_reference': {f'https://x/reference/{i}': {'title': str(i), 'tables': []} for i in range(3)},
+    'statistics': {'total_pages': 4}
+}
+
+
+@pytest.mark.parametrize('fmt', ['json', 'ndjson'])
+def test_shards_round_trip_and_load_lazily(tmp_path, fmt):
+    manifest = write_repository_shards(str(tmp_path), REPOSITORY, fmt)
+    assert manifest['shards']['api_reference']['pages'] == 3
+
+    repository = ShardedRepository(str(tmp_path))
+    assert repository.statistics == {'total_pages': 4}
+    assert repository.loaded == set()
+    assert dict(repository.iter_pages('taxonomy')) == REPOSITORY['taxonomy']
+    assert repository.get_page('api_reference', 'https://x/reference/1') == {'title': '1', 'tables': []}
+    assert 'core_content' not in repository.loaded
+    assert repository.to_dict() == REPOSITORY
+
+
+def test_json_shard_matches_plain_dump(tmp_path):
+    shards = write_repository_shards(str(tmp_path), REPOSITORY)['shards']
+    shard = (tmp_path / shards['api_reference']['file']).read_text(encoding='utf-8')
+    assert shard == json.dumps(REPOSITORY['api_reference'], indent=2, ensure_ascii=False)
+    assert (tmp_path / shards['core_content']['file']).read_text() == '{}'
+
+
+def test_rewrites_never_touch_the_shards_an_open_manifest_points_at(tmp_path):
+    write_repository_shards(str(tmp_path), REPOSITORY, 'ndjson')
+    reader = ShardedRepository(str(tmp_path))
+    old_files = {shard['file'] for shard in reader.manifest['shards'].values()}
+
+    updated = dict(REPOSITORY, taxonomy={'https://x/taxonomy': {'title': 'New taxonomy'}})
+    manifest = write_repository_shards(str(tmp_path), updated, 'json')
+
+    assert manifest['generation'] == reader.manifest['generation'] + 1
+    assert not old_files & {shard['file'] for shard in manifest['shards'].values()}
+    # The old generation is gone once the new manifest is in place
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        ['manifest.json'] + [shard['file'] for shard in manifest['shards'].values()])
+    assert ShardedRepository(str(tmp_path)).to_dict() == updated
+
+
+def test_sharded_output_is_reused_by_incremental_refresh(fixture_site, tmp_path):
+    fixture_site.pages = {'/reference/': fixture_site.page('Reference', '<h2>Reference</h2>')}
+    url = fixture_site.url('/reference/')
+
+    first = OnetDataExtractor(output_dir=str(tmp_path), output_format='ndjson')
+    first.base_urls = [url]
+    first.build_repository()
+    assert not (tmp_path / 'onet_reference.json').exists()
+
+    second = OnetDataExtractor(output_dir=str(tmp_path), output_format='ndjson')
+    second.base_urls = [url]
+    second.build_repository()
+
+    assert second.refresh_stats['not_modified'] == 1
+    saved = ShardedRepository(str(tmp_path / 'onet_reference'))
+    assert saved.get_page('api_reference', url)['headers'] == ['Reference']
+    assert saved.page_count('api_reference') == 1
+
+    # Switching back to a single JSON file leaves no shard generation behind
+    third = OnetDataExtractor(output_dir=str(tmp_path), output_format='json')
+    third.base_urls = [url]
+    third.build_repository()
+
+    assert third.refresh_stats['not_modified'] == 1
+    assert not (tmp_path / 'onet_reference').exists()
+    saved = json.loads((tmp_path / 'onet_reference.json').read_text())
+    assert saved['api_reference'][url]['headers'] == ['Reference']
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from scripts import onet_snapshot
+from scripts.onet_snapshot import (
+    SnapshotError, available_codecs, load_repository, read_snapshot, write_snapshot
+)
+
+REPOSITORY = {
+    'metadata': {'version': '1.0'},
+    'api_reference': {'https://x/reference/': {'title': 'Référence', 'tables': [{'rows': [['1', '2']]}]}},
+    'statistics': {'total_pages': 1}
+}
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+def test_snapshot_round_trip_and_validation(tmp_path, codec):
+    source = tmp_path / 'onet_reference.json'
+    source.write_text('{}')
+    path = str(tmp_path / 'repo.snapshot')
+    write_snapshot(path, 'repository', REPOSITORY, [str(source)], codec=codec)
+
+    assert read_snapshot(path, 'repository', [str(source)]) == REPOSITORY
+    with pytest.raises(SnapshotError, match='not knowledge_base'):
+        read_snapshot(path, 'knowledge_base')
+
+    source.write_text('{"changed": true}')
+    with pytest.raises(SnapshotError, match='older than its source'):
+        read_snapshot(path, 'repository', [str(source)])
+
+    raw = bytearray((tmp_path / 'repo.snapshot').read_bytes())
+    raw[-1] ^= 0xFF
+    (tmp_path / 'repo.snapshot').write_bytes(bytes(raw))
+    with pytest.raises(SnapshotError, match='checksum'):
+        read_snapshot(path, 'repository')
+
+
+def test_load_repository_falls_back_to_json_then_uses_snapshot(tmp_path, monkeypatch):
+    (tmp_path / 'onet_reference.json').write_text(json.dumps(REPOSITORY), encoding='utf-8')
+
+    assert load_repository(str(tmp_path)) == REPOSITORY
+    assert (tmp_path / 'onet_reference.snapshot').exists()
+
+    def no_json(output_dir):
+        raise AssertionError('JSON should not be parsed when the snapshot is current')
+
+    monkeypatch.setattr(onet_snapshot, '_load_repository_source', no_json)
+    assert load_repository(str(tmp_path)) == REPOSITORY
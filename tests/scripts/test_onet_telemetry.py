@@ -0,0 +1,63 @@
+import gzip
+import json
+
+from scripts.onet_extractor import OnetDataExtractor
+from scripts.onet_telemetry import CrawlTelemetry, Histogram
+
+
+def test_histogram_percentiles_and_buckets():
+    hist = Histogram((0.1, 1.0))
+    for value in (0.05, 0.2, 0.3, 2.0):
+        hist.observe(value)
+
+    summary = hist.as_dict()
+    assert summary['p50'] == 0.2
+    assert summary['p99'] == 2.0
+    assert summary['buckets'] == {'0.1': 1, '1.0': 3, '+Inf': 4}
+
+
+def test_prometheus_dump():
+    telemetry = CrawlTelemetry()
+    telemetry.record_fetch('https://x/a', 200, 0.3, size=2048)
+    telemetry.record_fetch('https://x/b', None, 1.5, error='timeout')
+    telemetry.record_parse('https://x/a', 0.02, {'tables': [{}, {}], 'links': []})
+
+    text = telemetry.to_prometheus()
+    assert '# TYPE onet_fetch_duration_seconds histogram' in text
+    assert 'onet_fetch_duration_seconds_bucket{le="0.5"} 1' in text
+    assert 'onet_fetch_duration_seconds_count 2' in text
+    assert 'onet_fetch_responses_total{status="error"} 1' in text
+    assert 'onet_extracted_elements_total{kind="tables"} 2' in text
+
+
+def test_build_records_per_url_telemetry(fixture_site, tmp_path):
+    fixture_site.pages = {
+        '/reference/': fixture_site.page('Reference', '<h2>Reference</h2><a href="/api">API guide</a>'),
+    }
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [fixture_site.url('/reference/'), fixture_site.url('/reference/missing')]
+    extractor.build_repository(fetch_workers=2, parse_workers=1)
+
+    telemetry = extractor.repository['statistics']['telemetry']
+    assert telemetry['status_counts'] == {'200': 1, '404': 1}
+    assert telemetry['fetch_seconds']['count'] == 2
+    assert telemetry['parse_seconds']['count'] == 1
+    assert telemetry['elements']['headers'] == 1
+    assert telemetry['elements']['links'] == 1
+    assert telemetry['bytes_total'] == len(fixture_site.pages['/reference/'].encode())
+    assert len(telemetry['slowest']) == 2
+
+    records = [json.loads(line) for line in (tmp_path / 'telemetry.ndjson').read_text().splitlines()]
+    assert {r['status'] for r in records} == {200, 404}
+
+
+def test_fetch_bytes_count_the_compressed_transfer(fixture_site, tmp_path):
+    page = fixture_site.page('Reference', '<p>Repeated reference text.</p>' * 200)
+    fixture_site.pages = {'/reference/': page}
+    fixture_site.gzip = True
+    extractor = OnetDataExtractor(output_dir=str(tmp_path))
+    extractor.base_urls = [fixture_site.url('/reference/')]
+    extractor.build_repository(fetch_workers=1, parse_workers=1)
+
+    telemetry = extractor.repository['statistics']['telemetry']
+    assert telemetry['bytes_total'] == len(gzip.compress(page.encode())) < len(page)
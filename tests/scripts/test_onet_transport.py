@@ -0,0 +1,64 @@
+import asyncio
+import gc
+
+import pytest
+
+from scripts.onet_transport import ACCEPT_ENCODING, OnetTransport, TransportConfig, backoff_delay
+
+
+@pytest.fixture
+def transport():
+    transport = OnetTransport(TransportConfig(max_retries=2, backoff_base=0.01, backoff_max=0.05))
+    yield transport
+    transport.close()
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, 0.5, 2.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_sync_session_retries_transient_errors(fixture_site, transport):
+    fixture_site.pages = {'/page': 'ok'}
+    fixture_site.failures = {'/page': 2}
+
+    response = transport.session.get(fixture_site.url('/page'))
+
+    assert response.status_code == 200
+    assert len(response.raw.retries.history) == 2
+    assert fixture_site.requests[0][1]['Accept-Encoding'] == ACCEPT_ENCODING
+
+
+def test_async_request_retries_then_gives_up(fixture_site, transport):
+    fixture_site.pages = {'/page': 'ok'}
+
+    async def run():
+        fixture_site.failures = {'/page': 1}
+        recovered = await transport.get(fixture_site.url('/page'))
+        fixture_site.failures = {'/page': 5}
+        exhausted = await transport.get(fixture_site.url('/page'))
+        await transport.aclose()
+        return recovered, exhausted
+
+    recovered, exhausted = asyncio.run(run())
+    assert (recovered.status, recovered.retries, recovered.text) == (200, 1, 'ok')
+    assert (exhausted.status, exhausted.retries) == (503, 2)
+
+
+def test_async_sessions_close_with_their_event_loop(fixture_site, transport, recwarn):
+    fixture_site.pages = {'/page': 'ok'}
+
+    async def run():
+        response = await transport.get(fixture_site.url('/page'))
+        return response.text, await transport.async_session()
+
+    # Neither run calls aclose(), as one-off asyncio.run callers of the shared transport do not
+    first_text, first = asyncio.run(run())
+    second_text, second = asyncio.run(run())
+
+    assert first_text == second_text == 'ok'
+    assert first is not second
+    assert first.closed and second.closed
+    gc.collect()
+    assert not [w for w in recwarn if 'nclosed' in str(w.message)]
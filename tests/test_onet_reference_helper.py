@@ -0,0 +1,176 @@
+import json
+import os
+import time
+
+import pytest
+
+from onet_reference_helper import OnetReferenceHelper
+from scripts.onet_html import available_backends
+
+
+DOC_PAGE = """<html><head><title>Reference</title>
+<meta name="description" content="O*NET reference"></head>
+<body><div id="content">
+<h2>Authentication</h2><p>Use HTTP basic authentication with your API key.</p>
+<h2>Rate limits</h2><p>Clients are throttled when exceeding the request budget.</p>
+<table><tr><th>Code</th><th>Meaning</th></tr><tr><td>429</td><td>Too many requests</td></tr></table>
+</div></body></html>"""
+
+
+@pytest.fixture
+def helper_factory(fixture_site, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fixture_site.pages = {'/reference/': DOC_PAGE}
+
+    def make(**kwargs):
+        helper = OnetReferenceHelper(cache_dir=str(tmp_path / 'cache'), **kwargs)
+        helper.base_urls = {'main': fixture_site.url('/reference/')}
+        return helper
+
+    return make
+
+
+def test_replay_parses_archived_pages_without_network(helper_factory, fixture_site):
+    helper = helper_factory()
+    fetched = helper.parse_documentation('main')
+    fixture_site.requests.clear()
+
+    replayed = helper_factory(replay=True).parse_documentation('main')
+
+    assert fixture_site.requests == []
+    assert replayed['sections'] == fetched['sections']
+    assert replayed['tables'] == fetched['tables']
+
+
+def test_lxml_backend_matches_default_parser(helper_factory):
+    if 'lxml' not in available_backends():
+        pytest.skip('lxml is not installed')
+    default = helper_factory().parse_documentation('main')
+    fast = helper_factory(parser='lxml', replay=True).parse_documentation('main')
+
+    for key in ('title', 'metadata', 'links', 'tables'):
+        assert fast[key] == default[key]
+    assert list(fast['sections']) == list(default['sections'])
+
+
+def test_knowledge_base_loads_from_snapshot(helper_factory, fixture_site, caplog):
+    built = helper_factory()
+    built.build_knowledge_base()
+    fixture_site.requests.clear()
+
+    restarted = helper_factory()
+    with caplog.at_level('INFO'):
+        assert restarted.load_knowledge_base()
+
+    assert 'Loaded knowledge base from snapshot' in caplog.text
+    assert fixture_site.requests == []
+    assert restarted.knowledge_base == built.knowledge_base
+    assert restarted.search_knowledge_base('throttled')[0]['section'] == 'Rate limits'
+    assert restarted.search_knowledge_base('throtled')[0]['section'] == 'Rate limits'
+    assert restarted.search_knowledge_base('throtled', fuzzy=False) == []
+
+
+def test_stale_pages_load_at_startup_and_refresh_in_background(helper_factory, fixture_site, monkeypatch):
+    built = helper_factory()
+    built.build_knowledge_base()
+    fixture_site.pages['/reference/'] = DOC_PAGE.replace('Rate limits', 'Throttling')
+    fixture_site.requests.clear()
+    fixture_site.delay = 0.3  # Keeps the background refreshes from finishing before the stale reads
+    two_days_later = time.time() + 2 * 86400
+    monkeypatch.setattr(time, 'time', lambda: two_days_later)
+
+    # The snapshot and its pages are past their TTL but inside the stale window
+    restarted = helper_factory()
+    assert restarted.load_knowledge_base()
+    assert restarted.mapped_index is not None
+    assert restarted.knowledge_base['main'] == built.knowledge_base['main']
+    restarted.schedule_refresh('main').result()
+    assert 'Throttling' in restarted.doc_cache.get('main')['sections']
+    assert 'Throttling' in restarted.knowledge_base['main']['sections']
+
+    # Without a usable snapshot the page cache fallback serves stale rows the same way
+    restarted.doc_cache.set('main', built.knowledge_base['main'], ttl=-1)
+    fixture_site.requests.clear()
+    fallback = helper_factory()
+    assert fallback.load_knowledge_base()
+    assert fallback.knowledge_base['main'] == built.knowledge_base['main']
+    fallback.schedule_refresh('main').result()
+    assert len(fixture_site.requests) == 1
+
+
+def test_legacy_cache_files_migrate_into_document_cache(helper_factory, fixture_site):
+    parsed = helper_factory().parse_documentation('main')
+
+    # A cache written by an earlier version as pretty-printed JSON is still used, once
+    fresh = helper_factory()
+    fresh.doc_cache.delete('main')
+    legacy_path = fresh.get_legacy_cache_paths('main')[1]
+    with open(legacy_path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': time.time() - 3600, 'data': parsed}, f, indent=2)
+    fixture_site.requests.clear()
+
+    assert fresh.parse_documentation('main') == parsed
+    assert fixture_site.requests == []
+    assert not os.path.exists(legacy_path)
+    entry = fresh.doc_cache.get_entry('main')
+    assert entry.expires_at - time.time() < 86400 - 3000  # kept its remaining TTL
+
+
+def test_analyze_error_ranks_sections_for_a_whole_message(helper_factory):
+    helper = helper_factory()
+    helper.build_knowledge_base()
+
+    results = helper.analyze_error('requests.exceptions.HTTPError: 429 Client Error: clients throttled')
+
+    assert [r['section'] for r in results] == ['Rate limits']
+
+
+def test_expired_page_is_served_stale_and_refreshed_in_background(helper_factory, fixture_site):
+    helper = helper_factory()
+    original = helper.parse_documentation('main')
+    helper.doc_cache.set('main', original, ttl=-1)
+    fixture_site.pages['/reference/'] = DOC_PAGE.replace('Rate limits', 'Throttling')
+    fixture_site.requests.clear()
+
+    assert helper.parse_documentation('main') == original
+    helper.schedule_refresh('main').result()  # joins the refresh started above
+
+    entry = helper.doc_cache.get_entry('main')
+    assert not entry.expired
+    assert 'Throttling' in entry.value['sections']
+
+
+def test_refresh_all_revalidates_pages_about_to_expire(helper_factory, fixture_site):
+    helper = helper_factory()
+    parsed = helper.parse_documentation('main')
+    fixture_site.requests.clear()
+
+    assert helper.refresh_all(within=60) == {}
+    assert fixture_site.requests == []
+
+    helper.doc_cache.set('main', parsed, ttl=600)
+    assert helper.refresh_all(within=3600) == {'main': True}
+    assert len(fixture_site.requests) == 1
+    assert helper.doc_cache.get_entry('main').expires_at > time.time() + 3600
+
+
+def test_concurrent_build_takes_about_as_long_as_the_slowest_page(helper_factory, fixture_site):
+    helper = helper_factory()
+    helper.base_urls = {}
+    for name in ('main', 'about', 'online', 'taxonomy', 'database'):
+        fixture_site.pages[f'/{name}'] = DOC_PAGE.replace('Reference', name)
+        helper.base_urls[name] = fixture_site.url(f'/{name}')
+    fixture_site.delay = 0.4
+
+    start = time.perf_counter()
+    helper.build_knowledge_base(fetch_workers=5, parse_workers=2)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5  # one after another this takes at least 2s
+    assert sorted(helper.knowledge_base) == sorted(helper.base_urls)
+    assert helper.knowledge_base['about']['title'] == 'about'
+    assert all(not t['cached'] and t['fetch_seconds'] >= 0.4 for t in helper.build_timings.values())
+    assert helper.pipeline_metrics['parse']['items'] == 5
+
+    helper.build_knowledge_base(fetch_workers=5)
+    assert all(t['cached'] for t in helper.build_timings.values())